@@ -0,0 +1,324 @@
+"""
+ffmpeg 로고/아웃트로 필터그래프 벤치마크 (lavfi testsrc 합성 영상)
+
+youtube_poster/filtergraph.py의 logo_filtergraph(유튜브 업로드 로고 합성과 video_editor가 공유)를
+해상도 x 길이 x 필터 변형 x 인코더 설정 조합으로 실행해
+    - fps(초당 출력 프레임), speed(실시간 배수), 경과 시간
+    - ffmpeg CPU 시간(user+sys)과 사용 코어 수(CPU 시간/경과 시간), 최대 RSS
+    - 출력 크기와 비트레이트
+를 측정해 JSON으로 저장 (compare.py로 필터그래프 최적화 전후 비교)
+
+필터 변형
+    full      실제 운영 그래프 (정적 로고 + 흰 화면 페이드 + URL drawtext + eval=frame 애니메이션 로고)
+    subs      full + libass 자막 (youtube_poster처럼 sub.srt를 작업 디렉토리에 두고 실행)
+    no_anim   애니메이션 로고(eval=frame scale) 제외
+    no_fade   흰 화면 오버레이 제외
+    no_text   drawtext 제외
+    static    정적 로고 워터마크만
+    cached    정적 로고 + 미리 렌더링한 아웃트로 클립 (운영 기본 경로, 클립 렌더링은 측정에서 제외)
+    encode    필터 없이 재인코딩만 (인코더 비용 기준선)
+
+인코더 설정 (--encoders "이름=ffmpeg 인자;...", 기본은 libx264 프리셋 비교)
+    medium    인자 없음 = 운영과 같은 ffmpeg 기본값 (libx264 medium, crf 23)
+    veryfast  -preset veryfast
+    ultrafast -preset ultrafast
+
+사용법 (저장소 루트에서):
+    python benchmarks/bench_ffmpeg.py
+    python benchmarks/bench_ffmpeg.py --resolutions 1080p --durations 30 --variants full,no_anim --encoders "medium="
+    python benchmarks/bench_ffmpeg.py --work-dir /tmp/ffbench --repeat 3 --output before.json
+    python benchmarks/bench_ffmpeg.py --dry-run     # 실행할 ffmpeg 명령만 출력
+    python benchmarks/compare.py before.json after.json --metrics fps,cpu_seconds,output_mb
+
+--work-dir를 주면 합성 영상을 지우지 않고 다음 실행에서 재사용 (생성 시간은 측정에 포함하지 않음)
+"""
+import os
+import sys
+import time
+import shlex
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import ROOT_DIR, percentile, environment_meta, write_results, print_table, make_test_clip  # noqa: E402
+
+sys.path.insert(0, os.path.join(ROOT_DIR, "youtube_poster"))
+from filtergraph import (  # noqa: E402
+    DEFAULT_FONT_PATH, logo_filtergraph, subtitles_filter, watermark_filtergraph, outro_command, outro_inputs
+)
+
+RESOLUTIONS = {"720p": (1280, 720), "1080p": (1920, 1080), "4k": (3840, 2160)}
+FRAME_RATE = 30
+
+# 변형 이름 -> logo_filtergraph 인자 (None이면 필터 없이 인코딩만)
+VARIANTS = {
+    "full": {},
+    "subs": {"subtitles": True},
+    "no_anim": {"animated_logo": False},
+    "no_fade": {"white_fade": False},
+    "no_text": {"url_text": False},
+    "static": {"white_fade": False, "url_text": False, "animated_logo": False},
+    "cached": {"cached_outro": True},
+    "encode": None,
+}
+DEFAULT_ENCODERS = "medium=;veryfast=-preset veryfast;ultrafast=-preset ultrafast"
+
+# youtube_poster의 자막 스타일과 같은 구성 (폰트 이름만 리눅스에서도 있는 기본 폰트로 대체됨)
+SUB_STYLE = (
+    "FontSize=18,Alignment=2,Outline=2,Shadow=0,BorderStyle=3,"
+    "PrimaryColour=&H00FFFFFF,OutlineColour=&H80000000,BackColour=&H00000000,MarginV=40"
+)
+SUB_NAME = "sub.srt"
+OUTRO_NAME = "outro.mkv"
+
+FONT_CANDIDATES = (
+    DEFAULT_FONT_PATH,
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "C:\\Windows\\Fonts\\ariali.ttf",
+)
+
+
+def find_font(preferred=None):
+    """drawtext용 폰트 파일 (운영 기본 경로 -> 흔한 시스템 폰트 -> fc-match 순)"""
+    for path in ((preferred,) if preferred else FONT_CANDIDATES):
+        if path and os.path.exists(path):
+            return path
+    if not preferred and shutil.which("fc-match"):
+        found = subprocess.run(["fc-match", "-f", "%{file}", "sans:italic"], capture_output=True, text=True).stdout
+        if found and os.path.exists(found):
+            return found
+    return None
+
+
+def parse_encoders(spec: str):
+    encoders = {}
+    for item in filter(None, (part.strip() for part in spec.split(";"))):
+        name, _, args = item.partition("=")
+        encoders[name.strip()] = shlex.split(args)
+    return encoders
+
+
+def write_subtitles(path: str, seconds: int, cue_seconds: int = 2):
+    """영상 전체에 cue_seconds 간격으로 두 줄 자막 (실제 자막 밀도와 비슷하게)"""
+    def stamp(t):
+        return f"{t // 3600:02d}:{t % 3600 // 60:02d}:{t % 60:02d},000"
+
+    with open(path, "w", encoding="utf-8") as f:
+        for index, start in enumerate(range(0, seconds, cue_seconds), start=1):
+            end = min(start + cue_seconds, seconds)
+            f.write(f"{index}\n{stamp(start)} --> {stamp(end)}\n자막 벤치마크 문장 {index}\nsubtitle benchmark line {index}\n\n")
+
+
+def make_logo(path: str) -> bool:
+    """기본 로고가 없을 때 쓸 1000x1000 RGBA PNG"""
+    cmd = ["ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", "color=c=orange@0.8:s=1000x1000,format=rgba",
+           "-frames:v", "1", path]
+    return shutil.which("ffmpeg") is not None and subprocess.run(cmd).returncode == 0
+
+
+def build_command(clip: str, logo: str, output: str, variant: str, encoder_args, width, height, seconds, font):
+    """운영 명령과 같은 형태 (ffmpeg -y -i 영상 -i 로고 [아웃트로 클립] -filter_complex ... -c:a copy 출력)"""
+    options = VARIANTS[variant]
+    cmd = ["ffmpeg", "-y", "-nostats", "-v", "error", "-i", os.path.basename(clip)]
+    if options is not None:
+        options = dict(options)
+        if options.pop("subtitles", False):
+            options["subtitles"] = subtitles_filter(SUB_NAME, SUB_STYLE)
+        if options.pop("cached_outro", False):
+            graph = watermark_filtergraph(outro_input="[2:v]", **options)
+            cmd += ["-i", logo, *outro_inputs(OUTRO_NAME, seconds), "-filter_complex", graph]
+        else:
+            graph = logo_filtergraph(width, height, seconds, font_path=font or DEFAULT_FONT_PATH, **options)
+            cmd += ["-i", logo, "-filter_complex", graph]
+    return cmd + list(encoder_args) + ["-c:a", "copy", output]
+
+
+def run_measured(cmd, cwd):
+    """ffmpeg 한 번 실행: (종료 코드, 경과 초, CPU 초, 최대 RSS 바이트, stderr)
+
+    wait4로 이 자식 프로세스만의 rusage를 받아 다른 자식과 섞이지 않게 측정"""
+    with tempfile.TemporaryFile() as err:
+        started = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=err)
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - started
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err.seek(0)
+        stderr = err.read().decode("utf-8", "replace")
+    # macOS는 바이트, 리눅스는 KB 단위
+    rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    return proc.returncode, wall, usage.ru_utime + usage.ru_stime, rss, stderr
+
+
+def run_case(args, clip_dir, clip, resolution, seconds, variant, encoder, encoder_args, font):
+    width, height = RESOLUTIONS[resolution]
+    scenario = f"{variant}/{encoder}/{resolution}/{seconds}s"
+    base = {"scenario": scenario, "variant": variant, "encoder": encoder, "encoder_args": encoder_args,
+            "resolution": resolution, "seconds": seconds}
+    output = os.path.join(clip_dir, f"out-{variant}-{encoder}-{resolution}-{seconds}.mp4")
+    cmd = build_command(clip, args.logo, output, variant, encoder_args, width, height, seconds, font)
+    if args.dry_run:
+        print(f"# {scenario}\n(cd {shlex.quote(clip_dir)} && {shlex.join(cmd)})\n")
+        return {**base, "skipped": "dry run"}
+    if VARIANTS[variant] is not None and VARIANTS[variant].get("url_text", True) and not font:
+        return {**base, "skipped": "no font for drawtext (--font)"}
+
+    runs = []
+    for _ in range(args.repeat):
+        code, wall, cpu, rss, stderr = run_measured(cmd, clip_dir)
+        if code != 0:
+            return {**base, "skipped": f"ffmpeg exit {code}: {stderr.strip()[-300:]}"}
+        runs.append((wall, cpu, rss))
+    size = os.path.getsize(output)
+    os.remove(output)
+
+    walls = [run[0] for run in runs]
+    wall = percentile(walls, 50)
+    cpu = percentile([run[1] for run in runs], 50)
+    frames = seconds * FRAME_RATE
+    metrics = {
+        "wall_seconds": wall,
+        "wall_min_seconds": min(walls),
+        "fps": frames / wall if wall else 0.0,
+        "speed": seconds / wall if wall else 0.0,
+        "cpu_seconds": cpu,
+        "cpu_cores": cpu / wall if wall else 0.0,
+        "peak_rss_mb": max(run[2] for run in runs) / 1024 / 1024,
+        "output_mb": size / 1024 / 1024,
+        "bitrate_kbps": size * 8 / seconds / 1000,
+    }
+    print(f"  {scenario:<32} {metrics['fps']:8.1f} fps  {cpu:7.1f} cpu-s  {metrics['output_mb']:7.2f} MB")
+    return {**base, "repeat": args.repeat, "metrics": metrics}
+
+
+def prepare_clip(args, clip_dir, resolution, seconds):
+    """합성 영상 (+ 자막 파일) 생성, 이미 있으면 재사용"""
+    width, height = RESOLUTIONS[resolution]
+    clip = os.path.join(clip_dir, "input.mp4")
+    os.makedirs(clip_dir, exist_ok=True)
+    write_subtitles(os.path.join(clip_dir, SUB_NAME), seconds)
+    if args.dry_run or os.path.exists(clip):
+        return clip
+    print(f"🎞️  generating {resolution} {seconds}s clip...")
+    return clip if make_test_clip(clip, seconds, size=f"{width}x{height}", rate=FRAME_RATE) else None
+
+
+def prepare_outro(args, clip_dir, resolution, font):
+    """cached 변형용 아웃트로 클립 렌더링 (youtube_poster가 로고/형식별로 한 번 만드는 것과 같은 명령), 소요 초 반환"""
+    width, height = RESOLUTIONS[resolution]
+    cmd = outro_command(args.logo, OUTRO_NAME, width, height, FRAME_RATE, "yuv420p", font or DEFAULT_FONT_PATH)
+    cmd[1:1] = ["-nostats", "-v", "error"]
+    if args.dry_run:
+        print(f"# outro {resolution}\n(cd {shlex.quote(clip_dir)} && {shlex.join(cmd)})\n")
+        return 0.0
+    if not font:
+        return None
+    code, wall, _, _, stderr = run_measured(cmd, clip_dir)
+    if code != 0:
+        print(f"⚠️  outro render failed: {stderr.strip()[-300:]}")
+        return None
+    return wall
+
+
+def run(args, work_dir):
+    encoders = parse_encoders(args.encoders)
+    font = find_font(args.font)
+    if not args.logo:
+        args.logo = os.path.join(work_dir, "logo.png")
+        if not os.path.exists(args.logo) and not args.dry_run and not make_logo(args.logo):
+            raise SystemExit("could not create a logo image")
+    args.logo = os.path.abspath(args.logo)
+
+    results = []
+    for resolution in args.resolutions:
+        for seconds in args.durations:
+            clip_dir = os.path.join(work_dir, f"{resolution}-{seconds}s")
+            clip = prepare_clip(args, clip_dir, resolution, seconds)
+            outro_seconds = None
+            if clip and "cached" in args.variants:
+                outro_seconds = prepare_outro(args, clip_dir, resolution, font)
+            for variant in args.variants:
+                for encoder, encoder_args in encoders.items():
+                    if clip is None:
+                        results.append({"scenario": f"{variant}/{encoder}/{resolution}/{seconds}s",
+                                        "skipped": "could not generate clip"})
+                        continue
+                    if variant == "cached" and outro_seconds is None:
+                        results.append({"scenario": f"{variant}/{encoder}/{resolution}/{seconds}s",
+                                        "skipped": "could not render outro clip"})
+                        continue
+                    result = run_case(args, clip_dir, clip, resolution, seconds, variant, encoder, encoder_args, font)
+                    if variant == "cached":
+                        result["outro_render_seconds"] = outro_seconds
+                    results.append(result)
+    return results, font
+
+
+def ffmpeg_version():
+    try:
+        out = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True).stdout
+    except OSError:
+        return None
+    return out.splitlines()[0] if out else None
+
+
+def csv_list(choices=None):
+    def parse(value):
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        unknown = [item for item in items if choices and item not in choices]
+        if unknown:
+            raise argparse.ArgumentTypeError(f"unknown: {', '.join(unknown)} (choose from {', '.join(choices)})")
+        return items
+    return parse
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="합성 영상으로 로고/아웃트로 필터그래프의 fps/CPU 시간/출력 크기 측정")
+    parser.add_argument("--resolutions", default="720p,1080p,4k", type=csv_list(RESOLUTIONS))
+    parser.add_argument("--durations", default="10,30", type=lambda v: [int(s) for s in v.split(",")],
+                        help="영상 길이(초) 목록 (아웃트로는 마지막 3초)")
+    parser.add_argument("--variants", default=",".join(VARIANTS), type=csv_list(VARIANTS))
+    parser.add_argument("--encoders", default=DEFAULT_ENCODERS, help=f"이름=ffmpeg 인자;... (기본 {DEFAULT_ENCODERS})")
+    parser.add_argument("--repeat", type=int, default=1, help="조합마다 반복 횟수 (지표는 중앙값)")
+    parser.add_argument("--logo", default=None, help="로고 PNG (기본은 1000x1000 합성 이미지)")
+    parser.add_argument("--font", default=None, help="drawtext 폰트 파일 (기본은 운영 경로 또는 시스템 폰트)")
+    parser.add_argument("--work-dir", default=None, help="합성 영상 보관 디렉토리 (지정하면 지우지 않고 재사용)")
+    parser.add_argument("--dry-run", action="store_true", help="ffmpeg 명령만 출력")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본 benchmarks/results/)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.dry_run and not shutil.which("ffmpeg"):
+        raise SystemExit("ffmpeg not found (brew install ffmpeg / apt install ffmpeg)")
+
+    work_dir = os.path.abspath(args.work_dir) if args.work_dir else tempfile.mkdtemp(prefix="autoposter-ffbench-")
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        results, font = run(args, work_dir)
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    if args.dry_run:
+        return
+
+    meta = environment_meta(
+        ffmpeg=ffmpeg_version(),
+        font=font,
+        args={k: v for k, v in vars(args).items() if k not in ("output", "work_dir")},
+    )
+    print()
+    print_table(results, [
+        ("fps", "fps"), ("speed", "x realtime"), ("cpu_seconds", "CPU s"), ("cpu_cores", "cores"),
+        ("output_mb", "MB"), ("bitrate_kbps", "kbps"), ("peak_rss_mb", "RSS MB"),
+    ])
+    print(f"\n📄 {write_results('ffmpeg', meta, results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+"""
+엔드투엔드 파이프라인 벤치마크 (외부 서비스는 web_app/core/standins.py 대역 사용, 오프라인 실행)
+
+앱을 같은 프로세스에서 띄우고(ASGI 직접 호출) 엔드포인트별로 동시 요청 수를 바꿔 가며
+    - 처리량(요청/초)과 p50/p95/p99 지연
+    - 구간 최대 RSS와 증가량 (동시 요청 하나당 증가량 포함), ffmpeg 등 자식 프로세스 최대 RSS
+    - 이벤트 루프 지연 (10ms 주기 타이머가 늦어진 시간의 합계/최대/p99, 블로킹 호출 탐지용)
+을 측정해 JSON으로 저장
+
+엔드포인트
+    upload            POST /api/upload (텍스트 입력, 요청마다 다른 문서라 변환 캐시를 타지 않음)
+    share_linkedin    POST /api/share/linkedin (미리 게시한 문서를 돌려가며 공유)
+    youtube_metadata  POST /api/youtube/metadata (PDF 분석)
+    youtube_upload    POST /api/youtube/upload + 작업 완료까지 (로고 합성에 ffmpeg 필요, 없으면 건너뜀)
+
+사용법 (저장소 루트에서, 기본은 AUTOPOSTER_BACKEND=fake, 앱 의존성 필요, 2_blog_poster는 없어도 됨):
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --endpoints upload,share_linkedin --concurrency 1,8,32 --requests 64
+    python benchmarks/bench_pipeline.py --backend replay --output before.json
+    python benchmarks/compare.py before.json after.json
+
+DB, 캐시, 작업 디렉토리는 임시 디렉토리를 쓰므로 개발용 데이터에 영향을 주지 않음
+"""
+import os
+import sys
+import time
+import uuid
+import shutil
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from common import (  # noqa: E402
+    ROOT_DIR, RssSampler, percentile, peak_rss_bytes, environment_meta, write_results, print_table,
+    make_test_clip,
+)
+
+WEB_APP_DIR = os.path.join(ROOT_DIR, "web_app")
+ENDPOINTS = ("upload", "share_linkedin", "youtube_metadata", "youtube_upload")
+# 대역 지연 기본값 (실제 서비스의 대략적인 응답 시간, STANDIN_LATENCY_MS나 --latency로 변경)
+DEFAULT_LATENCY = "gemini=800,firebase=40,linkedin=150,youtube=150"
+BENCH_USER = ("bench@example.com", "bench-password")
+
+# PDF 분석 입력 (fake 대역은 내용을 보지 않지만 replay 카세트 조회 키가 되므로 고정)
+SAMPLE_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def prepare_environment(args, work_dir):
+    """앱 import 전에 환경 변수 설정 (모든 상태를 임시 디렉토리로)"""
+    os.environ["AUTOPOSTER_BACKEND"] = args.backend
+    if args.latency is not None:
+        os.environ["STANDIN_LATENCY_MS"] = args.latency
+    else:
+        os.environ.setdefault("STANDIN_LATENCY_MS", DEFAULT_LATENCY if args.backend == "fake" else "")
+    if args.failure_rate is not None:
+        os.environ["STANDIN_FAILURE_RATE"] = args.failure_rate
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+    os.environ["SUPER_ADMIN_ID"], os.environ["SUPER_ADMIN_PW"] = BENCH_USER
+    for name, sub in (("CONVERSION_CACHE_DIR", "conversion_cache"), ("JOB_SCRATCH_DIR", "jobs"),
+                      ("BULK_IMPORT_STATE_DIR", "bulk_imports"), ("UPLOAD_SESSION_DIR", "upload_sessions"),
+                      ("UPLOAD_TEMP_DIR", "upload_tmp"), ("PROMETHEUS_MULTIPROC_DIR", "metrics")):
+        os.environ[name] = os.path.join(work_dir, sub)
+    os.environ["GEMINI_RATE_DB"] = os.path.join(work_dir, "gemini_rate.sqlite")
+    # 측정 대상은 앱 자체이므로 Gemini 분당 호출 제한은 기본적으로 끔
+    os.environ.setdefault("GEMINI_RPM", "0")
+    sys.path.insert(0, WEB_APP_DIR)
+    # 템플릿 등 상대 경로 기준 (uvicorn을 web_app에서 실행할 때와 동일)
+    os.chdir(WEB_APP_DIR)
+
+
+def make_document(index: int, chars: int, nonce: str, section_chars: int = 1200) -> str:
+    """섹션(약 section_chars자) 여러 개로 된 마크다운 (요청마다 내용이 달라 캐시를 타지 않음)"""
+    parts = [f"# 벤치마크 문서 {nonce}-{index}\n"]
+    section = 0
+    while sum(len(p) for p in parts) < chars:
+        section += 1
+        body = [f"\n## 섹션 {section}\n\n", "| 열 A | 열 B |\n|---|---|\n| 1 | 2 |\n\n"]
+        while sum(len(b) for b in body) < section_chars:
+            body.append(
+                f"문서 {index}의 {section}번째 섹션 문단입니다. 수식 $E = mc^{section}$ 과 `코드`, "
+                f"목록을 포함합니다 ({nonce}).\n\n- 항목 하나\n- 항목 둘\n\n"
+            )
+        parts.extend(body)
+    return "".join(parts)
+
+
+class LoopMonitor:
+    """이벤트 루프 지연 측정: interval마다 깨어나는 타이머가 늦어진 시간을 기록"""
+
+    def __init__(self, interval: float = 0.01, threshold: float = 0.002):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - started - self.interval))
+
+    def __enter__(self):
+        self.lags = []
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+    def metrics(self) -> dict:
+        blocked = [lag for lag in self.lags if lag > self.threshold]
+        return {
+            "loop_blocked_ms": sum(blocked) * 1000,
+            "loop_max_lag_ms": max(self.lags, default=0.0) * 1000,
+            "loop_lag_p99_ms": percentile(self.lags, 99) * 1000,
+        }
+
+
+class Bench:
+    def __init__(self, client, args, work_dir):
+        self.client = client
+        self.args = args
+        self.work_dir = work_dir
+        self.headers = {}
+        self.nonce = uuid.uuid4().hex[:8]
+        self.counter = 0
+        self.wiki_ids = []
+        self.video_path = None
+
+    async def setup(self):
+        res = await self.client.post("/api/auth/login", data={"username": BENCH_USER[0], "password": BENCH_USER[1]})
+        res.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {res.json()['access_token']}"}
+
+    def _next(self) -> int:
+        self.counter += 1
+        return self.counter
+
+    # --- 엔드포인트별 요청: (성공 여부, 상태 라벨) 반환 ---
+
+    async def upload(self):
+        i = self._next()
+        res = await self.client.post("/api/upload", headers=self.headers, data={
+            "title": f"bench-{self.nonce}-{i}", "content": make_document(i, self.args.doc_chars, self.nonce),
+        })
+        ok = res.status_code == 200 and res.json().get("status") == "success"
+        if ok:
+            self.wiki_ids.append(res.json()["wiki_id"])
+        return ok, str(res.status_code)
+
+    async def share_linkedin(self):
+        wiki_id = self.wiki_ids[self._next() % len(self.wiki_ids)]
+        res = await self.client.post("/api/share/linkedin", headers=self.headers, data={
+            "wiki_id": wiki_id, "wiki_url": f"https://example.com/report/{wiki_id}", "lang": "ko",
+        })
+        return res.status_code == 200 and res.json().get("status") == "success", str(res.status_code)
+
+    async def youtube_metadata(self):
+        res = await self.client.post(
+            "/api/youtube/metadata", headers=self.headers,
+            files={"pdf": ("bench.pdf", SAMPLE_PDF, "application/pdf")},
+            data={"category": self.args.category, "lang": "ko"},
+        )
+        return res.status_code == 200 and res.json().get("status") == "success", str(res.status_code)
+
+    async def youtube_upload(self):
+        with open(self.video_path, "rb") as f:
+            video = f.read()
+        res = await self.client.post(
+            "/api/youtube/upload", headers=self.headers,
+            files={"video": ("bench.mp4", video, "video/mp4"), "pdf": ("bench.pdf", SAMPLE_PDF, "application/pdf")},
+            data={"category": self.args.category, "lang": "ko"},
+        )
+        if res.status_code != 202:
+            return False, str(res.status_code)
+        # 작업이 끝날 때까지 (대기열 대기 + 인코딩 + 업로드 포함)
+        job_id = res.json()["job_id"]
+        while True:
+            await asyncio.sleep(0.1)
+            job = (await self.client.get(f"/api/jobs/{job_id}", headers=self.headers)).json()
+            if job.get("status") in ("success", "error"):
+                return job["status"] == "success", f"job_{job['status']}"
+
+    # --- 시나리오 ---
+
+    async def prepare(self, endpoint):
+        """엔드포인트 실행 조건 준비, 실행할 수 없으면 이유 반환"""
+        if endpoint == "share_linkedin" and not self.wiki_ids:
+            for _ in range(self.args.seed_docs):
+                await self.upload()
+            if not self.wiki_ids:
+                return "could not publish seed documents"
+        if endpoint == "youtube_upload" and self.video_path is None:
+            path = os.path.join(self.work_dir, "sample.mp4")
+            if not make_test_clip(path, self.args.video_seconds):
+                return "ffmpeg not found"
+            self.video_path = path
+        return None
+
+    async def scenario(self, endpoint, concurrency):
+        call = getattr(self, endpoint)
+        for _ in range(self.args.warmup):
+            await call()
+
+        total = max(self.args.requests, concurrency * 2)
+        latencies, statuses = [], {}
+        issued = 0
+        ok_count = 0
+
+        async def worker():
+            nonlocal issued, ok_count
+            while issued < total:
+                issued += 1
+                started = time.perf_counter()
+                try:
+                    ok, label = await call()
+                except Exception as e:
+                    ok, label = False, type(e).__name__
+                latencies.append(time.perf_counter() - started)
+                statuses[label] = statuses.get(label, 0) + 1
+                ok_count += ok
+
+        with RssSampler() as rss, LoopMonitor() as loop_monitor:
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - started
+
+        ms = [value * 1000 for value in latencies]
+        growth = max(0, rss.peak - rss.baseline)
+        return {
+            "scenario": f"{endpoint}@c{concurrency}",
+            "endpoint": endpoint,
+            "concurrency": concurrency,
+            "requests": total,
+            "statuses": statuses,
+            "metrics": {
+                "throughput_rps": total / elapsed if elapsed else 0.0,
+                "success_ratio": ok_count / total,
+                "latency_p50_ms": percentile(ms, 50),
+                "latency_p95_ms": percentile(ms, 95),
+                "latency_p99_ms": percentile(ms, 99),
+                "latency_mean_ms": sum(ms) / len(ms),
+                "latency_max_ms": max(ms),
+                "rss_peak_mb": rss.peak / 2 ** 20,
+                "rss_growth_mb": growth / 2 ** 20,
+                "rss_per_inflight_request_mb": growth / concurrency / 2 ** 20,
+                "child_peak_rss_mb": peak_rss_bytes(children=True) / 2 ** 20,
+                **loop_monitor.metrics(),
+            },
+        }
+
+
+async def run(args, work_dir):
+    import httpx
+    import main
+
+    results = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            bench = Bench(client, args, work_dir)
+            await bench.setup()
+            for endpoint in args.endpoints:
+                reason = await bench.prepare(endpoint)
+                for concurrency in args.concurrency:
+                    if reason:
+                        results.append({"scenario": f"{endpoint}@c{concurrency}", "endpoint": endpoint,
+                                        "concurrency": concurrency, "skipped": reason})
+                        continue
+                    print(f"▶ {endpoint} @ concurrency {concurrency}", flush=True)
+                    results.append(await bench.scenario(endpoint, concurrency))
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="오프라인 대역으로 주요 엔드포인트의 처리량/지연/메모리/이벤트 루프 지연 측정")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        type=lambda v: [e.strip() for e in v.split(",") if e.strip()])
+    parser.add_argument("--concurrency", default="1,4,16", type=lambda v: [int(c) for c in v.split(",")])
+    parser.add_argument("--requests", type=int, default=24, help="시나리오당 요청 수 (최소 동시 요청 수의 2배)")
+    parser.add_argument("--warmup", type=int, default=1, help="시나리오 시작 전 측정하지 않는 요청 수")
+    parser.add_argument("--backend", choices=("fake", "replay"), default="fake")
+    parser.add_argument("--latency", default=None, help=f"STANDIN_LATENCY_MS (fake 기본 {DEFAULT_LATENCY})")
+    parser.add_argument("--failure-rate", default=None, help="STANDIN_FAILURE_RATE")
+    parser.add_argument("--doc-chars", type=int, default=6000, help="upload 문서 크기(문자)")
+    parser.add_argument("--seed-docs", type=int, default=4, help="share_linkedin 전에 게시할 문서 수")
+    parser.add_argument("--video-seconds", type=int, default=10, help="youtube_upload 합성 영상 길이(초)")
+    parser.add_argument("--category", default="tech", help="유튜브 카테고리 (로고가 있어야 함)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본 benchmarks/results/)")
+    args = parser.parse_args()
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main():
+    args = parse_args()
+    # 이후 web_app으로 작업 디렉토리를 옮기므로 먼저 절대 경로로
+    args.output = os.path.abspath(args.output) if args.output else None
+    work_dir = tempfile.mkdtemp(prefix="autoposter-bench-")
+    try:
+        prepare_environment(args, work_dir)
+        results = asyncio.run(run(args, work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    meta = environment_meta(
+        backend=args.backend,
+        standin_latency_ms=os.getenv("STANDIN_LATENCY_MS", ""),
+        standin_failure_rate=os.getenv("STANDIN_FAILURE_RATE", ""),
+        args={k: v for k, v in vars(args).items() if k != "output"},
+    )
+    print()
+    print_table(results, [
+        ("throughput_rps", "req/s"), ("latency_p50_ms", "p50 ms"), ("latency_p95_ms", "p95 ms"),
+        ("latency_p99_ms", "p99 ms"), ("success_ratio", "ok ratio"), ("rss_growth_mb", "RSS +MB"),
+        ("loop_blocked_ms", "loop blk ms"),
+    ])
+    print(f"\n📄 {write_results('pipeline', meta, results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+벤치마크 공통 도구: 백분위수, 메모리 측정, 실행 환경 정보, 결과 JSON 저장
+
+결과 파일 형식 (compare.py로 커밋 간 비교)
+    {
+      "benchmark": "pipeline",
+      "meta": {"commit", "dirty", "timestamp", "python", "platform", "cpus", ...},
+      "results": [{"scenario": "upload@c4", ..., "metrics": {"throughput_rps": ..., "latency_p95_ms": ...}}]
+    }
+"""
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import shutil
+import threading
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+
+def percentile(values, pct: float) -> float:
+    """선형 보간 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def current_rss_bytes() -> int:
+    """현재 프로세스 RSS (리눅스 /proc, 그 외에는 지금까지의 최대값)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes(children: bool = False) -> int:
+    """최대 RSS (children=True면 종료된 자식 프로세스 중 최대, 예: ffmpeg)"""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # macOS는 바이트, 리눅스는 KB 단위
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+class RssSampler:
+    """구간 동안 RSS를 주기적으로 읽어 최대값 기록 (with 블록)"""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.baseline = self.peak = current_rss_bytes()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss_bytes())
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss_bytes())
+
+
+def make_test_clip(path: str, seconds: int, size: str = "1280x720", rate: int = 30) -> bool:
+    """lavfi testsrc(영상) + sine(음성)으로 합성 H.264 영상 생성 (ffmpeg가 없거나 실패하면 False)"""
+    if not shutil.which("ffmpeg"):
+        return False
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "lavfi", "-i", f"testsrc=size={size}:rate={rate}:duration={seconds}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:duration={seconds}",
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", "-c:a", "aac", "-shortest", path,
+    ]
+    return subprocess.run(cmd).returncode == 0
+
+
+def git_info():
+    def run(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT_DIR, capture_output=True, text=True, timeout=30).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return ""
+    return {"commit": run("rev-parse", "HEAD") or None, "dirty": bool(run("status", "--porcelain", "--untracked-files=no"))}
+
+
+def environment_meta(**extra) -> dict:
+    return {
+        **git_info(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        **extra,
+    }
+
+
+def write_results(benchmark: str, meta: dict, results: list, output: str = None) -> str:
+    """결과 JSON 저장 후 경로 반환 (기본 benchmarks/results/<이름>-<커밋>-<시각>.json)"""
+    if not output:
+        commit = (meta.get("commit") or "nocommit")[:10]
+        output = os.path.join(RESULTS_DIR, f"{benchmark}-{commit}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"benchmark": benchmark, "meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+    return output
+
+
+def print_table(results: list, columns):
+    """시나리오별 주요 지표 표 출력 (columns: [(지표 키, 머리글), ...])"""
+    header = f"{'scenario':<28}" + "".join(f"{title:>14}" for _, title in columns)
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        if result.get("skipped"):
+            print(f"{result['scenario']:<28}  skipped: {result['skipped']}")
+            continue
+        metrics = result["metrics"]
+        cells = []
+        for key, _ in columns:
+            value = metrics.get(key)
+            cells.append(f"{value:>14.2f}" if isinstance(value, (int, float)) else f"{'-':>14}")
+        print(f"{result['scenario']:<28}" + "".join(cells))
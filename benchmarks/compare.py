@@ -0,0 +1,53 @@
+"""
+벤치마크 결과 JSON 두 개 비교 (시나리오별 지표 변화율)
+
+사용법:
+    python benchmarks/compare.py before.json after.json
+    python benchmarks/compare.py before.json after.json --metrics throughput_rps,latency_p95_ms
+"""
+import sys
+import json
+import argparse
+
+# 값이 클수록 좋은 지표 (나머지는 작을수록 좋음)
+HIGHER_IS_BETTER = ("throughput_rps", "success_ratio", "fps", "speed")
+
+
+def load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data, {r["scenario"]: r for r in data["results"] if not r.get("skipped")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크 결과 비교")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--metrics", default=None, type=lambda v: [m.strip() for m in v.split(",") if m.strip()],
+                        help="비교할 지표 (기본: 모든 공통 지표)")
+    args = parser.parse_args()
+
+    before_data, before = load(args.before)
+    after_data, after = load(args.after)
+    if before_data.get("benchmark") != after_data.get("benchmark"):
+        sys.exit(f"❌ different benchmarks: {before_data.get('benchmark')} vs {after_data.get('benchmark')}")
+    print(f"before: {(before_data['meta'].get('commit') or '?')[:10]}  after: {(after_data['meta'].get('commit') or '?')[:10]}\n")
+
+    print(f"{'scenario':<28}{'metric':<30}{'before':>12}{'after':>12}{'change':>10}")
+    for scenario in sorted(set(before) & set(after)):
+        old, new = before[scenario]["metrics"], after[scenario]["metrics"]
+        for metric in args.metrics or sorted(set(old) & set(new)):
+            if metric not in old or metric not in new:
+                continue
+            a, b = old[metric], new[metric]
+            change = (b - a) / a * 100 if a else 0.0
+            better = change > 0 if metric.startswith(HIGHER_IS_BETTER) else change < 0
+            mark = "" if abs(change) < 5 else (" ✅" if better else " ⚠️")
+            print(f"{scenario:<28}{metric:<30}{a:>12.2f}{b:>12.2f}{change:>9.1f}%{mark}")
+    missing = sorted(set(before) ^ set(after))
+    if missing:
+        print(f"\n(only in one run: {', '.join(missing)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,13 @@ import os
 from dotenv import load_dotenv
 import base64
 
+try:
+    # web_app에서 실행될 때만 메트릭 기록 (web_app/core/metrics.py)
+    from core.metrics import track_call
+except ImportError:
+    from contextlib import nullcontext
+    track_call = lambda *args: nullcontext()
+
 load_dotenv()
 
 class LinkedInPoster:
@@ -60,8 +67,9 @@ class LinkedInPoster:
         
         try:
             print(f"Registering image upload for owner: {self.person_urn}")
-            response = requests.post(register_url, headers=headers, json=register_payload)
-            response.raise_for_status()
+            with track_call("linkedin", "register"):
+                response = requests.post(register_url, headers=headers, json=register_payload)
+                response.raise_for_status()
             register_data = response.json()
             
             # Defensive check for nested keys
@@ -102,8 +110,9 @@ class LinkedInPoster:
                 "Authorization": f"Bearer {self.access_token}",
                 "Content-Type": content_type
             }
-            upload_response = requests.put(put_url, headers=upload_headers, data=image_bytes)
-            upload_response.raise_for_status()
+            with track_call("linkedin", "put"):
+                upload_response = requests.put(put_url, headers=upload_headers, data=image_bytes)
+                upload_response.raise_for_status()
             
             print(f"Successfully uploaded image. Asset URN: {asset_urn}")
             return asset_urn
@@ -170,8 +179,9 @@ class LinkedInPoster:
             ]
 
         try:
-            response = requests.post(self.api_url, headers=headers, json=share_content)
-            response.raise_for_status()
+            with track_call("linkedin", "post"):
+                response = requests.post(self.api_url, headers=headers, json=share_content)
+                response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"Error posting to LinkedIn: {e}")
@@ -2,18 +2,51 @@ from google import genai
 import os
 from dotenv import load_dotenv
 
+try:
+    # web_app에서 실행될 때는 공용 게이트웨이(동시 실행 한도, 속도 제한, 재시도, 메트릭) 사용 (web_app/core/gemini_gateway.py)
+    from core import gemini_gateway
+except ImportError:
+    gemini_gateway = None
+
 load_dotenv()
 
 class GeminiSummarizer:
     def __init__(self, api_key=None):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
             
-        if self.api_key:
-            self.client = genai.Client(api_key=self.api_key)
+        if self.api_key or (gemini_gateway and gemini_gateway.gateway.available):
+            if gemini_gateway:
+                self.client = gemini_gateway.gateway.client(self.api_key)
+            else:
+                self.client = genai.Client(api_key=self.api_key)
             self.model_id = 'gemini-2.0-flash'
         else:
             self.client = None
 
+    def generate(self, contents, purpose, timeout=None):
+        """generate_content 호출 (web_app에서는 게이트웨이를 거침)"""
+        if gemini_gateway:
+            return gemini_gateway.generate_content(
+                self.model_id, contents, purpose=purpose, timeout=timeout, api_key=self.api_key
+            )
+        return self.client.models.generate_content(model=self.model_id, contents=contents)
+
+    def upload_file(self, path, mime_type, purpose="upload"):
+        """Files API 업로드 (web_app에서는 게이트웨이를 거침)"""
+        if gemini_gateway:
+            return gemini_gateway.get_gateway().upload_file(path, mime_type, purpose=purpose, api_key=self.api_key)
+        return self.client.files.upload(file=path, config={'mime_type': mime_type})
+
+    def get_file(self, name):
+        if gemini_gateway:
+            return gemini_gateway.get_gateway().get_file(name, api_key=self.api_key)
+        return self.client.files.get(name=name)
+
+    def delete_file(self, name):
+        if gemini_gateway:
+            return gemini_gateway.get_gateway().delete_file(name, api_key=self.api_key)
+        return self.client.files.delete(name=name)
+
     def to_unicode_bold(self, text):
         # Simplified mapping for alphanumeric characters to Unicode bold
         bold_map = {
@@ -89,10 +122,7 @@ class GeminiSummarizer:
             """
         
         try:
-            response = self.client.models.generate_content(
-                model=self.model_id,
-                contents=prompt
-            )
+            response = self.generate(prompt, "linkedin_summary")
             text = response.text.strip()
             text = self.post_process_bold(text)
             
@@ -0,0 +1,113 @@
+"""
+정적 자산 / 페이지 캐시 계층
+워커 시작 시 한 번만 빌드:
+    - 요청별 컨텍스트가 필요 없는 페이지 템플릿을 미리 렌더링
+    - /static 파일은 내용 해시가 들어간 파일명(app.3f2a1b9c0d1e.js)으로 제공 (immutable 캐시)
+    - 모든 자산을 gzip / brotli로 미리 압축해 두고 Accept-Encoding에 맞춰 선택
+응답에는 강한 ETag를 붙이고 If-None-Match가 일치하면 본문 없이 304를 반환하므로
+재방문 시 서버는 해시 비교만 수행함
+
+brotli 패키지가 없으면 gzip만 사용
+"""
+import os
+import gzip
+import hashlib
+import logging
+import mimetypes
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 페이지는 매번 재검증(304), 해시 파일명 자산은 1년 immutable
+PAGE_CACHE_CONTROL = "no-cache"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 이보다 작은 파일은 압축해도 이득이 거의 없음
+MIN_COMPRESS_BYTES = 512
+
+
+class Asset:
+    """미리 빌드된 응답 본문과 압축본, ETag"""
+
+    def __init__(self, body: bytes, media_type: str, cache_control: str):
+        self.media_type = media_type
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()
+        # 표현(인코딩)마다 다른 강한 ETag
+        self.variants = {None: (body, f'"{self.digest[:32]}"')}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            self.variants["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{self.digest[:32]}-gz"')
+            if brotli is not None:
+                self.variants["br"] = (brotli.compress(body, quality=11), f'"{self.digest[:32]}-br"')
+        self.etags = {etag for _, etag in self.variants.values()}
+
+    def select(self, accept_encoding: str):
+        """Accept-Encoding에 맞는 (encoding, body, etag) 선택 (br > gzip > 원본)"""
+        accepted = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                return (encoding,) + self.variants[encoding]
+        return (None,) + self.variants[None]
+
+    def response(self, request) -> Response:
+        encoding, body, etag = self.select(request.headers.get("accept-encoding"))
+        headers = {"ETag": etag, "Cache-Control": self.cache_control, "Vary": "Accept-Encoding"}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if "*" in tags or tags & self.etags:
+                return Response(status_code=304, headers=headers)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type=self.media_type, headers=headers)
+
+
+class AssetStore:
+    def __init__(self, static_dir: str):
+        self.static_dir = static_dir
+        self._pages = {}
+        self._static = {}  # 해시 파일명 -> Asset
+        self._plain = {}  # 원래 경로 -> Asset (해시 없는 URL 호환용, 매번 재검증)
+        self._urls = {}  # 원래 경로 -> /static/해시 파일명
+
+    def build_static(self):
+        """static 디렉토리 전체를 읽어 해시 파일명과 압축본 생성"""
+        static, plain, urls = {}, {}, {}
+        if os.path.isdir(self.static_dir):
+            for root, _, files in os.walk(self.static_dir):
+                for name in files:
+                    full_path = os.path.join(root, name)
+                    rel_path = os.path.relpath(full_path, self.static_dir).replace(os.sep, "/")
+                    with open(full_path, "rb") as f:
+                        body = f.read()
+                    media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+                    asset = Asset(body, media_type, IMMUTABLE_CACHE_CONTROL)
+                    stem, ext = os.path.splitext(rel_path)
+                    hashed = f"{stem}.{asset.digest[:12]}{ext}"
+                    static[hashed] = asset
+                    plain[rel_path] = Asset(body, media_type, PAGE_CACHE_CONTROL)
+                    urls[rel_path] = f"/static/{hashed}"
+        self._static, self._plain, self._urls = static, plain, urls
+        logger.info(f"Static assets built: {len(static)} files")
+
+    def build_pages(self, templates, names):
+        """컨텍스트 없이 렌더링 가능한 템플릿을 미리 렌더링하여 저장"""
+        for name in names:
+            html = templates.get_template(name).render()
+            self._pages[name] = Asset(html.encode("utf-8"), "text/html; charset=utf-8", PAGE_CACHE_CONTROL)
+        logger.info(f"Pages prerendered: {', '.join(names)}")
+
+    def url(self, path: str) -> str:
+        """템플릿용: 원래 경로를 해시 파일명 URL로 변환 ({{ asset_url('app.js') }})"""
+        path = path.lstrip("/")
+        return self._urls.get(path, f"/static/{path}")
+
+    def page(self, name: str):
+        return self._pages.get(name)
+
+    def static(self, path: str):
+        return self._static.get(path) or self._plain.get(path)
@@ -1,11 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 
-# SQLite 데이터베이스 경로 설정
+# SQLite 데이터베이스 경로 설정 (벤치마크 등에서 DATABASE_URL로 별도 파일 지정 가능)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, 'autoposter.db')}"
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(BASE_DIR, 'autoposter.db')}")
 
 engine = create_engine(
     DATABASE_URL, connect_args={"check_same_thread": False}
@@ -21,3 +21,12 @@ def get_db():
     finally:
         db.close()
 
+
+def begin_write_lock(db):
+    """
+    현재 세션에서 DB 쓰기 잠금을 먼저 획득 (SQLite: BEGIN IMMEDIATE)
+    여러 워커가 동시에 같은 초기화를 수행할 때 한 워커씩 확인-기록하도록 직렬화하며,
+    잠금은 db.commit() / db.rollback() 시 해제됨
+    """
+    if engine.dialect.name == "sqlite":
+        db.execute(text("BEGIN IMMEDIATE"))
@@ -0,0 +1,79 @@
+"""
+블로킹 작업 오프로딩용 스레드 풀
+async 엔드포인트에서 동기 SDK 호출(Gemini, GCS/Firestore, LinkedIn/YouTube REST, bcrypt 등)을
+의존성 종류별 전용 풀에서 실행하여 이벤트 루프가 멈추지 않도록 함
+
+종류별 풀 크기는 환경 변수로 조정:
+    LLM_POOL_SIZE      Gemini 호출 (기본 8)
+    STORAGE_POOL_SIZE  GCS/Firestore 호출 (기본 8)
+    NETWORK_POOL_SIZE  LinkedIn/YouTube 등 외부 REST 호출 (기본 8)
+    CPU_POOL_SIZE      bcrypt 해시, 파일 암호화 등 CPU 작업 (기본 CPU 코어 수)
+    DISK_POOL_SIZE     업로드 파일 저장 등 로컬 디스크 I/O (기본 4)
+    EVENTS_POOL_SIZE   진행 이벤트 스트림의 작업 상태 조회/인증 (기본 2, 업로드 I/O와 분리)
+"""
+import os
+import asyncio
+import functools
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LLM = "llm"
+STORAGE = "storage"
+NETWORK = "network"
+CPU = "cpu"
+DISK = "disk"
+EVENTS = "events"
+
+_DEFAULT_SIZES = {
+    LLM: ("LLM_POOL_SIZE", 8),
+    STORAGE: ("STORAGE_POOL_SIZE", 8),
+    NETWORK: ("NETWORK_POOL_SIZE", 8),
+    CPU: ("CPU_POOL_SIZE", os.cpu_count() or 2),
+    DISK: ("DISK_POOL_SIZE", 4),
+    EVENTS: ("EVENTS_POOL_SIZE", 2),
+}
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def pool_size(kind: str) -> int:
+    env_name, default = _DEFAULT_SIZES[kind]
+    return int(os.getenv(env_name, str(default)))
+
+
+def get_pool(kind: str) -> ThreadPoolExecutor:
+    """종류별 스레드 풀 반환 (최초 사용 시 생성)"""
+    if kind not in _DEFAULT_SIZES:
+        raise ValueError(f"Unknown executor kind: {kind}")
+    pool = _pools.get(kind)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(kind)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=pool_size(kind), thread_name_prefix=f"{kind}-pool")
+                _pools[kind] = pool
+    return pool
+
+
+async def run_in(kind: str, fn, *args, **kwargs):
+    """
+    동기 함수를 지정한 종류의 풀에서 실행하고 결과를 기다림
+    (contextvars를 복사하여 요청 컨텍스트가 워커 스레드에서도 유지되도록 함)
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    return await loop.run_in_executor(get_pool(kind), call)
+
+
+def shutdown():
+    """모든 풀 종료 (앱 종료 시)"""
+    with _lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
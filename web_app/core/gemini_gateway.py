@@ -0,0 +1,327 @@
+"""
+Gemini 호출 공용 게이트웨이
+서비스마다 genai.Client를 따로 만들고 서로 모른 채 호출하면 몰릴 때 429가 나고 기본 문구로 대체되므로
+모든 Gemini 호출을 이 모듈로 모아
+
+    - API 키별 클라이언트 풀 (GEMINI_CLIENT_POOL_SIZE개를 돌려 사용, 기본 4)
+    - 프로세스 내 동시 호출 한도 (GEMINI_MAX_CONCURRENCY, 기본 8): 대기 중에는 대화형 요청이 배치 작업보다 먼저
+    - 모델별 토큰 버킷 속도 제한 (분당 GEMINI_RPM, 모델별 GEMINI_RATE_LIMITS="모델=RPM,...", 설정하지 않으면 제한 없음):
+      SQLite 파일(GEMINI_RATE_DB)에 버킷을 두어 모든 uvicorn 워커가 공유하며,
+      버킷의 GEMINI_BATCH_RESERVE 비율은 대화형 요청 몫으로 남겨 둠
+    - 429/5xx/시간 초과는 지수 백오프 + 지터로 GEMINI_MAX_RETRIES번까지 재시도 (429는 버킷도 비워 다른 워커도 쉬게 함)
+    - 호출별 시간 제한 (기본 GEMINI_TIMEOUT_SECONDS)
+
+설정(GEMINI_*)은 게이트웨이를 처음 사용할 때 읽으므로 시작 시 DB에서 로드한 환경 변수도 반영됨
+
+우선순위는 contextvars로 전달되므로 백그라운드 작업은 `with gemini_gateway.priority(BATCH):` 안에서 호출하면 됨
+(executors.run_in으로 넘긴 호출에도 그대로 적용)
+"""
+import os
+import time
+import heapq
+import random
+import sqlite3
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+from dotenv import load_dotenv
+from google import genai
+from google.genai import types, errors
+from core import metrics, standins
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BATCH = 1
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_RATE_DB = os.path.join(BASE_DIR, 'scratch', 'gemini_rate.sqlite')
+
+RETRYABLE_CODES = {408, 429, 500, 502, 503, 504}
+# Files API 호출(업로드/상태 조회/삭제)의 속도 제한 버킷과 메트릭 model 라벨 (GEMINI_RATE_LIMITS="files=..."로 제한)
+FILES_MODEL = "files"
+
+_priority = contextvars.ContextVar("gemini_priority", default=INTERACTIVE)
+
+
+class GeminiUnavailable(RuntimeError):
+    """GEMINI_API_KEY가 없어 호출할 수 없는 경우"""
+
+
+@contextmanager
+def priority(level: int):
+    """블록 안의 Gemini 호출 우선순위 지정 (INTERACTIVE / BATCH)"""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _PrioritySlots:
+    """동시 실행 한도: 빈 자리가 나면 (우선순위, 도착 순서)가 가장 앞선 대기자부터 진행"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def acquire(self, level: int):
+        entry = (level, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            while self._active >= self.limit or self._waiters[0] != entry:
+                self._cond.wait()
+            heapq.heappop(self._waiters)
+            self._active += 1
+            self._cond.notify_all()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+
+class RateLimiter:
+    """
+    모델별 토큰 버킷 (SQLite에 저장하여 프로세스 간 공유)
+    분당 rpm개가 채워지고 최대 capacity개까지 모임, 배치 요청은 capacity * reserve 이상 남아 있을 때만 사용
+    """
+
+    def __init__(self, db_path: str = None, default_rpm: float = None, limits: str = None, reserve: float = None):
+        self.db_path = db_path or os.getenv("GEMINI_RATE_DB", DEFAULT_RATE_DB)
+        # 할당량은 요금제/모델마다 다르므로 설정하지 않으면 제한하지 않음 (429는 재시도/백오프로 처리)
+        self.default_rpm = default_rpm if default_rpm is not None else float(os.getenv("GEMINI_RPM", "0"))
+        self.reserve = reserve if reserve is not None else float(os.getenv("GEMINI_BATCH_RESERVE", "0.25"))
+        self.rpm = {}
+        for item in (limits if limits is not None else os.getenv("GEMINI_RATE_LIMITS", "")).split(","):
+            if "=" in item:
+                model, value = item.rsplit("=", 1)
+                self.rpm[model.strip()] = float(value)
+        self._local = threading.local()
+
+    def limits(self, model: str):
+        """(분당 요청 수, 버킷 크기) 반환, 분당 요청 수가 0 이하면 제한 없음"""
+        rpm = self.rpm.get(model, self.default_rpm)
+        return rpm, max(1.0, rpm / 4)
+
+    def acquire(self, model: str, level: int = INTERACTIVE, deadline: float = None):
+        """토큰 하나를 얻을 때까지 대기 (deadline(monotonic)을 넘기면 TimeoutError)"""
+        rpm, capacity = self.limits(model)
+        if rpm <= 0:
+            return
+        rate = rpm / 60.0
+        floor = capacity * self.reserve if level != INTERACTIVE else 0.0
+        while True:
+            wait = self._take(model, rate, capacity, floor)
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise TimeoutError(f"Gemini rate limit wait exceeded for {model}")
+            time.sleep(min(wait, 5.0) + random.uniform(0, 0.05))
+
+    def penalize(self, model: str):
+        """429를 받으면 버킷을 비워 모든 워커가 잠시 쉬게 함"""
+        try:
+            conn = self._conn()
+            conn.execute("UPDATE gemini_buckets SET tokens = MIN(tokens, 0), updated = ? WHERE model = ?", (time.time(), model))
+        except sqlite3.Error as e:
+            logger.warning(f"Gemini rate limiter update failed: {e}")
+
+    def _take(self, model, rate, capacity, floor) -> float:
+        """토큰을 하나 가져가면 0, 부족하면 기다려야 할 초 반환"""
+        try:
+            conn = self._conn()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = conn.execute("SELECT tokens, updated FROM gemini_buckets WHERE model = ?", (model,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+                if tokens - 1 >= floor:
+                    tokens -= 1
+                    wait = 0.0
+                else:
+                    wait = (floor + 1 - tokens) / rate
+                conn.execute(
+                    "INSERT INTO gemini_buckets (model, tokens, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT(model) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                    (model, tokens, now)
+                )
+                conn.execute("COMMIT")
+                return wait
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            # 공유 버킷을 쓸 수 없으면 제한 없이 진행 (재시도/백오프는 그대로 동작)
+            logger.warning(f"Gemini rate limiter unavailable: {e}")
+            return 0.0
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS gemini_buckets (model TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+
+class GeminiGateway:
+    def __init__(self):
+        self.pool_size = int(os.getenv("GEMINI_CLIENT_POOL_SIZE", "4"))
+        self.timeout = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "120"))
+        self.max_retries = int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+        self.backoff_base = float(os.getenv("GEMINI_BACKOFF_BASE_SECONDS", "1"))
+        self.backoff_max = float(os.getenv("GEMINI_BACKOFF_MAX_SECONDS", "30"))
+        self.slots = _PrioritySlots(int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")))
+        self.limiter = RateLimiter()
+        self._clients = {}  # api_key -> [Client, ...]
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return bool(os.getenv("GEMINI_API_KEY")) or standins.OFFLINE
+
+    def client(self, api_key: str = None):
+        """풀에서 클라이언트 하나 반환 (API 키는 호출 시점의 환경 변수, DB에서 로드된 키도 반영)"""
+        api_key = api_key or os.getenv("GEMINI_API_KEY")
+        if standins.BACKEND != "live" and (api_key or standins.OFFLINE):
+            # AUTOPOSTER_BACKEND=record/replay/fake: 기록/재생/가짜 클라이언트 (core/standins.py)
+            return standins.backend("gemini", lambda: self._pooled_client(api_key), standins.FakeGemini)
+        if not api_key:
+            raise GeminiUnavailable("GEMINI_API_KEY not found")
+        return self._pooled_client(api_key)
+
+    def _pooled_client(self, api_key: str):
+        pool = self._clients.get(api_key)
+        if pool is None:
+            with self._lock:
+                pool = self._clients.get(api_key)
+                if pool is None:
+                    pool = [
+                        genai.Client(api_key=api_key, http_options=types.HttpOptions(timeout=int(self.timeout * 1000)))
+                        for _ in range(max(1, self.pool_size))
+                    ]
+                    self._clients[api_key] = pool
+        return pool[next(self._next) % len(pool)]
+
+    def generate_content(self, model: str, contents, purpose: str = "generate", config=None,
+                         timeout: float = None, level: int = None, api_key: str = None):
+        """
+        generate_content 호출 (동시 실행 한도, 속도 제한, 재시도 적용)
+
+        Raises:
+            GeminiUnavailable: API 키가 없는 경우
+            마지막 시도의 예외: 재시도할 수 없는 오류이거나 재시도 횟수를 모두 쓴 경우
+        """
+        timeout = timeout or self.timeout
+        config = self._with_timeout(config, timeout)
+        client = self.client(api_key)
+        return self._call(
+            model, purpose, lambda: client.models.generate_content(model=model, contents=contents, config=config),
+            timeout, level
+        )
+
+    def upload_file(self, path: str, mime_type: str, purpose: str = "upload", timeout: float = None,
+                    level: int = None, api_key: str = None):
+        """Files API 업로드 (generate_content와 같은 한도/재시도/메트릭 적용, 속도 제한 버킷은 FILES_MODEL)"""
+        client = self.client(api_key)
+        return self._call(FILES_MODEL, purpose, lambda: client.files.upload(file=path, config={"mime_type": mime_type}),
+                          timeout, level)
+
+    def get_file(self, name: str, purpose: str = "file_status", level: int = None, api_key: str = None):
+        client = self.client(api_key)
+        return self._call(FILES_MODEL, purpose, lambda: client.files.get(name=name), None, level)
+
+    def delete_file(self, name: str, purpose: str = "file_delete", level: int = None, api_key: str = None):
+        client = self.client(api_key)
+        return self._call(FILES_MODEL, purpose, lambda: client.files.delete(name=name), None, level)
+
+    def _call(self, model, purpose, fn, timeout=None, level=None):
+        """fn()을 동시 실행 한도, 속도 제한, 재시도, 메트릭 안에서 실행"""
+        level = _priority.get() if level is None else level
+        timeout = timeout or self.timeout
+
+        attempt = 0
+        while True:
+            # 토큰은 동시 실행 자리를 잡기 전에 받음 (속도 제한 대기 중에 자리를 차지하지 않도록)
+            self.limiter.acquire(model, level, time.monotonic() + timeout)
+            with self.slots.acquire(level):
+                try:
+                    with metrics.track_gemini(model, purpose):
+                        return fn()
+                except Exception as e:
+                    code = self._status_code(e)
+                    if code == 429:
+                        self.limiter.penalize(model)
+                    if attempt >= self.max_retries or not self._retryable(e, code):
+                        raise
+                    reason = code or type(e).__name__
+            # 전체 지터 지수 백오프
+            delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+            attempt += 1
+            logger.warning(f"Gemini {model} ({purpose}) failed with {reason}, retry {attempt} in {delay:.1f}s")
+            time.sleep(delay)
+
+    @staticmethod
+    def _with_timeout(config, timeout):
+        http_options = types.HttpOptions(timeout=int(timeout * 1000))
+        if config is None:
+            return types.GenerateContentConfig(http_options=http_options)
+        if isinstance(config, dict):
+            return {**config, "http_options": http_options}
+        return config.model_copy(update={"http_options": http_options})
+
+    @staticmethod
+    def _status_code(e):
+        return getattr(e, "code", None) if isinstance(e, errors.APIError) else None
+
+    @staticmethod
+    def _retryable(e, code) -> bool:
+        if code is not None:
+            return code in RETRYABLE_CODES
+        # 연결 끊김/시간 초과 (httpx 예외 이름으로 판별하여 의존성 추가 없이 처리)
+        return isinstance(e, (TimeoutError, ConnectionError)) or type(e).__name__ in (
+            "ReadTimeout", "ConnectTimeout", "WriteTimeout", "PoolTimeout", "RemoteProtocolError", "ConnectError", "ReadError"
+        )
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> GeminiGateway:
+    """
+    공용 게이트웨이 (처음 사용할 때 생성)
+    GEMINI_* 설정은 main.py가 시작 시 DB에 저장된 .env를 로드한 뒤에 읽어야 하므로 import 시점에 만들지 않음
+    """
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = GeminiGateway()
+    return _gateway
+
+
+def __getattr__(name):
+    # gemini_gateway.gateway 접근도 지연 생성으로
+    if name == "gateway":
+        return get_gateway()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def generate_content(model: str, contents, purpose: str = "generate", **kwargs):
+    """모듈 수준 단축 함수 (gateway.generate_content)"""
+    return get_gateway().generate_content(model, contents, purpose=purpose, **kwargs)
@@ -0,0 +1,178 @@
+"""
+Prometheus 메트릭 (멀티 프로세스 집계)
+외부 호출(Gemini, GCS, Firestore, LinkedIn, YouTube) 지연/오류, ffmpeg 처리 시간과 출력 비트레이트,
+작업 대기열 깊이/실행 중 작업 수를 기록
+
+uvicorn 워커가 여러 개여도 /metrics가 전체 합계를 보여주도록 prometheus_client 멀티 프로세스 모드 사용:
+각 프로세스가 PROMETHEUS_MULTIPROC_DIR(기본 web_app/scratch/metrics)에 값을 기록하고 노출 시 합산함
+(배포 시 이 디렉토리를 비우면 누적값이 초기화됨)
+
+prometheus_client가 설치되어 있지 않으면 모든 기록은 아무 동작도 하지 않음
+루트의 core/linkedin_poster.py, core/summarizer.py, youtube_poster는 web_app에서 실행될 때만 이 모듈을 사용
+"""
+import os
+import re
+import hmac
+import time
+import ipaddress
+from contextlib import contextmanager
+from . import tracing
+
+MULTIPROC_DIR = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scratch', 'metrics')
+)
+os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, multiprocess
+except ImportError:  # 선택 의존성
+    prometheus_client = None
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, *args, **kwargs):
+        pass
+
+    def inc(self, *args, **kwargs):
+        pass
+
+    def dec(self, *args, **kwargs):
+        pass
+
+
+if prometheus_client is not None:
+    EXTERNAL_LATENCY = Histogram(
+        "autoposter_external_call_seconds", "Latency of external API calls",
+        ["service", "operation"], buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900)
+    )
+    EXTERNAL_ERRORS = Counter(
+        "autoposter_external_call_errors_total", "Failed external API calls", ["service", "operation"]
+    )
+    GEMINI_LATENCY = Histogram(
+        "autoposter_gemini_request_seconds", "Latency of Gemini generate_content calls",
+        ["model", "purpose"], buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+    )
+    GEMINI_ERRORS = Counter(
+        "autoposter_gemini_errors_total", "Failed Gemini generate_content calls", ["model", "purpose"]
+    )
+    FFMPEG_SECONDS = Histogram(
+        "autoposter_ffmpeg_seconds", "Wall time of ffmpeg runs",
+        ["operation"], buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 3600)
+    )
+    FFMPEG_BITRATE = Histogram(
+        "autoposter_ffmpeg_output_bitrate_bps", "Average bitrate of ffmpeg output files",
+        ["operation"], buckets=(5e5, 1e6, 2e6, 4e6, 8e6, 16e6, 32e6, 64e6)
+    )
+    JOBS_QUEUED = Gauge("autoposter_jobs_queued", "Jobs waiting for a worker", ["kind"], multiprocess_mode="livesum")
+    JOBS_IN_FLIGHT = Gauge("autoposter_jobs_in_flight", "Jobs currently running", ["kind"], multiprocess_mode="livesum")
+    JOBS_FINISHED = Counter("autoposter_jobs_finished_total", "Finished jobs", ["kind", "status"])
+else:
+    EXTERNAL_LATENCY = EXTERNAL_ERRORS = GEMINI_LATENCY = GEMINI_ERRORS = _NoopMetric()
+    FFMPEG_SECONDS = FFMPEG_BITRATE = JOBS_QUEUED = JOBS_IN_FLIGHT = JOBS_FINISHED = _NoopMetric()
+
+
+@contextmanager
+def track_call(service: str, operation: str):
+    """외부 호출 구간의 지연을 기록하고, 예외가 나면 오류로 집계 (예외는 그대로 전파, 요청 trace에도 span으로 기록)"""
+    started = time.perf_counter()
+    try:
+        with tracing.span(f"{service}.{operation}", kind=tracing.KIND_CLIENT):
+            yield
+    except Exception:
+        EXTERNAL_ERRORS.labels(service, operation).inc()
+        raise
+    finally:
+        EXTERNAL_LATENCY.labels(service, operation).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def track_gemini(model: str, purpose: str):
+    """Gemini generate_content 호출 지연/오류 기록 (model, purpose 라벨)"""
+    started = time.perf_counter()
+    try:
+        with tracing.span(f"gemini.{purpose}", kind=tracing.KIND_CLIENT, model=model):
+            yield
+    except Exception:
+        GEMINI_ERRORS.labels(model, purpose).inc()
+        raise
+    finally:
+        GEMINI_LATENCY.labels(model, purpose).observe(time.perf_counter() - started)
+
+
+def observe_ffmpeg(operation: str, seconds: float, output_path: str = None, duration: float = 0):
+    """ffmpeg 실행 시간과 (출력 파일이 있으면) 평균 비트레이트 기록"""
+    FFMPEG_SECONDS.labels(operation).observe(seconds)
+    if output_path and duration and os.path.exists(output_path):
+        FFMPEG_BITRATE.labels(operation).observe(os.path.getsize(output_path) * 8 / duration)
+
+
+def render():
+    """모든 워커 프로세스의 값을 합산한 노출 텍스트와 Content-Type 반환"""
+    if prometheus_client is None:
+        return b"# prometheus_client is not installed\n", "text/plain; charset=utf-8"
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def scrape_allowed(client_host: str, authorization: str = None) -> bool:
+    """
+    /metrics 접근 허용 여부 (시작 시 DB에서 로드한 값도 반영되도록 호출 시점에 환경 변수를 읽음)
+    METRICS_TOKEN이 있으면 "Authorization: Bearer <토큰>"이 맞아야 하고,
+    METRICS_ALLOWED_IPS(쉼표 구분 IP/CIDR, 기본 127.0.0.1,::1)에 든 주소에서만 허용
+    """
+    token = os.getenv("METRICS_TOKEN")
+    if token and not hmac.compare_digest((authorization or "").encode(), f"Bearer {token}".encode()):
+        return False
+    try:
+        address = ipaddress.ip_address(client_host or "")
+    except ValueError:
+        return False
+    for item in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            if address in ipaddress.ip_network(item, strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def cleanup_dead_processes():
+    """
+    종료된 워커의 실시간 게이지 파일 정리 (워커 시작 시 호출)
+    카운터/히스토그램 파일은 합계가 줄어들지 않도록 남겨 둠
+    """
+    if prometheus_client is None:
+        return
+    pids = set()
+    for name in os.listdir(MULTIPROC_DIR):
+        match = re.match(r'^gauge_livesum_(\d+)\.db$', name)
+        if match:
+            pids.add(int(match.group(1)))
+    for pid in pids:
+        if not _pid_alive(pid):
+            multiprocess.mark_process_dead(pid, MULTIPROC_DIR)
+
+
+def mark_process_dead():
+    """현재 프로세스 종료 시 호출 (실시간 게이지에서 제외)"""
+    if prometheus_client is not None:
+        multiprocess.mark_process_dead(os.getpid(), MULTIPROC_DIR)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, LargeBinary, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, LargeBinary, Text, Float
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -28,3 +28,60 @@ class SecureFile(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+class Job(Base):
+    """
+    백그라운드 작업(영상 편집/업로드 등) 상태 저장용 테이블
+    여러 uvicorn 워커 중 어느 프로세스에서든 진행 상태를 조회할 수 있도록 DB에 기록
+    """
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, index=True)  # uuid4 hex
+    kind = Column(String)  # 'youtube_upload' 등
+    status = Column(String, default="queued")  # 'queued', 'running', 'success', 'error'
+    stage = Column(String, nullable=True)  # 현재 단계 (예: 'metadata', 'encode', 'upload')
+    progress = Column(Float, default=0.0)  # 현재 단계 진행률 (0.0 ~ 1.0)
+    detail = Column(Text, nullable=True)  # 단계별 부가 정보 (JSON)
+    result = Column(Text, nullable=True)  # 최종 결과 (JSON)
+    error = Column(Text, nullable=True)
+    owner = Column(String, nullable=True)  # 작업을 실행 중인 워커 프로세스 PID
+    user_id = Column(Integer)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class UploadSession(Base):
+    """
+    재개 가능한(resumable) 청크 업로드 세션
+    클라이언트는 바이트 범위 단위로 PUT 하며, 끊겨도 받은 범위부터 이어서 전송
+    """
+    __tablename__ = "upload_sessions"
+
+    id = Column(String, primary_key=True, index=True)  # uuid4 hex
+    user_id = Column(Integer, index=True)
+    filename = Column(String)
+    total_size = Column(Integer)  # 전체 파일 크기 (bytes)
+    status = Column(String, default="open")  # 'open', 'finalizing', 'complete'
+    sha256 = Column(String, nullable=True)  # 완료 시 계산
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class UploadChunk(Base):
+    """
+    업로드 세션에서 수신 완료된 바이트 범위 [start, end)
+    병렬 PUT이 서로 덮어쓰지 않도록 범위마다 행을 추가(insert-only)
+    """
+    __tablename__ = "upload_chunks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(String, index=True)
+    start = Column(Integer)
+    end = Column(Integer)
+
+class CacheVersion(Base):
+    """
+    프로세스 내 캐시 무효화용 버전 카운터
+    데이터를 바꾼 워커가 version을 올리면 다른 워커는 값이 바뀐 것을 보고 자신의 캐시를 비움
+    """
+    __tablename__ = "cache_versions"
+
+    name = Column(String, primary_key=True)  # 'users' 등
+    version = Column(Integer, default=0)
@@ -0,0 +1,74 @@
+"""
+외부 의존성 준비 상태(readiness) 관리
+워커는 서비스 객체를 가볍게 생성한 뒤 바로 요청을 받고, 느린 초기화(Firebase 인증, LinkedIn 프로필 조회,
+YouTube OAuth 등)는 시작 후 의존성별 백그라운드 스레드에서 수행하여 하나가 느려도 다른 의존성을 막지 않음
+"""
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+class Dependency:
+    """이름이 붙은 외부 의존성과 워밍 함수, 현재 상태"""
+
+    def __init__(self, name, warm_fn):
+        self.name = name
+        self.warm_fn = warm_fn
+        self.state = PENDING
+        self.error = None
+        self.elapsed = None
+        self._lock = threading.Lock()
+
+    def warm(self):
+        with self._lock:
+            if self.state in (WARMING, READY):
+                return
+            self.state = WARMING
+            self.error = None
+        started = time.monotonic()
+        try:
+            self.warm_fn()
+            self.state = READY
+            logger.info(f"Dependency ready: {self.name} ({time.monotonic() - started:.2f}s)")
+        except BaseException as e:
+            # sys.exit() 등을 호출하는 레거시 초기화 코드가 워커를 종료시키지 않도록 모두 포착
+            self.state = FAILED
+            self.error = str(e) or e.__class__.__name__
+            logger.warning(f"Dependency failed: {self.name}: {self.error}")
+        finally:
+            self.elapsed = round(time.monotonic() - started, 3)
+
+    def status(self):
+        return {"state": self.state, "error": self.error, "elapsed": self.elapsed}
+
+
+class ServiceRegistry:
+    def __init__(self):
+        self._deps = {}
+
+    def register(self, name, warm_fn):
+        self._deps[name] = Dependency(name, warm_fn)
+
+    def warm_in_background(self, names=None):
+        """의존성마다 별도 데몬 스레드에서 워밍 시작 (즉시 반환)"""
+        for name, dep in self._deps.items():
+            if names and name not in names:
+                continue
+            threading.Thread(target=dep.warm, name=f"warm-{name}", daemon=True).start()
+
+    def is_ready(self, name):
+        dep = self._deps.get(name)
+        return bool(dep and dep.state == READY)
+
+    def status(self):
+        return {name: dep.status() for name, dep in self._deps.items()}
+
+
+registry = ServiceRegistry()
@@ -0,0 +1,624 @@
+"""
+외부 서비스 대역(stand-in): Gemini, Firebase(GCS/Firestore), LinkedIn, YouTube
+실제 계정 없이 오프라인 리눅스 환경에서 위키 변환/LinkedIn 공유/유튜브 파이프라인을 끝까지 실행하고 부하 시험하기 위함
+
+AUTOPOSTER_BACKEND로 선택
+    - live (기본): 실제 서비스 호출
+    - record: 실제 서비스를 호출하고 응답을 카세트(STANDIN_CASSETTE_DIR/<서비스>.jsonl)에 기록
+    - replay: 카세트의 응답을 기록된 지연 시간만큼 기다렸다 반환 (기록이 없는 호출은 fake 응답, STANDIN_REPLAY_STRICT=1이면 오류)
+    - fake: 기록 없이 결정적인 가짜 응답 (외부 접속, API 키 불필요)
+
+replay/fake 공통 설정
+    - STANDIN_LATENCY_MS: 호출당 지연(ms), "800" 또는 서비스별 "gemini=1500,firebase=40,*=100"
+      (replay에서는 지정한 서비스만 기록된 지연 대신 사용)
+    - STANDIN_LATENCY_SCALE (1.0): replay에서 기록된 지연에 곱하는 배율
+    - STANDIN_FAILURE_RATE: 호출 실패 확률, "0.05" 또는 서비스별 "gemini=0.1,linkedin=0.2"
+      (Gemini는 503 APIError로 실패하여 게이트웨이 재시도가 동작)
+    - STANDIN_SEED: 실패 주입 난수 시드
+
+서비스 생성 지점에서 backend(서비스 이름, 실제 생성 함수, 가짜 생성 함수)로 감싸서 사용
+live가 아니면 서비스별 인스턴스 하나를 프로세스 안에서 공유함
+"""
+import os
+import io
+import json
+import time
+import base64
+import random
+import hashlib
+import logging
+import threading
+from html import escape
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+MODES = ("live", "record", "replay", "fake")
+BACKEND = os.getenv("AUTOPOSTER_BACKEND", "live").lower()
+if BACKEND not in MODES:
+    raise ValueError(f"AUTOPOSTER_BACKEND must be one of {', '.join(MODES)}: {BACKEND}")
+# 외부 접속과 자격 증명 없이 동작하는 모드
+OFFLINE = BACKEND in ("replay", "fake")
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASSETTE_DIR = os.getenv("STANDIN_CASSETTE_DIR", os.path.join(BASE_DIR, 'scratch', 'cassettes'))
+REPLAY_STRICT = os.getenv("STANDIN_REPLAY_STRICT", "0") == "1"
+LATENCY_SCALE = float(os.getenv("STANDIN_LATENCY_SCALE", "1"))
+
+# 기록하지 않는 호출 (응답이 구독/상태 확인 객체라 재현할 수 없음)
+UNRECORDED = {"watch_id_map", "warm_up"}
+
+
+def _per_service(value: str) -> dict:
+    """"0.1" -> {"*": 0.1}, "gemini=0.1,*=0.01" -> {"gemini": 0.1, "*": 0.01}"""
+    result = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, _, number = item.rpartition("=")
+        result[name.strip() or "*"] = float(number)
+    return result
+
+
+LATENCY_MS = _per_service(os.getenv("STANDIN_LATENCY_MS", ""))
+FAILURE_RATE = _per_service(os.getenv("STANDIN_FAILURE_RATE", ""))
+_rng = random.Random(os.getenv("STANDIN_SEED", "0"))
+
+
+class StandinFailure(ConnectionError):
+    """주입된 실패 또는 기록 당시 실패했던 호출"""
+
+
+class StandinMiss(LookupError):
+    """STANDIN_REPLAY_STRICT=1인데 카세트에 기록이 없는 호출"""
+
+
+# --- 카세트 ---
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _normalize(value):
+    """호출 인자를 기록/재생 간에 같은 값이 되도록 정규화 (파일 경로와 바이트는 내용 해시로)"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"sha256": _digest(bytes(value))}
+    if isinstance(value, str):
+        if len(value) < 4096 and os.path.isfile(value):
+            with open(value, "rb") as f:
+                return {"file": _digest(f.read())}
+        return value
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if type(value).__name__ == "File":
+        # Gemini Files API 파일: 업로드마다 이름/URI가 달라지므로 형식과 크기만
+        return {"gemini_file": getattr(value, "mime_type", None), "size": getattr(value, "size_bytes", None)}
+    if type(value).__name__ == "MediaFileUpload":
+        return {"media": _normalize(getattr(value, "_filename", None))}
+    if hasattr(value, "model_dump"):
+        return _normalize(value.model_dump(exclude_none=True))
+    return type(value).__name__
+
+
+def _fingerprint(op, args, kwargs, ignore=()) -> str:
+    payload = [op, _normalize(list(args)), _normalize({k: v for k, v in kwargs.items() if k not in ignore})]
+    return _digest(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))[:32]
+
+
+def _encode(value):
+    """응답을 JSON으로 (bytes는 base64)"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if hasattr(value, "model_dump"):
+        return _encode(value.model_dump(exclude_none=True))
+    return str(value)
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if set(value) == {"__bytes__"}:
+            return base64.b64decode(value["__bytes__"])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
+
+
+class Cassette:
+    """서비스별 기록 파일 (같은 호출이 여러 번 기록되어 있으면 기록 순서대로 돌려가며 재생)"""
+
+    def __init__(self, service: str, directory: str = None):
+        self.path = os.path.join(directory or CASSETTE_DIR, f"{service}.jsonl")
+        self._entries = None
+        self._cursor = {}
+        self._lock = threading.Lock()
+
+    def append(self, entry: dict):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def next(self, key: str):
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._load()
+            entries = self._entries.get(key)
+            if not entries:
+                return None
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            return entries[index % len(entries)]
+
+    def _load(self):
+        entries = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        entries.setdefault(entry["key"], []).append(entry)
+        except FileNotFoundError:
+            logger.warning(f"No cassette for replay: {self.path}")
+        return entries
+
+
+_cassettes = {}
+_cassettes_lock = threading.Lock()
+
+
+def cassette(service: str) -> Cassette:
+    with _cassettes_lock:
+        if service not in _cassettes:
+            _cassettes[service] = Cassette(service)
+        return _cassettes[service]
+
+
+# --- 기록 / 재생 ---
+
+def _failure(service, op):
+    if service == "gemini":
+        from google.genai import errors
+        return errors.APIError(503, {"error": {"code": 503, "message": f"injected failure ({op})", "status": "UNAVAILABLE"}})
+    return StandinFailure(f"injected {service}.{op} failure")
+
+
+def _delay(service, recorded_ms=None):
+    if service in LATENCY_MS:
+        ms = LATENCY_MS[service]
+    elif recorded_ms is not None:
+        ms = recorded_ms * LATENCY_SCALE
+    else:
+        ms = LATENCY_MS.get("*", 0.0)
+    if ms > 0:
+        time.sleep(ms / 1000.0)
+
+
+def record_call(service, op, call, args=(), kwargs=None, encode=_encode, ignore=()):
+    """실제 호출을 실행하고 응답(또는 오류)과 소요 시간을 카세트에 기록"""
+    kwargs = kwargs or {}
+    key = _fingerprint(op, args, kwargs, ignore)
+    started = time.monotonic()
+    try:
+        result = call(*args, **kwargs)
+    except Exception as e:
+        cassette(service).append({"key": key, "op": op, "latency_ms": (time.monotonic() - started) * 1000,
+                                  "error": f"{type(e).__name__}: {e}"})
+        raise
+    cassette(service).append({"key": key, "op": op, "latency_ms": (time.monotonic() - started) * 1000,
+                              "result": encode(result)})
+    return result
+
+
+def replay_call(service, op, fallback, args=(), kwargs=None, decode=_decode, ignore=()):
+    """카세트의 응답을 재생 (fake 모드이거나 기록이 없으면 fallback 호출), 지연/실패 주입 적용"""
+    kwargs = kwargs or {}
+    entry = None
+    if BACKEND == "replay":
+        entry = cassette(service).next(_fingerprint(op, args, kwargs, ignore))
+        if entry is None:
+            if REPLAY_STRICT:
+                raise StandinMiss(f"No recording for {service}.{op}")
+            logger.debug(f"No recording for {service}.{op}, using fake response")
+    _delay(service, entry.get("latency_ms") if entry else None)
+    if _rng.random() < FAILURE_RATE.get(service, FAILURE_RATE.get("*", 0.0)):
+        raise _failure(service, op)
+    if entry is None:
+        return fallback(*args, **kwargs)
+    if "error" in entry:
+        raise StandinFailure(entry["error"])
+    return decode(entry["result"])
+
+
+class Recorder:
+    """실제 객체의 공개 메서드 호출을 기록하는 프록시 (속성 읽기/쓰기는 그대로 전달)"""
+
+    def __init__(self, service, target, encode=_encode, ignore=()):
+        object.__setattr__(self, "_service", service)
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_encode", encode)
+        object.__setattr__(self, "_ignore", ignore)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr) or name.startswith("_") or name in UNRECORDED:
+            return attr
+
+        def recorded(*args, **kwargs):
+            return record_call(self._service, name, attr, args, kwargs, self._encode, self._ignore)
+        return recorded
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+
+class Replayer(Recorder):
+    """가짜 객체를 바탕으로 공개 메서드 호출을 카세트 응답으로 대체하는 프록시"""
+
+    def __init__(self, service, fake, decode=_decode, ignore=()):
+        super().__init__(service, fake, ignore=ignore)
+        object.__setattr__(self, "_decode", decode)
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if not callable(attr) or name.startswith("_") or name in UNRECORDED:
+            return attr
+
+        def replayed(*args, **kwargs):
+            return replay_call(self._service, name, attr, args, kwargs, self._decode, self._ignore)
+        return replayed
+
+
+# --- 가짜 서비스 ---
+
+def _slug(text: str, prefix: str) -> str:
+    return f"{prefix}-{_digest(text.encode('utf-8'))[:8]}"
+
+
+def _after(prompt: str, marker: str) -> str:
+    """프롬프트에서 marker 뒤의 본문 (들여쓰기 제거)"""
+    body = prompt.split(marker, 1)[1] if marker in prompt else prompt
+    return "\n".join(line.strip() for line in body.strip().splitlines())
+
+
+def _paragraphs_html(md: str) -> str:
+    blocks = [b.strip() for b in md.split("\n\n") if b.strip()]
+    return "\n".join(f'<p class="my-4">{escape(b)}</p>' for b in blocks)
+
+
+def _fake_png(seed: str, size=(1280, 720)) -> bytes:
+    from PIL import Image, ImageDraw
+    h = hashlib.sha256(seed.encode("utf-8")).digest()
+    img = Image.new("RGB", size, (h[0], h[1], h[2]))
+    draw = ImageDraw.Draw(img)
+    for i in range(8):
+        x, y = h[3 + i] * size[0] // 256, h[11 + i] * size[1] // 256
+        draw.ellipse((x - 60, y - 60, x + 60, y + 60), fill=(h[19 + i], h[i], 255 - h[i]))
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def _fake_srt(count=18, seconds=3) -> str:
+    def ts(s):
+        return f"{s // 3600:02d}:{s % 3600 // 60:02d}:{s % 60:02d},000"
+    return "\n".join(
+        f"{i + 1}\n{ts(i * seconds)} --> {ts((i + 1) * seconds)}\nKey point {i + 1}\n" for i in range(count)
+    )
+
+
+def _fake_text(prompt: str) -> str:
+    """프롬프트 종류별 그럴듯한 응답 (converter/summarizer/youtube_poster 프롬프트 기준)"""
+    if "English filename" in prompt:
+        return _slug(prompt, "doc")
+    if "English title" in prompt:
+        return "Document " + _digest(prompt.encode("utf-8"))[:6].upper()
+    if "[Structure Requirement]" in prompt:
+        structure = prompt.split("[Structure Requirement]", 1)[1].split("[Placeholder]", 1)[0]
+        structure = "\n".join(line.strip() for line in structure.strip().splitlines())
+        content = _after(prompt, "Content:")
+        title = escape(content.splitlines()[0].lstrip("# ").strip()) if content else "Document"
+        structure = structure.replace("{{TITLE}}", title)
+        body = _paragraphs_html(content)
+        return ('<!DOCTYPE html><html><head><meta name="viewport" content="width=device-width, initial-scale=1.0">'
+                f'</head><body>{structure.replace("{{CONTENT}}", body)}</body></html>')
+    if "Markdown SECTION" in prompt:
+        return _paragraphs_html(_after(prompt, "Section:"))
+    if "Translate the following Markdown" in prompt:
+        return _after(prompt, "Markdown:")
+    if "SRT" in prompt:
+        return _fake_srt()
+    if "JSON object" in prompt:
+        return json.dumps({
+            "title": "Offline Demo Video " + _digest(prompt.encode("utf-8"))[:6],
+            "description": "Generated offline for benchmarking.",
+            "tags": [f"tag{i}" for i in range(20)],
+        })
+    # LinkedIn 요약 등
+    title = next((line.split(":", 1)[1].strip() for line in prompt.splitlines() if line.strip().startswith("Title:")), "")
+    return (f"{title}\n\nOffline summary for benchmarking.\n\n"
+            + "\n".join(f"• Point {i}" for i in range(1, 5)) + "\n\n#AI #Tech #Offline #Benchmark #Demo")
+
+
+class FakeGeminiModels:
+    def generate_content(self, model, contents, config=None):
+        from google.genai import types
+        prompt = "\n".join(c for c in (contents if isinstance(contents, list) else [contents]) if isinstance(c, str))
+        if "image" in model:
+            part = types.Part.from_bytes(data=_fake_png(prompt), mime_type="image/png")
+        else:
+            part = types.Part(text=_fake_text(prompt))
+        return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(role="model", parts=[part]))])
+
+
+class FakeGeminiFiles:
+    def upload(self, file, config=None):
+        from google.genai import types
+        mime_type = (config or {}).get("mime_type") if isinstance(config, dict) else None
+        size = os.path.getsize(file) if isinstance(file, str) and os.path.exists(file) else None
+        return types.File(name=f"files/{_slug(str(file), 'fake')}", mime_type=mime_type, size_bytes=size,
+                          state=types.FileState.ACTIVE)
+
+    def get(self, name):
+        from google.genai import types
+        return types.File(name=name, state=types.FileState.ACTIVE)
+
+    def delete(self, name):
+        return None
+
+
+class FakeGemini:
+    """genai.Client 대역 (models.generate_content, files.upload/get/delete)"""
+
+    def __init__(self, *args, **kwargs):
+        self.models = FakeGeminiModels()
+        self.files = FakeGeminiFiles()
+
+
+def gemini_payload(response) -> dict:
+    """Gemini 응답에서 기록할 부분 (텍스트와 이미지)"""
+    texts, images = [], []
+    for cand in response.candidates or []:
+        for part in (cand.content.parts if cand.content else None) or []:
+            if part.text:
+                texts.append(part.text)
+            if part.inline_data:
+                images.append({"data": _encode(part.inline_data.data), "mime_type": part.inline_data.mime_type})
+    return {"texts": texts, "images": images}
+
+
+def gemini_response(payload: dict):
+    from google.genai import types
+    parts = [types.Part(text=t) for t in payload.get("texts", [])]
+    parts += [types.Part.from_bytes(data=_decode(i["data"]), mime_type=i["mime_type"]) for i in payload.get("images", [])]
+    return types.GenerateContentResponse(candidates=[types.Candidate(content=types.Content(role="model", parts=parts))])
+
+
+class FakeFirebase:
+    """FirebaseService 대역 (메모리 안의 ID 매핑/위키 문서/업로드 파일)"""
+
+    def __init__(self, *args, **kwargs):
+        self.image_bucket_name = "standin-bucket"
+        self.id_map = {}  # wiki-id-map 집계 문서
+        self.claims = {}  # 제목별 등록 문서 (제목 -> ID)
+        self.wiki = {}
+        self.blobs = {}
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        return None
+
+    def get_id_map(self):
+        with self._lock:
+            return {**self.id_map, **self.claims}
+
+    def save_id_map(self, id_map):
+        with self._lock:
+            self.id_map.update(id_map)
+        return True
+
+    def claim_ids(self, mapping):
+        with self._lock:
+            used = {**self.id_map, **self.claims}
+            owners = {wiki_id: title for title, wiki_id in used.items()}
+            resolved = {}
+            for title, wiki_id in mapping.items():
+                if title in self.claims:
+                    resolved[title] = self.claims[title]
+                elif owners.get(wiki_id, title) != title:
+                    resolved[title] = None
+                else:
+                    resolved[title] = self.claims[title] = wiki_id
+                    owners[wiki_id] = title
+            return resolved
+
+    def watch_id_map(self, callback):
+        return None
+
+    def _url(self, destination_path):
+        return f"https://storage.googleapis.com/{self.image_bucket_name}/{destination_path}"
+
+    def upload_image(self, local_path, destination_path):
+        if not os.path.exists(local_path):
+            return None
+        with open(local_path, "rb") as f:
+            data = f.read()
+        with self._lock:
+            self.blobs[destination_path] = len(data)
+        return self._url(destination_path)
+
+    def upload_bytes(self, data, destination_path, content_type, cache_control=None):
+        with self._lock:
+            self.blobs[destination_path] = len(data)
+        return self._url(destination_path)
+
+    def save_wiki_content(self, wiki_id, title_ko, title_en, last_updated, html_ko, html_en, thumbnail_url,
+                          social_image_url=None):
+        doc = {
+            'id': wiki_id,
+            'titles': {'ko': title_ko, 'en': title_en},
+            'content': {'ko': html_ko, 'en': html_en},
+            'thumbnailUrl': thumbnail_url,
+            'lastUpdated': last_updated,
+            'type': 'firestore-content',
+        }
+        if social_image_url:
+            doc['socialImageUrl'] = social_image_url
+        with self._lock:
+            self.wiki.setdefault(wiki_id, {}).update(doc)
+        return True
+
+    def get_wiki_content(self, wiki_id):
+        with self._lock:
+            doc = self.wiki.get(wiki_id)
+            return dict(doc) if doc else None
+
+
+class FakeLinkedIn:
+    """LinkedInPoster 대역"""
+
+    def __init__(self, *args, **kwargs):
+        self.access_token = "standin-token"
+        self.person_urn = os.getenv("LINKEDIN_PERSON_URN") or "urn:li:person:standin"
+        self._posts = 0
+        self._lock = threading.Lock()
+
+    def get_me(self):
+        return {"id": "standin"}
+
+    def upload_image(self, image_data):
+        return f"urn:li:digitalmediaAsset:{_slug(str(image_data), 'standin')}"
+
+    def post_text(self, text, title=None, original_url=None, uploaded_image_urn=None):
+        with self._lock:
+            self._posts += 1
+            return {"id": f"urn:li:share:{self._posts}"}
+
+
+class FakeYouTube:
+    """YouTube Data API 응답 대역 (videos.list / videos.insert, 그 외는 빈 응답)"""
+
+    def respond(self, op, **kwargs):
+        if op == "videos.list":
+            return {"items": [{
+                "id": video_id,
+                "snippet": {
+                    "title": f"Offline video {video_id}",
+                    "description": "Generated offline for benchmarking.",
+                    "thumbnails": {"high": {"url": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"}},
+                },
+            } for video_id in str(kwargs.get("id", "")).split(",") if video_id]}
+        if op == "videos.insert":
+            return {"id": _slug(json.dumps(_normalize(kwargs), sort_keys=True, default=str), "standin"),
+                    "snippet": (kwargs.get("body") or {}).get("snippet", {})}
+        return {}
+
+
+class _YouTubeRequest:
+    def __init__(self, client, op, kwargs):
+        self._client = client
+        self._op = op
+        self._kwargs = kwargs
+        self._live = None
+
+    def _live_request(self):
+        if self._live is None:
+            resource, method = self._op.split(".")
+            self._live = getattr(getattr(self._client.live, resource)(), method)(**self._kwargs)
+        return self._live
+
+    def execute(self, *args, **kwargs):
+        if BACKEND == "record":
+            return record_call("youtube", self._op, lambda **_: self._live_request().execute(*args, **kwargs),
+                               kwargs=self._kwargs)
+        return replay_call("youtube", self._op, lambda **kw: self._client.fake.respond(self._op, **kw),
+                           kwargs=self._kwargs)
+
+    def next_chunk(self, *args, **kwargs):
+        """재개 업로드: 기록 시에는 청크를 실제로 보내고 최종 응답만 기록, 재생 시에는 한 번에 완료"""
+        if BACKEND == "record":
+            started = time.monotonic()
+            status, response = self._live_request().next_chunk(*args, **kwargs)
+            if response is not None:
+                cassette("youtube").append({
+                    "key": _fingerprint(self._op, (), self._kwargs), "op": self._op,
+                    "latency_ms": (time.monotonic() - started) * 1000, "result": _encode(response),
+                })
+            return status, response
+        return None, self.execute()
+
+
+class _YouTubeResource:
+    def __init__(self, client, resource):
+        self._client = client
+        self._resource = resource
+
+    def __getattr__(self, method):
+        return lambda **kwargs: _YouTubeRequest(self._client, f"{self._resource}.{method}", kwargs)
+
+
+class YouTubeStandin:
+    """googleapiclient build('youtube', 'v3') 클라이언트 대역 (youtube.videos().list(...).execute() 형태 그대로)"""
+
+    def __init__(self, live=None):
+        self.live = live
+        self.fake = FakeYouTube()
+
+    def __getattr__(self, resource):
+        if resource.startswith("_"):
+            raise AttributeError(resource)
+        return lambda: _YouTubeResource(self, resource)
+
+
+class _GeminiStandin:
+    def __init__(self, models, files):
+        self.models = models
+        self.files = files
+
+
+# --- 진입점 ---
+
+def _wrap(service, live_factory, fake_factory):
+    if service == "gemini":
+        if BACKEND == "record":
+            live = live_factory()
+            return _GeminiStandin(Recorder("gemini", live.models, encode=gemini_payload, ignore=("config",)), live.files)
+        fake = fake_factory()
+        return _GeminiStandin(Replayer("gemini", fake.models, decode=gemini_response, ignore=("config",)), fake.files)
+    if service == "youtube":
+        return YouTubeStandin(live_factory() if BACKEND == "record" else None)
+    if BACKEND == "record":
+        return Recorder(service, live_factory())
+    return Replayer(service, fake_factory())
+
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def backend(service: str, live_factory, fake_factory=None, shared: bool = True):
+    """
+    서비스 생성 지점: live면 live_factory() 그대로, 아니면 기록/재생/가짜 대역 반환
+    (서비스: gemini, firebase, linkedin, youtube / shared=False면 호출마다 새 대역)
+    """
+    if BACKEND == "live":
+        return live_factory()
+    if not shared:
+        return _wrap(service, live_factory, fake_factory)
+    with _instances_lock:
+        if service not in _instances:
+            _instances[service] = _wrap(service, live_factory, fake_factory)
+            logger.info(f"Using {BACKEND} stand-in for {service}")
+        return _instances[service]
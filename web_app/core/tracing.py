@@ -0,0 +1,183 @@
+"""
+요청 단위 경량 트레이싱
+요청마다 request ID와 trace를 만들고, 서비스 메서드/외부 호출을 span으로 기록하여
+    - 응답의 Server-Timing 헤더로 구간별 소요 시간을 반환 (브라우저 개발자 도구에서 확인 가능)
+    - TRACE_EXPORT_DIR가 설정되어 있으면 OTLP/JSON 형식(resourceSpans)으로 traces-{pid}.jsonl에 한 줄씩 기록
+      (OTLP 수집기 대역이 그대로 읽을 수 있는 형식)
+
+trace/span은 contextvars로 전달되므로 executors.run_in으로 넘긴 작업의 span도 같은 요청에 묶임
+활성 trace가 없는 곳(시작 시 워밍, 백그라운드 작업 등)에서는 span이 아무것도 기록하지 않음
+"""
+import os
+import re
+import json
+import time
+import uuid
+import inspect
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TRACE_EXPORT_DIR = os.getenv("TRACE_EXPORT_DIR")
+SERVICE_NAME = os.getenv("TRACE_SERVICE_NAME", "autoposter-web")
+
+# OTLP SpanKind
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+_current_trace = contextvars.ContextVar("trace", default=None)
+_current_span = contextvars.ContextVar("trace_span", default=None)
+_export_lock = threading.Lock()
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name, parent_id=None, kind=KIND_INTERNAL, attributes=None):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otlp(self, trace_id):
+        data = {
+            "traceId": trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [{"key": k, "value": {"stringValue": str(v)}} for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        return data
+
+
+class Trace:
+    """한 요청에서 기록된 span 모음"""
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.trace_id = uuid.uuid4().hex
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Span):
+        with self._lock:
+            self.spans.append(span)
+
+    def server_timing(self, exclude=None) -> str:
+        """span 이름별 소요 시간 합계를 Server-Timing 헤더 값으로 변환 (여러 번 호출된 구간은 횟수 표시)"""
+        totals = {}
+        with self._lock:
+            spans = list(self.spans)
+        for span in spans:
+            if span is exclude:
+                continue
+            total, count = totals.get(span.name, (0.0, 0))
+            totals[span.name] = (total + span.duration_ms, count + 1)
+        entries = []
+        for name, (total, count) in totals.items():
+            entry = f"{_metric_name(name)};dur={total:.1f}"
+            if count > 1:
+                entry += f';desc="x{count}"'
+            entries.append(entry)
+        return ", ".join(entries)
+
+    def to_otlp(self) -> dict:
+        with self._lock:
+            spans = [span.to_otlp(self.trace_id) for span in self.spans]
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": SERVICE_NAME}},
+                    {"key": "process.pid", "value": {"stringValue": str(os.getpid())}},
+                ]},
+                "scopeSpans": [{"scope": {"name": "autoposter.tracing"}, "spans": spans}],
+            }]
+        }
+
+
+def _metric_name(name: str) -> str:
+    # Server-Timing 메트릭 이름은 token 문자만 허용
+    return re.sub(r"[^A-Za-z0-9_.\-]", "_", name)
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def start_trace(request_id: str = None):
+    """새 trace를 현재 컨텍스트에 설정하고 (trace, reset 토큰) 반환"""
+    trace = Trace(request_id or uuid.uuid4().hex)
+    return trace, _current_trace.set(trace)
+
+
+def end_trace(token):
+    _current_trace.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """현재 trace에 span 기록 (활성 trace가 없으면 아무것도 하지 않음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    current = Span(name, parent_id=_current_span.get(), kind=kind, attributes=attributes)
+    token = _current_span.set(current.span_id)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = str(e) or e.__class__.__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.add(current)
+
+
+def traced(name: str = None):
+    """함수/메서드 전체를 span으로 감싸는 데코레이터 (sync/async 모두 지원, 기본 이름은 클래스.메서드)"""
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def export(trace: Trace):
+    """TRACE_EXPORT_DIR가 설정된 경우 OTLP/JSON 한 줄로 기록 (블로킹 I/O이므로 DISK 풀에서 호출)"""
+    if not TRACE_EXPORT_DIR or not trace.spans:
+        return
+    os.makedirs(TRACE_EXPORT_DIR, exist_ok=True)
+    line = json.dumps(trace.to_otlp(), ensure_ascii=False)
+    with _export_lock:
+        with open(os.path.join(TRACE_EXPORT_DIR, f"traces-{os.getpid()}.jsonl"), "a", encoding="utf-8") as f:
+            f.write(line + "\n")
@@ -0,0 +1,101 @@
+"""
+멀티파트 업로드 스트리밍 저장
+UploadFile 전체를 메모리로 읽지 않고 청크 단위로 디스크에 복사하면서
+크기 제한 검사와 sha256 계산을 함께 수행하여, 파일 크기와 무관하게 메모리 사용량을 일정하게 유지
+
+크기 제한은 환경 변수로 조정:
+    UPLOAD_MAX_VIDEO_MB  영상 업로드 최대 크기 (기본 4096MB)
+    UPLOAD_MAX_FILE_MB   PDF/마크다운/로고/보안 파일 최대 크기 (기본 50MB)
+"""
+import os
+import hashlib
+import tempfile
+from dotenv import load_dotenv
+from . import executors
+
+load_dotenv()
+
+CHUNK_SIZE = 1024 * 1024  # 1MB
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR", os.path.join(BASE_DIR, 'scratch', 'uploads'))
+
+MAX_VIDEO_BYTES = int(os.getenv("UPLOAD_MAX_VIDEO_MB", "4096")) * 1024 * 1024
+MAX_FILE_BYTES = int(os.getenv("UPLOAD_MAX_FILE_MB", "50")) * 1024 * 1024
+
+
+class UploadTooLarge(Exception):
+    """업로드 크기가 제한을 넘은 경우"""
+
+    def __init__(self, filename, max_bytes):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        super().__init__(f"{filename}: 최대 업로드 크기({max_bytes // (1024 * 1024)}MB)를 초과했습니다.")
+
+
+class StoredUpload:
+    """디스크에 저장된 업로드 파일 정보"""
+
+    def __init__(self, path, filename, size, sha256):
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self.sha256 = sha256
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def remove(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def safe_filename(filename: str, default: str = "upload") -> str:
+    """클라이언트가 보낸 파일명에서 경로 성분 제거"""
+    name = os.path.basename((filename or "").replace("\\", "/")).strip()
+    return name if name not in ("", ".", "..") else default
+
+
+def copy_stream(src, dest_path: str, max_bytes: int, filename: str = None) -> StoredUpload:
+    """
+    파일 객체를 청크 단위로 dest_path에 복사 (크기 제한 + sha256 증분 계산)
+
+    Raises:
+        UploadTooLarge: max_bytes를 넘은 경우 (부분 파일은 삭제됨)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                chunk = src.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(filename or os.path.basename(dest_path), max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+    except Exception:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    return StoredUpload(dest_path, filename or os.path.basename(dest_path), size, digest.hexdigest())
+
+
+async def save_upload(upload, dest_path: str, max_bytes: int = MAX_FILE_BYTES) -> StoredUpload:
+    """UploadFile을 dest_path에 스트리밍 저장 (디스크 I/O는 DISK 풀에서 실행)"""
+    await upload.seek(0)
+    return await executors.run_in(
+        executors.DISK, copy_stream, upload.file, dest_path, max_bytes, safe_filename(upload.filename)
+    )
+
+
+async def save_upload_temp(upload, max_bytes: int = MAX_FILE_BYTES) -> StoredUpload:
+    """UploadFile을 임시 파일로 스트리밍 저장 (사용 후 StoredUpload.remove() 호출 필요)"""
+    os.makedirs(UPLOAD_TEMP_DIR, exist_ok=True)
+    suffix = os.path.splitext(safe_filename(upload.filename))[1]
+    fd, path = tempfile.mkstemp(dir=UPLOAD_TEMP_DIR, suffix=suffix)
+    os.close(fd)
+    return await save_upload(upload, path, max_bytes)
@@ -0,0 +1,102 @@
+"""
+인증 사용자 캐시
+get_current_user가 모든 API 호출(로고 <img> 요청 포함)마다 users 테이블을 조회하지 않도록
+토큰 subject(email) -> 사용자 스냅샷을 프로세스 내에 TTL 동안 보관
+
+여러 uvicorn 워커 간 일관성은 cache_versions 테이블의 'users' 카운터로 맞춤:
+사용자 행을 바꾸는 쪽이 bump()로 버전을 올리고, 각 워커는 최대 USER_CACHE_VERSION_INTERVAL초마다
+버전을 읽어 달라졌으면 캐시를 비움
+
+    USER_CACHE_TTL_SECONDS        스냅샷 보관 시간 (기본 60, 0이면 캐시 사용 안 함)
+    USER_CACHE_VERSION_INTERVAL   버전 카운터 확인 간격 (기본 1초)
+"""
+import os
+import time
+import threading
+from dotenv import load_dotenv
+from . import models
+
+load_dotenv()
+
+USERS = "users"
+
+
+class UserSnapshot:
+    """요청 처리에 필요한 사용자 필드만 담은 읽기 전용 사본 (세션에 묶이지 않음)"""
+
+    __slots__ = ("id", "name", "email", "is_active", "is_super_admin", "created_at")
+
+    def __init__(self, user):
+        for field in self.__slots__:
+            object.__setattr__(self, field, getattr(user, field))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("UserSnapshot is read-only")
+
+
+class UserCache:
+    def __init__(self, ttl: float = None, version_interval: float = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+        self.version_interval = version_interval if version_interval is not None else float(
+            os.getenv("USER_CACHE_VERSION_INTERVAL", "1")
+        )
+        self._entries = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self, db, email: str):
+        """
+        email에 해당하는 사용자 스냅샷 반환 (없으면 None)
+        캐시에 없거나 만료되었으면 db에서 읽어 채움
+        """
+        if self.ttl <= 0:
+            user = db.query(models.User).filter(models.User.email == email).first()
+            return UserSnapshot(user) if user else None
+
+        self._check_version(db)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry and entry[1] > now:
+                return entry[0]
+
+        user = db.query(models.User).filter(models.User.email == email).first()
+        if user is None:
+            return None
+        snapshot = UserSnapshot(user)
+        with self._lock:
+            self._entries[email] = (snapshot, now + self.ttl)
+        return snapshot
+
+    def bump(self, db):
+        """
+        사용자 행을 바꾼 트랜잭션 안에서 호출 (커밋은 호출자가 수행)
+        버전을 올려 다른 워커의 캐시를 무효화하고, 현재 프로세스 캐시는 즉시 비움
+        """
+        updated = db.query(models.CacheVersion).filter(models.CacheVersion.name == USERS).update(
+            {models.CacheVersion.version: models.CacheVersion.version + 1}, synchronize_session=False
+        )
+        if not updated:
+            db.add(models.CacheVersion(name=USERS, version=1))
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._checked_at = 0.0
+
+    def _check_version(self, db):
+        now = time.monotonic()
+        if now - self._checked_at < self.version_interval:
+            return
+        row = db.query(models.CacheVersion.version).filter(models.CacheVersion.name == USERS).first()
+        version = row[0] if row else 0
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            self._checked_at = now
+
+
+user_cache = UserCache()
@@ -1,11 +1,15 @@
-from fastapi import FastAPI, Request, UploadFile, File, Form, BackgroundTasks, Depends, HTTPException, status
+from fastapi import FastAPI, Request, Response, UploadFile, File, Form, BackgroundTasks, Depends, HTTPException, status
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, JSONResponse, FileResponse, RedirectResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import uvicorn
 import os
+import json
+import time
+import uuid
+import asyncio
 import shutil
+from contextlib import aclosing
 from datetime import timedelta
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
@@ -14,22 +18,63 @@ from services.converter_service import ConverterService
 from services.linkedin_service import LinkedinService
 from services.youtube_service import YouTubeService
 from services.crypto_service import CryptoService
+from services.job_service import JobManager, JobQueueFull, JobWatcher
+from services.resumable_upload_service import ResumableUploadService, UploadSessionError
+from services.bulk_import_service import BulkImportService, BulkImportError, DocumentSource
 from services import auth_service
-from core import database, models
+from core import database, models, executors, uploads, metrics, tracing
+from core.service_registry import registry
+from core.uploads import UploadTooLarge
+from core.user_cache import user_cache
+from core.assets import AssetStore
 
 # DB 초기화
 models.Base.metadata.create_all(bind=database.engine)
 
 app = FastAPI(title="Auto Poster")
 
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    요청마다 request ID와 trace를 만들고, 서비스/외부 호출 span의 구간별 소요 시간을
+    Server-Timing 헤더로 반환 (TRACE_EXPORT_DIR 설정 시 OTLP/JSON으로 기록)
+    """
+    request_id = request.headers.get("x-request-id") or uuid.uuid4().hex
+    trace, token = tracing.start_trace(request_id)
+    try:
+        with tracing.span(f"{request.method} {request.url.path}", kind=tracing.KIND_SERVER) as root:
+            response = await call_next(request)
+            root.attributes["http.status_code"] = response.status_code
+    finally:
+        tracing.end_trace(token)
+    timing = trace.server_timing(exclude=root)
+    response.headers["Server-Timing"] = f"{timing}, total;dur={root.duration_ms:.1f}" if timing else f"total;dur={root.duration_ms:.1f}"
+    response.headers["X-Request-ID"] = request_id
+    if tracing.TRACE_EXPORT_DIR:
+        executors.get_pool(executors.DISK).submit(tracing.export, trace)
+    return response
+
 # 정적 파일 및 템플릿 설정
-app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
+# 정적 파일/페이지는 시작 시 미리 빌드한 압축본과 ETag로 제공 (core/assets.py)
+assets = AssetStore("static")
+templates.env.globals["asset_url"] = assets.url
+PRERENDERED_PAGES = ["index.html", "login.html", "signup.html", "admin_users.html", "admin_secure_files.html"]
 
 # 서비스 인스턴스
-converter = ConverterService()
-linkedin = LinkedinService()
-youtube = YouTubeService()
+# 외부 서비스 객체는 환경 변수 로드 이후(startup)에 가볍게 생성하고,
+# 느린 초기화(인증/네트워크)는 의존성별 백그라운드 스레드에서 워밍
+converter: ConverterService = None
+linkedin: LinkedinService = None
+youtube: YouTubeService = None
+bulk_import: BulkImportService = None
+jobs = JobManager()
+resumable_uploads = ResumableUploadService()
+
+# 작업 진행 상황 SSE: DB 재조회 간격과 keep-alive 주기 (초)
+SSE_POLL_SECONDS = float(os.getenv("SSE_POLL_SECONDS", "0.5"))
+SSE_HEARTBEAT_SECONDS = 15
+job_watcher = JobWatcher(jobs, SSE_POLL_SECONDS)
 
 # OAuth2 설정
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
@@ -44,13 +89,51 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+class UploadSessionCreate(BaseModel):
+    filename: str
+    size: int
+
 # 의존성: DB 세션 및 수퍼 관리자 초기화
 @app.on_event("startup")
 async def startup_event():
     # 1. 환경 변수 로드 (DB 우선, 로컬 폴백)
     CryptoService.load_env_from_db()
     
-    # 2. 수퍼 관리자 초기화
+    # 2. 수퍼 관리자 초기화 (변경이 없으면 검증만 하고 건너뜀, bcrypt는 CPU 풀에서 실행)
+    await executors.run_in(executors.CPU, _init_super_admin)
+
+    # 3. 정적 자산 해시/압축 및 페이지 사전 렌더링
+    await executors.run_in(executors.CPU, _build_assets)
+
+    # 4. 이전 프로세스가 남긴 미완료 작업과 메트릭 게이지 정리
+    jobs.recover_orphans()
+    metrics.cleanup_dead_processes()
+
+    # 5. 서비스 생성 및 외부 의존성 백그라운드 워밍 (완료를 기다리지 않음)
+    global converter, linkedin, youtube, bulk_import
+    converter = ConverterService()
+    bulk_import = BulkImportService(converter)
+    linkedin = LinkedinService()
+    youtube = YouTubeService()
+    registry.register("firebase", converter.firebase.warm_up)
+    registry.register("gemini", converter.warm_up)
+    registry.register("linkedin", linkedin.warm_up)
+    registry.register("youtube", youtube.warm_up)
+    registry.warm_in_background()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    jobs.shutdown()
+    if converter:
+        converter.id_index.close()
+    executors.shutdown()
+    metrics.mark_process_dead()
+
+def _build_assets():
+    assets.build_static()
+    assets.build_pages(templates, PRERENDERED_PAGES)
+
+def _init_super_admin():
     db = database.SessionLocal()
     try:
         auth_service.init_super_admin(db)
@@ -71,7 +154,8 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     except auth_service.JWTError:
         raise credentials_exception
     
-    user = db.query(models.User).filter(models.User.email == email).first()
+    # 프로세스 내 캐시 우선 (사용자 변경 시 버전 카운터로 모든 워커에서 무효화됨)
+    user = user_cache.get(db, email)
     if user is None:
         raise credentials_exception
     if not user.is_active:
@@ -85,25 +169,41 @@ def get_super_admin(user: models.User = Depends(get_current_user)):
 
 # --- 페이지 라우트 ---
 
+def page_response(request: Request, name: str):
+    """미리 렌더링된 페이지 반환 (If-None-Match 일치 시 304)"""
+    page = assets.page(name)
+    if page is None:
+        # 사전 렌더링 전이거나 실패한 경우 기존 방식으로 렌더링
+        return templates.TemplateResponse(name, {"request": request})
+    return page.response(request)
+
+@app.get("/static/{path:path}", name="static")
+async def static_file(path: str, request: Request):
+    """해시 파일명(immutable) 또는 원래 파일명(재검증)으로 정적 파일 제공"""
+    asset = assets.static(path)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return asset.response(request)
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    return templates.TemplateResponse("index.html", {"request": request})
+    return page_response(request, "index.html")
 
 @app.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
-    return templates.TemplateResponse("login.html", {"request": request})
+    return page_response(request, "login.html")
 
 @app.get("/signup", response_class=HTMLResponse)
 async def signup_page(request: Request):
-    return templates.TemplateResponse("signup.html", {"request": request})
+    return page_response(request, "signup.html")
 
 @app.get("/admin/users", response_class=HTMLResponse)
 async def admin_users_page(request: Request):
-    return templates.TemplateResponse("admin_users.html", {"request": request})
+    return page_response(request, "admin_users.html")
 
 @app.get("/admin/secure-files", response_class=HTMLResponse)
 async def admin_secure_files_page(request: Request):
-    return templates.TemplateResponse("admin_secure_files.html", {"request": request})
+    return page_response(request, "admin_secure_files.html")
 
 # --- 인증 API ---
 
@@ -120,7 +220,7 @@ async def signup(user_data: UserSignup, db: Session = Depends(database.get_db)):
     new_user = models.User(
         name=user_data.name,
         email=user_data.email,
-        password_hash=auth_service.get_password_hash(user_data.password),
+        password_hash=await executors.run_in(executors.CPU, auth_service.get_password_hash, user_data.password),
         is_active=False
     )
     db.add(new_user)
@@ -130,7 +230,7 @@ async def signup(user_data: UserSignup, db: Session = Depends(database.get_db)):
 @app.post("/api/auth/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(database.get_db)):
     user = db.query(models.User).filter(models.User.email == form_data.username).first()
-    if not user or not auth_service.verify_password(form_data.password, user.password_hash):
+    if not user or not await executors.run_in(executors.CPU, auth_service.verify_password, form_data.password, user.password_hash):
         raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 잘못되었습니다.")
     
     if not user.is_active:
@@ -155,6 +255,7 @@ async def approve_user(user_id: int, db: Session = Depends(database.get_db), adm
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
     user.is_active = True
+    user_cache.bump(db)
     db.commit()
     return {"message": "User approved"}
 
@@ -166,6 +267,7 @@ async def delete_user(user_id: int, db: Session = Depends(database.get_db), admi
     if user.is_super_admin:
         raise HTTPException(status_code=400, detail="수퍼 관리자는 삭제할 수 없습니다.")
     db.delete(user)
+    user_cache.bump(db)
     db.commit()
     return {"message": "User deleted"}
 
@@ -197,11 +299,15 @@ async def upload_secure_file(
     file_type: 'firebase', 'youtube', 'env'
     """
     try:
-        # 파일 읽기
-        file_content = await file.read()
+        # 파일 읽기 (크기 제한을 적용하며 임시 파일로 스트리밍 저장)
+        stored = await uploads.save_upload_temp(file)
+        try:
+            file_content = stored.read_bytes()
+        finally:
+            stored.remove()
         
         # 암호화
-        encrypted_content = CryptoService.encrypt_file(file_content, key_phrase)
+        encrypted_content = await executors.run_in(executors.CPU, CryptoService.encrypt_file, file_content, key_phrase)
         
         # DB에 저장 (기존 파일이 있으면 업데이트)
         existing = db.query(models.SecureFile).filter(
@@ -227,6 +333,8 @@ async def upload_secure_file(
             db.commit()
             return {"status": "success", "message": f"{file.filename} 파일이 저장되었습니다."}
     
+    except UploadTooLarge as e:
+        return JSONResponse(status_code=413, content={"status": "error", "message": str(e)})
     except Exception as e:
         return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
@@ -245,7 +353,9 @@ async def decrypt_secure_file(
         raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
     
     try:
-        decrypted_content = CryptoService.decrypt_file(secure_file.encrypted_content, key_phrase)
+        decrypted_content = await executors.run_in(
+            executors.CPU, CryptoService.decrypt_file, secure_file.encrypted_content, key_phrase
+        )
         return FileResponse(
             path=None,
             content=decrypted_content,
@@ -287,9 +397,15 @@ async def process_content(
 
     # 1. 파일 처리
     if file:
-        filename = file.filename
-        content_bytes = await file.read()
-        markdown_text = content_bytes.decode("utf-8")
+        filename = uploads.safe_filename(file.filename)
+        try:
+            stored = await uploads.save_upload_temp(file)
+        except UploadTooLarge as e:
+            return JSONResponse(status_code=413, content={"status": "error", "message": str(e)})
+        try:
+            markdown_text = stored.read_bytes().decode("utf-8")
+        finally:
+            stored.remove()
     
     # 2. 텍스트 직접 입력 처리
     else:
@@ -305,6 +421,55 @@ async def process_content(
     except Exception as e:
         return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
+@app.post("/api/wiki/bulk-import")
+async def wiki_bulk_import(
+    archive: UploadFile = File(None),
+    files: list[UploadFile] = File(None),
+    user: models.User = Depends(get_current_user)
+):
+    """
+    마크다운 문서 묶음(zip 파일 하나 또는 폴더의 여러 .md 파일)을 일괄 게시하는 작업을 등록하고 즉시 job_id를 반환합니다.
+    문서별 결과는 작업 결과(result.documents)로 조회하며, 같은 묶음을 다시 올리면 성공한 문서는 건너뜁니다.
+    """
+    if not archive and not files:
+        return JSONResponse(status_code=400, content={"status": "error", "message": "No archive or files provided"})
+    job_id = jobs.new_job_id()
+    work_dir = jobs.job_dir(job_id)
+    try:
+        if archive:
+            source_path = os.path.join(work_dir, "import.zip")
+            await uploads.save_upload(archive, source_path)
+        else:
+            source_path = os.path.join(work_dir, "docs")
+            os.makedirs(source_path, exist_ok=True)
+            names = [uploads.safe_filename(upload.filename) for upload in files]
+            duplicates = sorted({name for name in names if names.count(name) > 1})
+            if duplicates:
+                # 파일명이 곧 위키 제목이므로 같은 이름으로 저장되는 파일은 덮어쓰지 않고 거부
+                raise BulkImportError(f"같은 이름의 문서가 여러 개 있습니다: {', '.join(duplicates)}")
+            for upload, name in zip(files, names):
+                await uploads.save_upload(upload, os.path.join(source_path, name))
+        source = await executors.run_in(executors.DISK, DocumentSource, source_path)
+        await executors.run_in(
+            executors.DISK, jobs.submit,
+            "wiki_bulk_import", bulk_import.run_job, source_path, asyncio.get_running_loop(),
+            job_id=job_id, user_id=user.id
+        )
+        return JSONResponse(status_code=202, content={
+            "status": "queued", "job_id": job_id, "documents": len(source.names)
+        })
+    except BulkImportError as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return JSONResponse(status_code=400, content={"status": "error", "message": str(e)})
+    except UploadTooLarge as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return JSONResponse(status_code=413, content={"status": "error", "message": str(e)})
+    except JobQueueFull as e:
+        return JSONResponse(status_code=503, content={"status": "error", "message": str(e)})
+    except Exception as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+
 @app.post("/api/share/linkedin")
 async def share_linkedin(
     wiki_id: str = Form(...),
@@ -324,8 +489,13 @@ async def share_linkedin(
 # --- Youtube Poster Endpoints ---
 
 @app.get("/api/youtube/logo/{category}")
-async def get_youtube_logo(category: str, token: str = None, db: Session = Depends(database.get_db)):
-    """카테고리별 현재 로고 이미지를 반환합니다. (이미지 태그용 토큰 지원)"""
+async def get_youtube_logo(
+    category: str, request: Request, token: str = None, w: int = None, db: Session = Depends(database.get_db)
+):
+    """
+    카테고리별 현재 로고 이미지를 반환합니다. (이미지 태그용 토큰 지원)
+    w에 미리 축소된 크기(180, 800)를 주면 축소본을 반환하며, If-None-Match가 일치하면 304를 반환합니다.
+    """
     if not token:
         raise HTTPException(status_code=401, detail="Token required")
     
@@ -334,10 +504,15 @@ async def get_youtube_logo(category: str, token: str = None, db: Session = Depen
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    logo_path = youtube.get_logo_path(category)
-    if logo_path and os.path.exists(logo_path):
-        return FileResponse(logo_path)
-    return JSONResponse(status_code=404, content={"message": "Logo not found"})
+    logo = await executors.run_in(executors.DISK, youtube.assets.logo, category)
+    if not logo:
+        return JSONResponse(status_code=404, content={"message": "Logo not found"})
+    body, etag = logo.variant(w)
+    # 브라우저가 매번 ETag로 재검증하도록 no-cache (로고 교체 즉시 반영)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="image/png", headers=headers)
 
 @app.post("/api/youtube/logo/upload")
 async def upload_youtube_logo(
@@ -347,9 +522,14 @@ async def upload_youtube_logo(
 ):
     """새로운 로고 이미지를 업로드하고 교체합니다."""
     try:
-        content = await logo.read()
-        youtube.save_logo(category, content, logo.filename)
+        stored = await uploads.save_upload_temp(logo)
+        try:
+            await executors.run_in(executors.DISK, youtube.save_logo, category, stored.path, stored.filename)
+        finally:
+            stored.remove()
         return JSONResponse(content={"status": "success", "message": "Logo uploaded successfully"})
+    except UploadTooLarge as e:
+        return JSONResponse(status_code=413, content={"status": "error", "message": str(e)})
     except Exception as e:
         return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
@@ -362,9 +542,14 @@ async def generate_youtube_metadata(
 ):
     """PDF 분석을 통해 유튜브 메타데이터를 생성합니다."""
     try:
-        content = await pdf.read()
-        metadata = await youtube.generate_metadata(content, category, lang)
+        stored = await uploads.save_upload_temp(pdf)
+        try:
+            metadata = await youtube.generate_metadata(stored.path, category, lang)
+        finally:
+            stored.remove()
         return JSONResponse(content={"status": "success", "metadata": metadata})
+    except UploadTooLarge as e:
+        return JSONResponse(status_code=413, content={"status": "error", "message": str(e)})
     except Exception as e:
         return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
@@ -377,17 +562,189 @@ async def youtube_upload(
     gen_sub: bool = Form(False),
     user: models.User = Depends(get_current_user)
 ):
-    """영상을 처리하고 유튜브에 업로드합니다."""
+    """
+    영상 처리 및 유튜브 업로드 작업을 등록하고 즉시 job_id를 반환합니다.
+    진행 상황은 GET /api/jobs/{job_id}로 조회합니다.
+    """
+    job_id = jobs.new_job_id()
+    work_dir = jobs.job_dir(job_id)
     try:
-        video_content = await video.read()
-        pdf_content = await pdf.read()
-        result = await youtube.process_and_upload(
-            video_content, video.filename, pdf_content, category, lang, gen_sub
+        # 메모리에 올리지 않고 작업 디렉토리로 스트리밍 저장
+        stored_video = await uploads.save_upload(
+            video, os.path.join(work_dir, f"raw_{uploads.safe_filename(video.filename, 'video.mp4')}"),
+            max_bytes=uploads.MAX_VIDEO_BYTES
         )
-        return JSONResponse(content=result)
+        stored_pdf = await uploads.save_upload(pdf, os.path.join(work_dir, "metadata_source.pdf"))
+        print(f"📥 Video received: {stored_video.filename} ({stored_video.size} bytes, sha256={stored_video.sha256})")
+        await executors.run_in(
+            executors.DISK, jobs.submit,
+            "youtube_upload", youtube.process_and_upload,
+            stored_video.path, stored_pdf.path, category, lang, gen_sub,
+            work_dir=work_dir, job_id=job_id, user_id=user.id
+        )
+        return JSONResponse(status_code=202, content={
+            "status": "queued", "job_id": job_id, "video_sha256": stored_video.sha256
+        })
+    except UploadTooLarge as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return JSONResponse(status_code=413, content={"status": "error", "message": str(e)})
+    except JobQueueFull as e:
+        return JSONResponse(status_code=503, content={"status": "error", "message": str(e)})
     except Exception as e:
+        shutil.rmtree(work_dir, ignore_errors=True)
         return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
+@app.post("/api/youtube/upload/resumable")
+async def youtube_upload_resumable(
+    upload_id: str = Form(...),
+    pdf: UploadFile = File(...),
+    category: str = Form(...),
+    lang: str = Form("ko"),
+    gen_sub: bool = Form(False),
+    user: models.User = Depends(get_current_user)
+):
+    """
+    재개 가능한 업로드(/api/uploads)로 전송이 끝난 영상을 유튜브 파이프라인 작업으로 등록합니다.
+    """
+    # 완료 처리로 세션 파일을 옮기기 전에 대기열 자리부터 확보
+    try:
+        jobs.reserve()
+    except JobQueueFull as e:
+        return JSONResponse(status_code=503, content={"status": "error", "message": str(e)})
+    job_id = jobs.new_job_id()
+    work_dir = jobs.job_dir(job_id)
+    video_path = None
+    try:
+        stored_pdf = await uploads.save_upload(pdf, os.path.join(work_dir, "metadata_source.pdf"))
+        session = await executors.run_in(executors.DISK, resumable_uploads.status, upload_id, user.id)
+        video = await executors.run_in(
+            executors.DISK, resumable_uploads.finalize, upload_id, user.id,
+            os.path.join(work_dir, f"raw_{session['filename']}")
+        )
+        video_path = os.path.join(work_dir, f"raw_{session['filename']}")
+        print(f"📥 Video received: {video['filename']} ({video['size']} bytes, sha256={video['sha256']})")
+        await executors.run_in(
+            executors.DISK, jobs.submit,
+            "youtube_upload", youtube.process_and_upload,
+            video_path, stored_pdf.path, category, lang, gen_sub,
+            work_dir=work_dir, job_id=job_id, user_id=user.id, reserved=True
+        )
+        return JSONResponse(status_code=202, content={
+            "status": "queued", "job_id": job_id, "video_sha256": video["sha256"]
+        })
+    except Exception as e:
+        jobs.release()
+        if video_path:
+            # 완료 처리된 영상은 세션으로 되돌려 클라이언트가 다시 요청할 수 있게 함
+            try:
+                await executors.run_in(executors.DISK, resumable_uploads.reopen, upload_id, user.id, video_path)
+            except Exception as restore_error:
+                print(f"⚠️ Failed to restore upload session {upload_id}: {restore_error}")
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if isinstance(e, UploadSessionError):
+            return JSONResponse(status_code=e.status_code, content={"status": "error", "message": str(e)})
+        if isinstance(e, UploadTooLarge):
+            return JSONResponse(status_code=413, content={"status": "error", "message": str(e)})
+        return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
+
+# --- 재개 가능한 청크 업로드 API ---
+
+@app.post("/api/uploads", status_code=201)
+async def create_upload_session(data: UploadSessionCreate, user: models.User = Depends(get_current_user)):
+    """업로드 세션을 생성합니다. 이후 PUT /api/uploads/{upload_id}로 바이트 범위를 전송합니다."""
+    try:
+        return await executors.run_in(executors.DISK, resumable_uploads.create, user.id, data.filename, data.size)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+
+@app.put("/api/uploads/{upload_id}")
+async def put_upload_chunk(upload_id: str, request: Request, user: models.User = Depends(get_current_user)):
+    """
+    Content-Range: bytes {start}-{end}/{size} 헤더와 함께 해당 범위의 바이트를 전송합니다.
+    범위는 순서와 무관하게 병렬로 전송할 수 있습니다.
+    """
+    try:
+        info = await resumable_uploads.write_range(
+            upload_id, user.id, request.headers.get("content-range"), request.stream()
+        )
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return JSONResponse(content=info, headers={"Upload-Offset": str(info["offset"])})
+
+@app.get("/api/uploads/{upload_id}")
+async def get_upload_session(upload_id: str, user: models.User = Depends(get_current_user)):
+    """현재 연속 수신 오프셋과 수신된 범위 목록을 반환합니다. (중단된 업로드 재개용)"""
+    try:
+        info = await executors.run_in(executors.DISK, resumable_uploads.status, upload_id, user.id)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return JSONResponse(content=info, headers={
+        "Upload-Offset": str(info["offset"]), "Upload-Length": str(info["size"])
+    })
+
+@app.delete("/api/uploads/{upload_id}")
+async def cancel_upload_session(upload_id: str, user: models.User = Depends(get_current_user)):
+    try:
+        await executors.run_in(executors.DISK, resumable_uploads.cancel, upload_id, user.id)
+    except UploadSessionError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return {"message": "Upload cancelled"}
+
+# --- 백그라운드 작업 API ---
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str, user: models.User = Depends(get_current_user)):
+    """작업의 현재 단계, 진행률, 최종 결과를 반환합니다."""
+    job = await executors.run_in(executors.DISK, jobs.get, job_id)
+    if not job or (job["user_id"] != user.id and not user.is_super_admin):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return job
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str, request: Request, token: str = None, db: Session = Depends(database.get_db)):
+    """
+    작업 진행 상황을 Server-Sent Events로 전달합니다. (EventSource용 토큰 쿼리 지원)
+    상태가 바뀔 때마다 'progress' 이벤트, 완료/실패 시 'done' 이벤트를 보내고 연결을 종료합니다.
+    """
+    if not token:
+        raise HTTPException(status_code=401, detail="Token required")
+    try:
+        user = await executors.run_in(executors.EVENTS, get_current_user, token, db)
+    except Exception:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    job = await executors.run_in(executors.EVENTS, jobs.get, job_id)
+    if not job or (job["user_id"] != user.id and not user.is_super_admin):
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+
+    async def stream():
+        last_payload = None
+        last_sent = time.monotonic()
+        # 프로세스당 하나의 폴러가 구독 중인 작업들을 한꺼번에 조회하여 나눠 줌
+        async with aclosing(job_watcher.updates(job_id, job)) as updates:
+            async for current in updates:
+                if current is None:
+                    return
+                payload = json.dumps(current, ensure_ascii=False)
+                if payload != last_payload:
+                    event = "done" if current["status"] in ("success", "error") else "progress"
+                    yield f"event: {event}\ndata: {payload}\n\n"
+                    last_payload, last_sent = payload, time.monotonic()
+                    if event == "done":
+                        return
+                elif time.monotonic() - last_sent > SSE_HEARTBEAT_SECONDS:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 라인 전송
+                    yield ": keep-alive\n\n"
+                    last_sent = time.monotonic()
+                if await request.is_disconnected():
+                    return
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache", "X-Accel-Buffering": "no"
+    })
+
 @app.post("/api/youtube/share/linkedin")
 async def youtube_share_linkedin(
     video_id: str = Form(...),
@@ -402,6 +759,21 @@ async def youtube_share_linkedin(
     except Exception as e:
         return JSONResponse(status_code=500, content={"status": "error", "message": str(e)})
 
+@app.get("/metrics")
+async def metrics_endpoint(request: Request):
+    """Prometheus 수집용 메트릭 (모든 워커 프로세스 합산, METRICS_TOKEN / METRICS_ALLOWED_IPS로 접근 제한)"""
+    client_host = request.client.host if request.client else None
+    if not metrics.scrape_allowed(client_host, request.headers.get("authorization")):
+        # 존재 여부도 드러내지 않음
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = await executors.run_in(executors.DISK, metrics.render)
+    return Response(content=body, media_type=content_type)
+
+@app.get("/api/health")
+async def health():
+    """워커 상태와 외부 의존성별 준비 상태(pending/warming/ready/failed)를 반환합니다."""
+    return {"status": "ok", "dependencies": registry.status()}
+
 @app.get("/api/auth/me")
 async def get_me(user: models.User = Depends(get_current_user)):
     return {
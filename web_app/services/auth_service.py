@@ -5,7 +5,8 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlalchemy.orm import Session
-from core import models
+from core import database, models
+from core.user_cache import user_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -57,9 +58,21 @@ def validate_password_strength(password: str) -> bool:
         return False
     return True
 
+def _super_admin_up_to_date(user, password) -> bool:
+    """저장된 계정이 수퍼 관리자 권한/활성 상태이고 비밀번호 해시가 password와 일치하는지 확인"""
+    if not user or not user.is_active or not user.is_super_admin or not user.password_hash:
+        return False
+    try:
+        return verify_password(password, user.password_hash)
+    except ValueError:
+        # 알 수 없는 해시 형식이면 다시 기록
+        return False
+
 def init_super_admin(db: Session):
     """
-    .env에서 수퍼 관리자 계정을 읽어 DB에 등록
+    .env에서 수퍼 관리자 계정을 읽어 DB에 등록 (멱등)
+    저장된 해시로 먼저 검증하여 바뀐 것이 없으면 아무것도 쓰지 않고,
+    변경이 필요할 때만 DB 쓰기 잠금 안에서 다시 확인한 뒤 기록하므로 여러 워커가 동시에 시작해도 한 번만 기록됨
     """
     super_id = os.getenv("SUPER_ADMIN_ID")
     super_pw = os.getenv("SUPER_ADMIN_PW")
@@ -68,25 +81,42 @@ def init_super_admin(db: Session):
         print("⚠️ SUPER_ADMIN_ID or SUPER_ADMIN_PW not set in .env")
         return
 
-    # 이미 존재하는지 확인
     user = db.query(models.User).filter(models.User.email == super_id).first()
-    if not user:
-        new_user = models.User(
-            name="Super Admin",
-            email=super_id,
-            password_hash=get_password_hash(super_pw),
-            is_active=True,
-            is_super_admin=True
-        )
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
-        print(f"✅ Super Admin created: {super_id}")
-    else:
-        # 비밀번호 업데이트 (필요시)
-        user.password_hash = get_password_hash(super_pw)
-        user.is_active = True
-        user.is_super_admin = True
-        db.commit()
-        print(f"✅ Super Admin info updated: {super_id}")
+    if _super_admin_up_to_date(user, super_pw):
+        return
+    db.rollback()
 
+    database.begin_write_lock(db)
+    try:
+        # 잠금을 기다리는 동안 다른 워커가 이미 반영했을 수 있으므로 다시 확인
+        user = db.query(models.User).filter(models.User.email == super_id).first()
+        if _super_admin_up_to_date(user, super_pw):
+            db.rollback()
+            return
+
+        if not user:
+            user = models.User(
+                name="Super Admin",
+                email=super_id,
+                password_hash=get_password_hash(super_pw),
+                is_active=True,
+                is_super_admin=True
+            )
+            db.add(user)
+            message = f"✅ Super Admin created: {super_id}"
+        else:
+            try:
+                password_ok = bool(user.password_hash) and verify_password(super_pw, user.password_hash)
+            except ValueError:
+                password_ok = False
+            if not password_ok:
+                user.password_hash = get_password_hash(super_pw)
+            user.is_active = True
+            user.is_super_admin = True
+            message = f"✅ Super Admin info updated: {super_id}"
+        user_cache.bump(db)
+        db.commit()
+        print(message)
+    except Exception:
+        db.rollback()
+        raise
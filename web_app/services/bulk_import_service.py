@@ -0,0 +1,328 @@
+"""
+위키 일괄 가져오기 서비스
+zip 파일 또는 디렉토리 안의 마크다운 문서들을 ConverterService로 변환/게시
+
+    - 문서는 크기가 제한된 대기열을 통해 BULK_IMPORT_CONCURRENCY개 작업자에게 흘려보냄
+      (대기열이 차면 읽기를 멈추므로 문서 수와 관계없이 메모리 사용량이 일정)
+    - ID 매핑은 로컬 인덱스 사본을 모든 문서가 공유하고, 새 ID는 문서를 작업자에게 넘기기 전에
+      BULK_IMPORT_CLAIM_BATCH개(기본 50)씩 한 트랜잭션으로 등록 (내용 저장 전에 ID가 확정됨)
+      wiki-id-map 집계 문서는 끝날 때 한 번만 기록
+      (Firestore에 등록하지 못한 ID는 상태 파일의 pending_ids에, 집계에 기록하지 못한 ID는 unpublished_ids에
+      남겨 마지막과 다음 실행에서 다시 시도)
+    - 문서별 결과를 상태 파일(BULK_IMPORT_STATE_DIR/<import_id>.json)에 기록하므로 중단 후 같은 묶음을
+      다시 가져오면 이미 성공한(내용이 같은) 문서는 건너뛰고 이어서 진행
+
+import_id는 문서 이름 목록만의 해시이므로 일부 문서를 고쳐 다시 묶어도 같은 가져오기로 이어짐
+(내용은 키에 들어가지 않으므로 다시 올린 문서를 건너뛸지는 문서별 sha256 비교로만 판단)
+
+CLI (web_app 디렉토리에서):
+    python -m services.bulk_import_service notes.zip
+    python -m services.bulk_import_service ./notes --concurrency 4
+"""
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import tempfile
+import zipfile
+from dotenv import load_dotenv
+from core import executors, tracing, gemini_gateway
+from .wiki_id_index import unique_id
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STATE_DIR = os.path.join(BASE_DIR, 'scratch', 'bulk_imports')
+
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+# 문서 하나의 최대 크기 (zip 폭탄 방지)
+MAX_DOCUMENT_BYTES = int(os.getenv("UPLOAD_MAX_FILE_MB", "50")) * 1024 * 1024
+
+
+class BulkImportError(Exception):
+    """가져올 수 없는 입력 (문서 없음, 잘못된 zip, 이름 중복 등)"""
+
+
+class DocumentSource:
+    """zip 파일 또는 디렉토리의 마크다운 문서 목록과 내용 읽기"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.is_zip = os.path.isfile(path) and zipfile.is_zipfile(path)
+        if not self.is_zip and not os.path.isdir(path):
+            raise BulkImportError(f"zip 파일 또는 디렉토리가 아닙니다: {os.path.basename(path)}")
+        self._members = self._list()
+
+    def _list(self):
+        """문서 이름(파일명) -> zip 멤버 이름 또는 파일 경로"""
+        if self.is_zip:
+            with zipfile.ZipFile(self.path) as zf:
+                entries = [info.filename for info in zf.infolist() if not info.is_dir()]
+        else:
+            entries = []
+            for root, dirs, files in os.walk(self.path):
+                dirs[:] = [d for d in dirs if not d.startswith(".")]
+                entries.extend(os.path.join(root, name) for name in files)
+
+        members = {}
+        for entry in sorted(entries):
+            name = os.path.basename(entry.replace("\\", "/"))
+            if name.startswith(".") or "__MACOSX" in entry or not name.lower().endswith(MARKDOWN_EXTENSIONS):
+                continue
+            if name in members:
+                # 파일명이 곧 위키 제목이므로 폴더가 달라도 같은 이름은 허용하지 않음
+                raise BulkImportError(f"같은 이름의 문서가 여러 개 있습니다: {name}")
+            members[name] = entry
+        if not members:
+            raise BulkImportError("마크다운(.md) 문서가 없습니다.")
+        return members
+
+    @property
+    def names(self):
+        return list(self._members)
+
+    def read(self, name: str) -> str:
+        entry = self._members[name]
+        if self.is_zip:
+            with zipfile.ZipFile(self.path) as zf:
+                info = zf.getinfo(entry)
+                if info.file_size > MAX_DOCUMENT_BYTES:
+                    raise BulkImportError(f"문서가 너무 큽니다: {name}")
+                data = zf.read(info)
+        else:
+            if os.path.getsize(entry) > MAX_DOCUMENT_BYTES:
+                raise BulkImportError(f"문서가 너무 큽니다: {name}")
+            with open(entry, "rb") as f:
+                data = f.read()
+        return data.decode("utf-8-sig")
+
+
+class BulkImportService:
+    def __init__(self, converter, state_dir: str = None, concurrency: int = None):
+        self.converter = converter
+        self.state_dir = state_dir or os.getenv("BULK_IMPORT_STATE_DIR", DEFAULT_STATE_DIR)
+        self.concurrency = concurrency or int(os.getenv("BULK_IMPORT_CONCURRENCY", "3"))
+        # 새 ID를 한 트랜잭션으로 등록할 문서 수 (그동안 해당 문서 내용을 메모리에 둠)
+        self.claim_batch = max(1, int(os.getenv("BULK_IMPORT_CLAIM_BATCH", "50")))
+
+    @staticmethod
+    def import_id(names) -> str:
+        """상태 파일 키: 문서 이름 목록만 해시 (내용이 바뀐 문서는 sha256 비교로 다시 게시)"""
+        return hashlib.sha256(json.dumps(sorted(names), ensure_ascii=False).encode("utf-8")).hexdigest()[:32]
+
+    def run_job(self, path: str, loop, progress=None):
+        """
+        JobManager용 동기 진입점: 서버 이벤트 루프에서 가져오기를 실행하고 끝날 때까지 대기
+        (웹 요청과 같은 루프를 쓰므로 Gemini 동시 호출 한도 CONVERTER_CONCURRENCY를 함께 지킴)
+        """
+        return asyncio.run_coroutine_threadsafe(self.run(path, progress=progress), loop).result()
+
+    @tracing.traced()
+    async def run(self, path: str, progress=None):
+        """
+        가져오기 실행 후 보고서 반환
+        {"import_id", "total", "succeeded", "failed", "skipped", "new_ids", "documents": [...]}
+        """
+        # 일괄 가져오기의 Gemini 호출은 웹 요청보다 뒤로 (작업자 태스크는 생성 시점의 컨텍스트를 물려받음)
+        with gemini_gateway.priority(gemini_gateway.BATCH):
+            return await self._import(path, progress)
+
+    async def _import(self, path, progress):
+        source = await executors.run_in(executors.DISK, DocumentSource, path)
+        import_id = self.import_id(source.names)
+        state = await executors.run_in(executors.DISK, self._load_state, import_id)
+        documents = state.setdefault("documents", {})
+        pending_ids = state.setdefault("pending_ids", {})
+        unpublished_ids = state.setdefault("unpublished_ids", {})
+        total = len(source.names)
+        logger.info(f"Bulk import {import_id}: {total} documents ({len(documents)} recorded)")
+
+        # ID 매핑 사본을 공유하고, 이전 실행에서 Firestore에 등록하지 못한 새 ID를 합침
+        id_map = await executors.run_in(executors.STORAGE, self.converter.id_index.snapshot)
+        id_map.update(pending_ids)
+
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        done = {"count": 0, "new_ids": 0}
+        save_lock = asyncio.Lock()
+
+        def report(name):
+            done["count"] += 1
+            if progress:
+                progress("import", done["count"] / total, done=done["count"], total=total, current=name)
+
+        async def record(name, entry):
+            documents[name] = entry
+            async with save_lock:
+                await executors.run_in(executors.DISK, self._save_state, import_id, state)
+
+        async def claim_batch(batch):
+            """묶음 안에서 ID가 없는 문서들의 ID를 생성해 한 트랜잭션으로 등록한 뒤 작업자에게 넘김"""
+            titles = [title for title in dict.fromkeys(os.path.splitext(name)[0] for name, _, _ in batch)
+                      if title not in id_map]
+            if titles:
+                generated = await asyncio.gather(*[self.converter.generate_id(title) for title in titles])
+                taken = set(id_map.values())
+                candidates = {}
+                for title, wiki_id in zip(titles, generated):
+                    candidates[title] = unique_id(wiki_id, taken)
+                    taken.add(candidates[title])
+                claimed = await executors.run_in(
+                    executors.STORAGE, self.converter.id_index.claim_many, candidates, publish=False
+                )
+                if claimed is None:
+                    pending_ids.update(candidates)
+                    id_map.update(candidates)
+                else:
+                    unpublished_ids.update(claimed)
+                    id_map.update(claimed)
+                done["new_ids"] += len(titles)
+            for item in batch:
+                await queue.put(item)  # 대기열이 차면 작업자가 따라올 때까지 대기
+
+        async def produce():
+            batch = []
+            for name in source.names:
+                try:
+                    content = await executors.run_in(executors.DISK, source.read, name)
+                except (BulkImportError, UnicodeDecodeError, OSError, zipfile.BadZipFile) as e:
+                    await record(name, {"status": "error", "message": str(e)})
+                    report(name)
+                    continue
+                digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+                previous = documents.get(name)
+                if previous and previous.get("status") in ("success", "skipped") and previous.get("sha256") == digest:
+                    documents[name] = dict(previous, status="skipped")
+                    report(name)
+                    continue
+                batch.append((name, content, digest))
+                if len(batch) >= self.claim_batch:
+                    await claim_batch(batch)
+                    batch = []
+            if batch:
+                await claim_batch(batch)
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                name, content, digest = item
+                try:
+                    result = await self.converter.process_markdown(content, name, id_map=id_map)
+                except Exception as e:
+                    result = {"status": "error", "message": str(e)}
+                if result.get("status") == "success":
+                    entry = {"status": "success", "sha256": digest, "wiki_id": result["wiki_id"], "link": result.get("link")}
+                    base_name = os.path.splitext(name)[0]
+                    if result.get("new_id"):
+                        # 묶음 등록에서 ID를 만들지 못한 문서는 변환기가 문서별로 등록함
+                        done["new_ids"] += 1
+                        if result.get("id_saved", True):
+                            unpublished_ids[base_name] = result["wiki_id"]
+                        else:
+                            pending_ids[base_name] = result["wiki_id"]
+                else:
+                    entry = {"status": "error", "sha256": digest, "message": result.get("message", "unknown error")}
+                await record(name, entry)
+                report(name)
+
+        tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        # 등록하지 못한 새 ID를 다시 시도 (또 실패하면 상태 파일에 남겨 다음 실행에서 다시 시도)
+        new_ids = dict(pending_ids)
+        if new_ids:
+            if progress:
+                progress("claim_ids", 1.0, count=len(new_ids))
+            claimed = await executors.run_in(
+                executors.STORAGE, self.converter.id_index.claim_many, new_ids, publish=False
+            )
+            if claimed is not None:
+                pending_ids.clear()
+                unpublished_ids.update(claimed)
+                names_by_title = {os.path.splitext(name)[0]: name for name in source.names}
+                for title, wiki_id in claimed.items():
+                    if wiki_id != new_ids[title] and title in names_by_title:
+                        # 그사이 다른 게시가 같은 제목/ID를 먼저 등록함: 확정된 ID로 다시 게시하도록 실패로 남김
+                        documents[names_by_title[title]] = {
+                            "status": "error",
+                            "message": f"ID conflict: registered as {wiki_id}, import again to republish",
+                        }
+
+        # 이번 실행에서 확정된 ID를 wiki-id-map 집계 문서에 한 번에 기록
+        if unpublished_ids:
+            if await executors.run_in(executors.STORAGE, self.converter.id_index.publish, dict(unpublished_ids)):
+                unpublished_ids.clear()
+        await executors.run_in(executors.DISK, self._save_state, import_id, state)
+
+        report_docs = [dict(documents.get(name, {"status": "error", "message": "not processed"}), name=name)
+                       for name in source.names]
+        counts = {status: sum(1 for d in report_docs if d["status"] == status) for status in ("success", "error", "skipped")}
+        return {
+            "import_id": import_id,
+            "total": total,
+            "succeeded": counts["success"],
+            "failed": counts["error"],
+            "skipped": counts["skipped"],
+            "new_ids": done["new_ids"],
+            "documents": report_docs,
+        }
+
+    def _state_path(self, import_id):
+        return os.path.join(self.state_dir, f"{import_id}.json")
+
+    def _load_state(self, import_id):
+        try:
+            with open(self._state_path(import_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Bulk import state unreadable, starting over: {e}")
+            return {}
+
+    def _save_state(self, import_id, state):
+        os.makedirs(self.state_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.state_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self._state_path(import_id))
+
+
+def main():
+    import argparse
+    from .converter_service import ConverterService
+
+    parser = argparse.ArgumentParser(description="zip 파일 또는 디렉토리의 마크다운 문서를 위키로 일괄 게시")
+    parser.add_argument("source", help="마크다운 문서가 든 zip 파일 또는 디렉토리")
+    parser.add_argument("--concurrency", type=int, default=None, help="동시에 변환할 문서 수 (기본 BULK_IMPORT_CONCURRENCY)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    service = BulkImportService(ConverterService(), concurrency=args.concurrency)
+
+    def show(stage, ratio, **detail):
+        if stage == "import":
+            print(f"[{detail['done']}/{detail['total']}] {detail['current']}")
+
+    try:
+        result = asyncio.run(service.run(os.path.abspath(args.source), progress=show))
+    except BulkImportError as e:
+        raise SystemExit(f"❌ {e}")
+    for doc in result["documents"]:
+        mark = {"success": "✅", "skipped": "⏭️", "error": "❌"}[doc["status"]]
+        print(f"{mark} {doc['name']}: {doc.get('link') or doc.get('message', '')}")
+    print(f"\n성공 {result['succeeded']} / 건너뜀 {result['skipped']} / 실패 {result['failed']} (총 {result['total']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+카테고리별 자산(로고, 설명 템플릿) 메모리 캐시
+로고 조회마다 os.listdir를 두 번 하거나, 메타데이터 생성마다 desc_{lang}.md를 다시 읽지 않도록
+카테고리 디렉토리 단위로 내용을 보관하고 mtime이 바뀌었거나 invalidate()가 호출되면 다시 읽음
+
+로고는 원본 바이트와 ETag, 미리 축소한 변형(워터마크용 180px, 아웃트로용 800px 등)을 함께 보관
+"""
+import io
+import os
+import hashlib
+import logging
+import threading
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# 미리 만들어 두는 로고 가로 크기 (영상 우하단 워터마크 / 아웃트로 중앙 로고)
+LOGO_VARIANT_WIDTHS = (180, 800)
+
+
+def _etag(body: bytes, suffix: str = "") -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}{suffix}"'
+
+
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class LogoAsset:
+    """로고 파일 내용과 ETag, 가로 크기별 축소본"""
+
+    def __init__(self, path: str, body: bytes, variant_widths=LOGO_VARIANT_WIDTHS):
+        self.path = path
+        self.body = body
+        self.etag = _etag(body)
+        self.mtime = _mtime(path)
+        self.variants = {}
+        for width in variant_widths:
+            try:
+                scaled = self._scale(body, width)
+                self.variants[width] = (scaled, _etag(scaled, f"-w{width}"))
+            except Exception as e:
+                logger.warning(f"Failed to scale logo {path} to {width}px: {e}")
+
+    def variant(self, width: int = None):
+        """(bytes, etag) 반환. width가 없거나 미리 만들지 않은 크기면 원본"""
+        if width and width in self.variants:
+            return self.variants[width]
+        return self.body, self.etag
+
+    @staticmethod
+    def _scale(body: bytes, width: int) -> bytes:
+        with Image.open(io.BytesIO(body)) as img:
+            height = max(1, round(img.height * width / img.width))
+            scaled = img.convert("RGBA").resize((width, height), Image.LANCZOS)
+            out = io.BytesIO()
+            scaled.save(out, format="PNG", optimize=True)
+            return out.getvalue()
+
+
+class _CategoryEntry:
+    def __init__(self, dir_mtime):
+        self.dir_mtime = dir_mtime
+        self.logo = None
+        self.logo_loaded = False
+        self.desc = {}  # lang -> (path, mtime, text)
+
+
+class CategoryAssets:
+    def __init__(self, base_dir: str, variant_widths=LOGO_VARIANT_WIDTHS):
+        self.base_dir = base_dir
+        self.variant_widths = variant_widths
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def category_dir(self, category: str) -> str:
+        return os.path.join(self.base_dir, category)
+
+    def logo(self, category: str):
+        """카테고리 로고(LogoAsset) 반환, 없으면 None"""
+        entry = self._entry(category)
+        if entry is None:
+            return None
+        logo = entry.logo
+        if entry.logo_loaded and (logo is None or _mtime(logo.path) == logo.mtime):
+            return logo
+
+        path = self._find_logo(category)
+        logo = None
+        if path:
+            with open(path, "rb") as f:
+                logo = LogoAsset(path, f.read(), self.variant_widths)
+        with self._lock:
+            entry.logo, entry.logo_loaded = logo, True
+        return logo
+
+    def desc_template(self, category: str, lang: str = "ko") -> str:
+        """desc_{lang}.md (없으면 desc.md) 내용 반환, 둘 다 없으면 빈 문자열"""
+        entry = self._entry(category)
+        if entry is None:
+            return ""
+        cached = entry.desc.get(lang)
+        if cached and _mtime(cached[0]) == cached[1]:
+            return cached[2]
+
+        v_dir = self.category_dir(category)
+        path = os.path.join(v_dir, f"desc_{lang}.md")
+        if not os.path.exists(path):
+            path = os.path.join(v_dir, "desc.md")
+        text, mtime = "", None
+        if os.path.exists(path):
+            mtime = _mtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+        with self._lock:
+            entry.desc[lang] = (path, mtime, text)
+        return text
+
+    def invalidate(self, category: str = None):
+        """카테고리(없으면 전체) 캐시 삭제 (로고 교체 등 파일 변경 직후 호출)"""
+        with self._lock:
+            if category is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(category, None)
+
+    def _entry(self, category):
+        """디렉토리 mtime이 그대로면 기존 항목, 바뀌었으면(파일 추가/삭제) 새 항목 반환"""
+        dir_mtime = _mtime(self.category_dir(category))
+        if dir_mtime is None:
+            self.invalidate(category)
+            return None
+        with self._lock:
+            entry = self._entries.get(category)
+            if entry is None or entry.dir_mtime != dir_mtime:
+                entry = _CategoryEntry(dir_mtime)
+                self._entries[category] = entry
+            return entry
+
+    def _find_logo(self, category):
+        v_dir = self.category_dir(category)
+        pngs = [f for f in os.listdir(v_dir) if f.lower().endswith('.png')]
+        logo_files = [f for f in pngs if 'logo' in f.lower()] or pngs
+        return os.path.join(v_dir, logo_files[0]) if logo_files else None
@@ -0,0 +1,124 @@
+"""
+위키 변환 단계별 결과 캐시 (내용 주소 기반, 로컬 디스크)
+같은 마크다운을 다시 올리면 Gemini를 다시 호출하지 않도록
+(단계, 입력 텍스트, 언어, 모델 ID, 프롬프트 버전, template_styles 등)의 해시를 키로 결과를 저장
+
+    CONVERSION_CACHE_DIR  캐시 디렉토리 (기본 web_app/scratch/conversion_cache)
+    CONVERSION_CACHE_MB   최대 크기, 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (기본 512, 0이면 사용 안 함)
+
+항목 하나가 파일 하나이며 조회 시 mtime을 갱신하여 LRU 순서를 유지하므로 여러 워커가 같은 디렉토리를 공유해도 됨
+"""
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(BASE_DIR, 'scratch', 'conversion_cache')
+
+
+class ConversionCache:
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or os.getenv("CONVERSION_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(os.getenv("CONVERSION_CACHE_MB", "512")) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self._size = None  # 현재 프로세스가 추정한 전체 크기 (처음 기록 시 디렉토리를 훑어 계산)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(stage: str, *parts) -> str:
+        """단계 이름과 입력 값들로 캐시 키(sha256) 생성"""
+        payload = json.dumps([stage, *parts], ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """저장된 바이트 반환 (없으면 None)"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # LRU 순서 갱신
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Conversion cache read failed: {e}")
+            return None
+
+    def put(self, key: str, data: bytes):
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 다른 워커가 읽는 중에도 깨진 파일이 보이지 않도록 임시 파일에 쓴 뒤 교체
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Conversion cache write failed: {e}")
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            over = self._size > self.max_bytes
+        if over:
+            self._evict()
+
+    def get_text(self, key: str):
+        data = self.get(key)
+        return data.decode("utf-8") if data is not None else None
+
+    def put_text(self, key: str, text: str):
+        self.put(key, text.encode("utf-8"))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _entries(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield st.st_mtime, st.st_size, path
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """최대 크기의 90%가 될 때까지 오래 사용하지 않은 항목부터 삭제"""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    total -= size
+            self._size = total
+            logger.info(f"Conversion cache evicted to {total} bytes")
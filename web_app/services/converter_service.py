@@ -1,31 +1,64 @@
 import os
 import re
-import io
-import shutil
+import asyncio
+import hashlib
+import html as html_lib
 import datetime
+import json
 import logging
-from PIL import Image
-from google import genai
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
+from core import executors, metrics, tracing, gemini_gateway, standins
 from .firebase_service import FirebaseService
+from .conversion_cache import ConversionCache
+from .markdown_sections import split_sections, section_hash
+from .markdown_renderer import render_markdown
+from .wiki_id_index import WikiIdIndex, unique_id
+from . import image_pipeline
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# HTML 변환 시 요약 이미지 자리 (이미지 생성과 HTML 변환을 동시에 실행하기 위해 나중에 치환)
+IMAGE_PLACEHOLDER = "<!--SUMMARY_IMAGE-->"
+
+# 단계별 프롬프트 버전 (프롬프트를 바꾸면 올려서 이전 캐시를 무효화)
+PROMPT_VERSIONS = {"id": 1, "title_en": 1, "summary_image": 1, "html": 1, "html_section": 1, "translate": 1}
+
+# 이보다 긴 문서는 제목(#, ##) 경계로 나눠 섹션별로 동시에 변환
+SECTION_SPLIT_CHARS = int(os.getenv("CONVERTER_SECTION_SPLIT_CHARS", "4000"))
+
+# 언어별 HTML 렌더러: llm (Gemini가 HTML 생성) / local (로컬 렌더러, 영문은 Gemini로 마크다운 번역만 수행)
+RENDERERS = {
+    "ko": os.getenv("CONVERTER_RENDERER_KO", "llm").lower(),
+    "en": os.getenv("CONVERTER_RENDERER_EN", "llm").lower(),
+}
+
 class ConverterService:
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
-        if self.api_key:
-            self.client = genai.Client(api_key=self.api_key)
+        if gemini_gateway.gateway.available:
+            # 공용 게이트웨이의 클라이언트 풀 사용 (호출은 gemini_gateway.generate_content로)
+            self.client = gemini_gateway.gateway.client(self.api_key)
             self.model_id = 'gemini-3-flash-preview'
             self.image_model_id = 'models/gemini-2.5-flash-image'
         else:
             self.client = None
             logger.error("GEMINI_API_KEY not found.")
         
-        self.firebase = FirebaseService()
+        self.firebase = standins.backend("firebase", FirebaseService, standins.FakeFirebase)
         self.template_styles = self._get_template_styles()
+        # 제목 -> wiki_id 로컬 인덱스 (조회 O(1), 새 ID는 트랜잭션으로 등록)
+        self.id_index = WikiIdIndex(self.firebase)
+        # 단계별 결과 캐시 (같은 입력을 다시 변환할 때 Gemini 호출 생략)
+        self.cache = ConversionCache()
+        # 문서 하나의 단계들과 여러 요청이 함께 쓰는 Gemini 동시 호출 한도
+        self._llm_slots = asyncio.Semaphore(int(os.getenv("CONVERTER_CONCURRENCY", "4")))
+
+    def warm_up(self):
+        """Gemini 클라이언트 상태 확인 (Firebase는 별도 의존성으로 워밍)"""
+        if not self.client:
+            raise RuntimeError("GEMINI_API_KEY not found")
 
     def _get_template_styles(self):
         """template.html에서 스타일 추출 (없으면 기본값)"""
@@ -47,11 +80,18 @@ class ConverterService:
             logger.warning(f"Could not read template styles: {e}")
         return ""
 
-    async def process_markdown(self, file_content: str, filename: str):
+    @tracing.traced()
+    async def process_markdown(self, file_content: str, filename: str, id_map: dict = None):
         """
         마크다운 내용을 받아 변환, 이미지 생성, 업로드까지 수행하는 메인 로직
         file_content: 마크다운 텍스트
         filename: 원본 파일명 (예: '2025 전망.md')
+        id_map: 여러 문서를 한꺼번에 처리할 때 호출자가 공유하는 ID 매핑 사본
+                (새 ID는 문서마다 등록한 뒤 이 dict에도 추가하여 같은 묶음의 다른 문서가 바로 보게 함)
+
+        단계 그래프로 실행: ID 결정만 선행 조건이며 영문 제목, 요약 이미지, KO/EN HTML 변환은 동시에 진행
+        (HTML에는 이미지 자리표시자를 넣어 두고 이미지 업로드가 끝나면 치환)
+        Gemini 동시 호출 수는 CONVERTER_CONCURRENCY로 제한
         """
         if not self.client:
             return {"status": "error", "message": "Gemini Client not initialized"}
@@ -59,72 +99,55 @@ class ConverterService:
         base_name = os.path.splitext(filename)[0]
         logger.info(f"Processing: {base_name}")
 
-        # 1. ID 결정 (매핑 확인)
-        id_map = self.firebase.get_id_map()
-        is_new_id = False
-        
-        if base_name in id_map:
-            wiki_id = id_map[base_name]
-            logger.info(f"Found existing ID: {wiki_id}")
-        else:
-            # 새 ID 생성
-            wiki_id = self._generate_id(base_name)
-            is_new_id = True
-            logger.info(f"Generated new ID: {wiki_id}")
-
-        # 2. 영문 제목 생성 (메타데이터용)
-        title_en = self._generate_english_title(base_name, wiki_id)
-
-        # 3. 요약 이미지 생성
-        # 임시 작업 디렉토리 생성
-        temp_dir = f"temp_{wiki_id}"
-        os.makedirs(temp_dir, exist_ok=True)
-        images_dir = os.path.join(temp_dir, "images")
-        os.makedirs(images_dir, exist_ok=True)
-
-        image_url = None
+        # 1. ID 결정 (매핑 확인)과 독립 단계 동시 시작
+        id_task = asyncio.create_task(self._resolve_id(base_name, id_map))
+        title_task = asyncio.create_task(self._call_llm(self._generate_english_title, base_name, None))
+        image_task = asyncio.create_task(self._summary_image_stage(file_content, id_task))
+        html_tasks = [asyncio.create_task(self._html_stage(file_content, lang, base_name)) for lang in ("ko", "en")]
+        tasks = [id_task, title_task, image_task] + html_tasks
+
         try:
-            image_path = self._generate_summary_image(file_content, wiki_id, images_dir)
-            if image_path:
-                # GCS 업로드
-                dest_path = f"wiki-images/{wiki_id}/{os.path.basename(image_path)}"
-                image_url = self.firebase.upload_image(image_path, dest_path)
-        except Exception as e:
-            logger.error(f"Image generation failed: {e}")
+            wiki_id, is_new_id, id_saved = await id_task
 
-        # 이미지 HTML 태그
-        image_html = ""
-        if image_url:
-            image_html = f'<div class="my-6 rounded-lg overflow-hidden border border-[#a2a9b1] shadow-sm"><img src="{image_url}" alt="Summary Image" class="w-full h-auto object-cover" style="aspect-ratio: 16/9;"></div>'
+            # 2. 영문 제목 (실패 시 ID 기반 기본값)
+            title_en = await title_task or wiki_id.replace("-", " ").title()
 
-        # 4. HTML 변환 (KO / EN)
-        html_ko = self._convert_to_html(file_content, "ko", image_html, wiki_id)
-        html_en = self._convert_to_html(file_content, "en", image_html, wiki_id)
+            # 3. 요약 이미지 (실패해도 이미지 없이 진행)
+            image = await image_task or {}
+            image_html = image.get("html", "")
+
+            # 4. HTML 변환 결과 (KO / EN): 섹션 단위로 변환했으면 골격에 조립한 뒤 이미지 삽입
+            titles = {"ko": base_name, "en": title_en}
+            html_ko, html_en = [
+                self._insert_image(self._assemble(lang, titles[lang], await task), image_html)
+                for lang, task in zip(("ko", "en"), html_tasks)
+            ]
+        finally:
+            # 오류로 빠져나온 경우 남은 단계 취소
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
         # 5. Firestore 저장
         current_date = datetime.date.today().isoformat()
-        success = self.firebase.save_wiki_content(
+        success = await executors.run_in(
+            executors.STORAGE, self.firebase.save_wiki_content,
             wiki_id=wiki_id,
             title_ko=base_name,
             title_en=title_en,
             last_updated=current_date,
             html_ko=html_ko,
             html_en=html_en,
-            thumbnail_url=image_url
+            thumbnail_url=image.get("thumbnail_url"),
+            social_image_url=image.get("social_url")
         )
 
-        # 6. ID 매핑 업데이트
-        if success and is_new_id:
-            id_map[base_name] = wiki_id
-            self.firebase.save_id_map(id_map)
-
-        # 7. 정리
-        shutil.rmtree(temp_dir, ignore_errors=True)
-
         if success:
             return {
                 "status": "success", 
                 "wiki_id": wiki_id, 
+                "new_id": is_new_id,
+                "id_saved": id_saved,
                 "link": f"https://tony.banya.ai/report/{wiki_id}",
                 "preview_html_ko": html_ko,
                 "preview_html_en": html_en
@@ -132,29 +155,199 @@ class ConverterService:
         else:
             return {"status": "error", "message": "Firestore save failed"}
 
+    async def _call_llm(self, fn, *args):
+        """Gemini 호출을 동시 실행 한도 안에서 LLM 풀로 실행"""
+        async with self._llm_slots:
+            return await executors.run_in(executors.LLM, fn, *args)
+
+    async def _html_stage(self, md_content, lang, base_name):
+        """
+        HTML 변환 단계
+        긴 문서는 제목 경계로 나눈 섹션들을 동시에 변환하여 섹션 HTML 목록을 반환하고 (섹션별로 캐시되므로
+        다시 올릴 때는 바뀐 섹션만 재생성), 짧거나 제목이 없는 문서는 기존처럼 한 번에 변환한 문서 전체를 반환
+        """
+        sections = split_sections(md_content)
+        if RENDERERS.get(lang) == "local":
+            return await self._local_html_stage(md_content, sections, lang)
+        if len(md_content) < SECTION_SPLIT_CHARS or len(sections) < 2:
+            return await self._call_llm(self._convert_to_html, md_content, lang, IMAGE_PLACEHOLDER, base_name)
+        return list(await asyncio.gather(*[
+            self._call_llm(self._convert_section, section, lang) for section in sections
+        ]))
+
+    async def _local_html_stage(self, md_content, sections, lang):
+        """로컬 렌더러 경로: 한국어는 네트워크 없이 바로 렌더링, 영문은 섹션별 번역(캐시) 후 렌더링"""
+        if lang != "ko":
+            if len(md_content) < SECTION_SPLIT_CHARS or len(sections) < 2:
+                sections = [md_content]
+            translated = await asyncio.gather(*[
+                self._call_llm(self._translate_markdown, section, lang) for section in sections
+            ])
+            md_content = "\n\n".join(translated)
+        return [await executors.run_in(executors.CPU, self._render_local, md_content)]
+
+    @tracing.traced()
+    def _render_local(self, md_content):
+        return self._post_process_math_spacing(render_markdown(md_content))
+
+    def _assemble(self, lang, title, converted):
+        """섹션 HTML 목록이면 문서 골격에 조립, 이미 완성된 문서면 그대로 반환"""
+        if isinstance(converted, str):
+            return converted
+        return self._build_article(lang, title, "\n".join(converted))
+
+    def _build_article(self, lang, title, body_html):
+        """LLM 전체 변환과 같은 <article class="wiki-content ..."> 구조의 HTML 문서"""
+        title = html_lib.escape(title or "")
+        return f"""<!DOCTYPE html>
+<html lang="{lang}">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>{title}</title>
+</head>
+<body>
+<article class="wiki-content max-w-4xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
+    <div class="flex flex-col sm:flex-row justify-between items-start border-b border-[#a2a9b1] pb-2 mb-6">
+       <h1 class="text-2xl sm:text-3xl font-sans font-bold text-[#000] leading-tight">{title}</h1>
+    </div>
+    {IMAGE_PLACEHOLDER}
+    <div class="wiki-html-content prose prose-slate max-w-none text-[#202122] leading-relaxed overflow-x-hidden">
+       <style>{self.template_styles}</style>
+{body_html}
+    </div>
+</article>
+</body>
+</html>"""
+
+    async def generate_id(self, base_name):
+        """제목으로 새 ID 후보 생성 (등록은 하지 않음, 일괄 가져오기가 묶음 단위로 등록)"""
+        return await self._call_llm(self._generate_id, base_name)
+
+    async def _resolve_id(self, base_name, id_map=None):
+        """
+        (wiki_id, is_new_id, id_saved) 반환: 매핑에 있으면 기존 ID, 없으면 새로 생성
+        새 ID는 콘텐츠 저장 전에 문서마다 인덱스에 등록하므로 동시에 게시해도 다른 문서의 ID를 덮어쓰지 않음
+        (id_saved: 새 ID를 Firestore에 등록했는지, 실패하면 이 프로세스의 인덱스에만 있음)
+        """
+        if id_map is None:
+            wiki_id = await executors.run_in(executors.STORAGE, self.id_index.lookup, base_name)
+        else:
+            wiki_id = id_map.get(base_name)
+        if wiki_id:
+            logger.info(f"Found existing ID: {wiki_id}")
+            return wiki_id, False, True
+
+        generated = await self.generate_id(base_name)
+        if id_map is not None:
+            # 공유 매핑으로 같은 묶음 안의 문서끼리 겹치는 후보를 먼저 피함
+            generated = unique_id(generated, set(id_map.values()))
+        claimed = await executors.run_in(executors.STORAGE, self.id_index.claim_many, {base_name: generated})
+        wiki_id = claimed[base_name] if claimed else generated
+        if id_map is not None:
+            id_map[base_name] = wiki_id
+        logger.info(f"Generated new ID: {wiki_id}")
+        return wiki_id, True, claimed is not None
+
+    async def _summary_image_stage(self, file_content, id_task):
+        """
+        요약 이미지를 생성하고 ID가 정해지면 반응형 이미지들을 GCS에 업로드 (실패 시 None)
+        반환: {"html": <picture> 태그, "thumbnail_url": JPEG 폴백 URL, "social_url": LinkedIn용 URL}
+        """
+        try:
+            raw = await self._call_llm(self._generate_summary_image, file_content)
+            if not raw:
+                return None
+            wiki_id = (await id_task)[0]
+            prefix = f"wiki-images/{wiki_id}/{wiki_id}_summary"
+
+            # 같은 이미지를 같은 위치에 이미 올렸으면 인코딩/업로드 생략
+            cache_key = self.cache.key(
+                "summary_upload", hashlib.sha256(raw).hexdigest(), prefix,
+                image_pipeline.SUMMARY_IMAGE_WIDTHS, image_pipeline.SUMMARY_IMAGE_FORMATS
+            )
+            cached = self.cache.get_text(cache_key)
+            if cached:
+                return json.loads(cached)
+
+            renditions = await executors.run_in(executors.CPU, image_pipeline.build_renditions, raw)
+            uploaded = await asyncio.gather(*[
+                executors.run_in(
+                    executors.STORAGE, self.firebase.upload_bytes, r.data,
+                    image_pipeline.rendition_path(prefix, raw, r), r.content_type,
+                    image_pipeline.IMMUTABLE_CACHE_CONTROL
+                )
+                for r in renditions
+            ])
+            urls = {r.name: url for r, url in zip(renditions, uploaded) if url}
+            if "fallback.jpg" not in urls:
+                return None
+            image = {
+                "html": image_pipeline.picture_html(renditions, urls),
+                "thumbnail_url": urls["fallback.jpg"],
+                "social_url": urls.get("social.jpg"),
+            }
+            if len(urls) == len(renditions):
+                self.cache.put_text(cache_key, json.dumps(image))
+            return image
+        except Exception as e:
+            logger.error(f"Image generation failed: {e}")
+            return None
+
+    @staticmethod
+    def _insert_image(html, image_html):
+        """HTML의 이미지 자리표시자를 실제 이미지 태그로 치환 (자리표시자가 사라졌으면 본문 앞에 삽입)"""
+        if IMAGE_PLACEHOLDER in html:
+            return html.replace(IMAGE_PLACEHOLDER, image_html)
+        if not image_html:
+            return html
+        marker = html.find('<div class="wiki-html-content')
+        if marker == -1:
+            return html
+        return html[:marker] + image_html + html[marker:]
+
+    @tracing.traced()
     def _generate_id(self, base_name):
+        cache_key = self.cache.key("id", PROMPT_VERSIONS["id"], self.model_id, base_name)
+        cached = self.cache.get_text(cache_key)
+        if cached:
+            return cached
         try:
             prompt = f"Translate this title into a concise, professional English filename (no extension, lowercase, use hyphens for spaces): {base_name}"
-            response = self.client.models.generate_content(model=self.model_id, contents=prompt)
+            response = gemini_gateway.generate_content(self.model_id, prompt, purpose="wiki_id")
             translated = response.text.strip().lower().replace(" ", "-")
-            return re.sub(r'[^\w\-_\.]', '', translated)
+            wiki_id = re.sub(r'[^\w\-_\.]', '', translated)
+            self.cache.put_text(cache_key, wiki_id)
+            return wiki_id
         except:
             return f"wiki-{datetime.date.today().isoformat()}"
 
+    @tracing.traced()
     def _generate_english_title(self, base_name, default_id):
+        cache_key = self.cache.key("title_en", PROMPT_VERSIONS["title_en"], self.model_id, base_name)
+        cached = self.cache.get_text(cache_key)
+        if cached:
+            return cached
         try:
             prompt = f"Translate this title into a natural, professional English title (Capitalized Case, no special chars): {base_name}. STRICT: Return ONLY the title."
-            response = self.client.models.generate_content(model=self.model_id, contents=prompt)
-            return response.text.strip().replace('"', '')
+            response = gemini_gateway.generate_content(self.model_id, prompt, purpose="title_en")
+            title = response.text.strip().replace('"', '')
+            self.cache.put_text(cache_key, title)
+            return title
         except:
-            return default_id.replace("-", " ").title()
+            # default_id가 없으면 None을 반환하여 호출자가 ID 확정 후 기본값을 정하도록 함
+            return default_id.replace("-", " ").title() if default_id else None
 
-    def _generate_summary_image(self, content, base_name, output_dir):
-        # (기존 md_to_html_converter의 _generate_summary_image 로직을 여기에 구현)
-        # 간소화를 위해 핵심 로직만 복사 (프롬프트 생성 -> 이미지 생성 -> 저장)
+    @tracing.traced()
+    def _generate_summary_image(self, content):
+        """요약 이미지 원본 바이트 반환 (16:9 자르기/인코딩은 image_pipeline에서 수행, 실패 시 None)"""
+        cache_key = self.cache.key("summary_image", PROMPT_VERSIONS["summary_image"], self.image_model_id, content[:500])
+        cached = self.cache.get(cache_key)
+        if cached:
+            return cached
         try:
             visual_prompt = f"Create a professional, high-resolution 16:9 technical illustration with NO TEXT based on: {content[:500]}"
-            response = self.client.models.generate_content(model=self.image_model_id, contents=visual_prompt)
+            response = gemini_gateway.generate_content(self.image_model_id, visual_prompt, purpose="summary_image")
             
             image_data = None
             if response.candidates:
@@ -165,18 +358,21 @@ class ConverterService:
                             break
             
             if image_data:
-                img = Image.open(io.BytesIO(image_data))
-                # Crop logic (omitted for brevity, can add back if needed)
-                filename = f"{base_name}_summary.png"
-                path = os.path.join(output_dir, filename)
-                img.save(path, format='PNG')
-                return path
+                self.cache.put(cache_key, image_data)
+                return image_data
         except Exception as e:
             logger.error(f"Image gen error: {e}")
         return None
 
+    @tracing.traced()
     def _convert_to_html(self, md_content, lang, image_html, title_ph):
         # (기존 convert_file 내부의 프롬프트 로직 재사용)
+        cache_key = self.cache.key(
+            "html", PROMPT_VERSIONS["html"], self.model_id, lang, image_html, self.template_styles, md_content
+        )
+        cached = self.cache.get_text(cache_key)
+        if cached:
+            return cached
         lang_label = "Korean" if lang == "ko" else "English"
         trans_instruction = "IMPORTANT: First, translate the entire content into natural, professional technical English." if lang == "en" else ""
         
@@ -201,6 +397,7 @@ class ConverterService:
             </div>
         </article>
         
+        [Placeholder] If the structure contains the HTML comment {IMAGE_PLACEHOLDER}, keep it exactly where it is.
         [MathJax] Preserve $...$ and $$...$$. Ensure formulas are responsive.
         [Output] Return a COMPLETE, valid HTML5 document. No markdown fences.
         
@@ -208,12 +405,84 @@ class ConverterService:
         {md_content}
         """
         try:
-            res = self.client.models.generate_content(model=self.model_id, contents=prompt)
+            res = gemini_gateway.generate_content(self.model_id, prompt, purpose=f"html_{lang}")
             html = res.text.strip().replace("```html", "").replace("```", "")
-            return self._post_process_math_spacing(html)
+            html = self._post_process_math_spacing(html)
+            self.cache.put_text(cache_key, html)
+            return html
         except:
             return "<div>Error generating HTML</div>"
 
+    @tracing.traced()
+    def _convert_section(self, section_md, lang):
+        """마크다운 섹션 하나를 HTML 조각으로 변환 (섹션 해시로 캐시, 실패 시 원문을 그대로 보여주는 조각)"""
+        cache_key = self.cache.key(
+            "html_section", PROMPT_VERSIONS["html_section"], self.model_id, lang, section_hash(section_md)
+        )
+        cached = self.cache.get_text(cache_key)
+        if cached:
+            return cached
+
+        lang_label = "Korean" if lang == "ko" else "English"
+        trans_instruction = "IMPORTANT: First, translate this section into natural, professional technical English." if lang == "en" else ""
+        prompt = f"""
+        You are an expert web developer. {trans_instruction}
+        Convert the following Markdown SECTION (one part of a longer document) to an HTML fragment in {lang_label}.
+
+        [Rules]
+        1. Return ONLY the HTML fragment for this section. Do NOT include <!DOCTYPE>, <html>, <head>, <body>, <article> or <style>.
+        2. Keep the heading levels of the section (# -> h1, ## -> h2, ...).
+        3. Use Tailwind CSS classes for a responsive layout.
+
+        [MathJax] Preserve $...$ and $$...$$. Ensure formulas are responsive.
+        [Output] No markdown fences.
+
+        Section:
+        {section_md}
+        """
+        try:
+            res = gemini_gateway.generate_content(self.model_id, prompt, purpose=f"html_section_{lang}")
+            fragment = res.text.strip().replace("```html", "").replace("```", "")
+            fragment = self._post_process_math_spacing(fragment)
+            self.cache.put_text(cache_key, fragment)
+            return fragment
+        except Exception as e:
+            logger.error(f"Section conversion failed: {e}")
+            return f'<pre class="whitespace-pre-wrap">{html_lib.escape(section_md)}</pre>'
+
+    @tracing.traced()
+    def _translate_markdown(self, md_content, lang):
+        """마크다운을 대상 언어의 마크다운으로 번역 (로컬 렌더러용, 실패 시 원문 반환)"""
+        cache_key = self.cache.key(
+            "translate", PROMPT_VERSIONS["translate"], self.model_id, lang, section_hash(md_content)
+        )
+        cached = self.cache.get_text(cache_key)
+        if cached:
+            return cached
+
+        prompt = f"""
+        Translate the following Markdown into natural, professional technical English.
+
+        [Rules]
+        1. Return ONLY the translated Markdown. Keep the Markdown structure exactly (headings, lists, tables, links, images).
+        2. Do NOT translate code blocks, inline code, URLs or MathJax ($...$, $$...$$).
+        [Output] No surrounding markdown fences.
+
+        Markdown:
+        {md_content}
+        """
+        try:
+            res = gemini_gateway.generate_content(self.model_id, prompt, purpose=f"translate_{lang}")
+            translated = res.text.strip()
+            fenced = re.fullmatch(r'```(?:markdown|md)?\s*\n(.*?)\n```', translated, re.DOTALL)
+            if fenced:
+                translated = fenced.group(1)
+            self.cache.put_text(cache_key, translated)
+            return translated
+        except Exception as e:
+            logger.error(f"Translation failed: {e}")
+            return md_content
+
     def _post_process_math_spacing(self, html_content):
         # (기존 로직 복사)
         html_content = re.sub(r'<(p|div|span)[^>]*>\s*(\$[^\$]+\$)\s*</\1>', r' \2 ', html_content)
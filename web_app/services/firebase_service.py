@@ -1,19 +1,24 @@
 import os
 import glob
 import json
+import hashlib
 import tempfile
 import mimetypes
+import threading
 from bs4 import BeautifulSoup
 from google.cloud import storage, firestore
 from google.oauth2 import service_account
+from core import metrics, tracing
 
 class FirebaseService:
     _instance = None
+    _instance_lock = threading.Lock()
     
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(FirebaseService, cls).__new__(cls)
-            cls._instance._initialized = False
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(FirebaseService, cls).__new__(cls)
+                cls._instance._initialized = False
         return cls._instance
 
     def __init__(self):
@@ -25,11 +30,36 @@ class FirebaseService:
         self.image_project_id = 'banya2025'
         self.firestore_project_id = 'tonys-tech-note'
         
-        self.db = None
-        self.bucket = None
-        self._initialize_clients()
+        # 클라이언트는 처음 사용할 때(또는 백그라운드 워밍 시) 초기화
+        self._db = None
+        self._bucket = None
+        self._clients_ready = False
+        self._clients_lock = threading.Lock()
         self._initialized = True
 
+    @property
+    def db(self):
+        self._ensure_clients()
+        return self._db
+
+    @property
+    def bucket(self):
+        self._ensure_clients()
+        return self._bucket
+
+    def _ensure_clients(self):
+        if self._clients_ready:
+            return
+        with self._clients_lock:
+            if not self._clients_ready:
+                self._initialize_clients()
+                self._clients_ready = True
+
+    def warm_up(self):
+        """클라이언트를 미리 초기화 (실패 시 예외로 상태 보고)"""
+        if self.db is None or self.bucket is None:
+            raise RuntimeError("Firebase credentials not available")
+
     def _initialize_clients(self):
         """Firestore 및 Storage 클라이언트를 초기화합니다."""
         environment = os.getenv("ENVIRONMENT", "development").lower()
@@ -62,39 +92,132 @@ class FirebaseService:
                 print(f"✅ [{environment.upper()}] Firebase credentials loaded from local file")
             
             # Firestore (기본 프로젝트 사용)
-            self.db = firestore.Client(credentials=credentials)
+            self._db = firestore.Client(credentials=credentials)
             
             # Storage (이미지 호스팅용 프로젝트 명시)
             storage_client = storage.Client(credentials=credentials, project=self.image_project_id)
-            self.bucket = storage_client.bucket(self.image_bucket_name)
+            self._bucket = storage_client.bucket(self.image_bucket_name)
             
             print("✅ Firebase/GCS Clients Initialized")
         except Exception as e:
             print(f"❌ Firebase Initialization Failed: {e}")
 
+    @tracing.traced()
     def get_id_map(self):
-        """Firestore에서 ID 매핑 정보를 가져옵니다."""
+        """
+        Firestore에서 ID 매핑 정보를 가져옵니다.
+        (wiki-id-map 집계 문서와 제목별 등록 문서(wiki-title-claims)를 합침, 집계 문서에 아직 반영되지 않은 등록도 포함)
+        """
         if not self.db:
             return {}
         try:
             doc_ref = self.db.collection('system-metadata').document('wiki-id-map')
-            doc = doc_ref.get()
-            return doc.to_dict() if doc.exists else {}
+            with metrics.track_call("firestore", "get"):
+                doc = doc_ref.get()
+            id_map = doc.to_dict() if doc.exists else {}
+            with metrics.track_call("firestore", "query"):
+                for claim in self.db.collection('wiki-title-claims').stream():
+                    entry = claim.to_dict()
+                    id_map[entry['title']] = entry['wiki_id']
+            return id_map
         except Exception as e:
             print(f"⚠️ Failed to fetch ID map: {e}")
             return {}
 
+    @tracing.traced()
     def save_id_map(self, id_map):
-        """ID 매핑 정보를 Firestore에 저장합니다."""
+        """
+        ID 매핑 집계 문서(wiki-id-map)에 기록합니다. (merge이므로 새 항목만 넘겨도 됨, 성공 여부 반환)
+        등록(claim_ids) 트랜잭션 밖에서 호출하므로 한 문서에 등록이 몰리지 않음
+        """
         if not self.db:
-            return
+            return False
         try:
             doc_ref = self.db.collection('system-metadata').document('wiki-id-map')
-            doc_ref.set(id_map, merge=True)
+            with metrics.track_call("firestore", "set"):
+                doc_ref.set(id_map, merge=True)
             print("✅ ID map updated.")
+            return True
         except Exception as e:
             print(f"⚠️ Failed to save ID map: {e}")
+            return False
+
+    @staticmethod
+    def _title_key(title):
+        return hashlib.sha256(title.encode('utf-8')).hexdigest()
+
+    @tracing.traced()
+    def claim_ids(self, mapping):
+        """
+        {제목: ID}를 트랜잭션으로 등록
+        ID별(wiki-id-claims/<ID>), 제목별(wiki-title-claims/<제목 해시>) 문서만 읽고 만들므로
+        서로 다른 제목/ID를 등록하는 게시끼리는 같은 문서를 두고 경합하지 않음
+        (wiki-id-map 집계 문서는 트랜잭션 밖에서 save_id_map으로 따로 갱신)
+        이미 등록된 제목은 기존 ID 유지, 다른 제목이 쓰고 있는 ID는 None으로 반환
+
+        Returns:
+            {제목: 확정 ID 또는 None} / Firestore를 쓸 수 없으면 None
+        """
+        if not self.db:
+            return None
+        id_claims = self.db.collection('wiki-id-claims')
+        title_claims = self.db.collection('wiki-title-claims')
+
+        @firestore.transactional
+        def claim(transaction):
+            refs = [title_claims.document(self._title_key(title)) for title in mapping]
+            refs += [id_claims.document(wiki_id) for wiki_id in set(mapping.values())]
+            existing = {
+                (doc.reference.parent.id, doc.id): doc.to_dict()
+                for doc in self.db.get_all(refs, transaction=transaction) if doc.exists
+            }
+            resolved, new_entries = {}, {}
+            for title, wiki_id in mapping.items():
+                by_title = existing.get(('wiki-title-claims', self._title_key(title)))
+                owner = existing.get(('wiki-id-claims', wiki_id))
+                if by_title:
+                    resolved[title] = by_title['wiki_id']
+                elif owner and owner.get('title') != title:
+                    resolved[title] = None
+                else:
+                    resolved[title] = new_entries[title] = wiki_id
+                    existing[('wiki-id-claims', wiki_id)] = {'title': title}
+            for title, wiki_id in new_entries.items():
+                transaction.set(title_claims.document(self._title_key(title)), {'title': title, 'wiki_id': wiki_id})
+                transaction.set(id_claims.document(wiki_id), {'title': title})
+            return resolved
+
+        try:
+            with metrics.track_call("firestore", "transaction"):
+                return claim(self.db.transaction())
+        except Exception as e:
+            print(f"⚠️ Failed to claim wiki IDs: {e}")
+            return None
+
+    def watch_id_map(self, callback):
+        """
+        제목별 등록 문서의 추가/변경을 실시간 구독하여 callback({제목: ID}, 바뀐 항목만) 호출, 구독 객체 반환 (불가하면 None)
+        첫 콜백은 현재 등록된 전체 항목
+        """
+        if not self.db:
+            return None
 
+        def on_snapshot(docs, changes, read_time):
+            changed = {}
+            for change in changes:
+                if change.type.name in ("ADDED", "MODIFIED"):
+                    entry = change.document.to_dict()
+                    changed[entry['title']] = entry['wiki_id']
+            if changed:
+                callback(changed)
+
+        try:
+            return self.db.collection('wiki-title-claims').on_snapshot(on_snapshot)
+        except Exception as e:
+            print(f"⚠️ Failed to watch ID map: {e}")
+            return None
+
+    @tracing.traced()
     def upload_image(self, local_path, destination_path):
         """이미지를 GCS에 업로드하고 Public URL을 반환합니다."""
         if not self.bucket or not os.path.exists(local_path):
@@ -106,7 +229,8 @@ class FirebaseService:
             blob.content_type = mime_type
 
         try:
-            blob.upload_from_filename(local_path)
+            with metrics.track_call("gcs", "upload_image"):
+                blob.upload_from_filename(local_path)
             # Public Access Prevention 정책이 있을 수 있으므로 실패해도 무시
             try: blob.make_public() 
             except: pass
@@ -117,7 +241,43 @@ class FirebaseService:
             print(f"❌ Image upload failed: {e}")
             return None
 
-    def save_wiki_content(self, wiki_id, title_ko, title_en, last_updated, html_ko, html_en, thumbnail_url):
+    @tracing.traced()
+    def upload_bytes(self, data, destination_path, content_type, cache_control=None):
+        """메모리의 바이트를 임시 파일 없이 GCS에 업로드하고 Public URL을 반환합니다."""
+        if not self.bucket:
+            return None
+
+        blob = self.bucket.blob(destination_path)
+        if cache_control:
+            blob.cache_control = cache_control
+
+        try:
+            with metrics.track_call("gcs", "upload_bytes"):
+                blob.upload_from_string(data, content_type=content_type)
+            try: blob.make_public()
+            except: pass
+
+            return f"https://storage.googleapis.com/{self.image_bucket_name}/{destination_path}"
+        except Exception as e:
+            print(f"❌ Image upload failed: {e}")
+            return None
+
+    @tracing.traced()
+    def get_wiki_content(self, wiki_id):
+        """위키 문서 데이터를 반환합니다. (없거나 읽을 수 없으면 None)"""
+        if not self.db:
+            return None
+        try:
+            with metrics.track_call("firestore", "get"):
+                doc = self.db.collection('static-wiki').document(wiki_id).get()
+            return doc.to_dict() if doc.exists else None
+        except Exception as e:
+            print(f"⚠️ Failed to fetch wiki content: {e}")
+            return None
+
+    @tracing.traced()
+    def save_wiki_content(self, wiki_id, title_ko, title_en, last_updated, html_ko, html_en, thumbnail_url,
+                          social_image_url=None):
         """변환된 위키 콘텐츠를 Firestore에 저장합니다."""
         if not self.db:
             return False
@@ -133,7 +293,10 @@ class FirebaseService:
                 'type': 'firestore-content',
                 'createdAt': firestore.SERVER_TIMESTAMP
             }
-            doc_ref.set(doc_data, merge=True)
+            if social_image_url:
+                doc_data['socialImageUrl'] = social_image_url
+            with metrics.track_call("firestore", "set"):
+                doc_ref.set(doc_data, merge=True)
             return True
         except Exception as e:
             print(f"❌ Firestore save failed: {e}")
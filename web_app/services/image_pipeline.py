@@ -0,0 +1,144 @@
+"""
+위키 요약 이미지 처리 (메모리 안에서만 처리, 임시 파일 없음)
+Gemini가 만든 원본 이미지를 16:9로 자른 뒤
+
+    - 반응형 가로 크기(SUMMARY_IMAGE_WIDTHS)별 AVIF / WebP (SUMMARY_IMAGE_FORMATS)
+    - <picture>를 지원하지 않는 환경과 thumbnailUrl용 JPEG
+    - LinkedIn 공유용 1200x627 JPEG
+
+를 만들고, 본문에는 srcset이 들어간 <picture> 태그를 사용
+파일명에 내용 해시가 들어가므로 GCS에는 1년 immutable 캐시로 올림
+"""
+import io
+import os
+import hashlib
+import logging
+from dataclasses import dataclass
+from PIL import Image, features
+from dotenv import load_dotenv
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+SUMMARY_IMAGE_WIDTHS = tuple(
+    int(w) for w in os.getenv("SUMMARY_IMAGE_WIDTHS", "480,960,1600").split(",") if w.strip()
+)
+SUMMARY_IMAGE_FORMATS = tuple(
+    f.strip().lower() for f in os.getenv("SUMMARY_IMAGE_FORMATS", "avif,webp").split(",") if f.strip()
+)
+# LinkedIn 링크 공유 이미지 권장 크기 (1.91:1)
+SOCIAL_IMAGE_SIZE = (1200, 627)
+# AVIF/WebP를 지원하지 않는 환경과 썸네일용 JPEG 최대 가로 크기
+FALLBACK_MAX_WIDTH = 960
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# 본문 폭(max-w-4xl, 좌우 여백 제외) 기준 표시 크기
+PICTURE_SIZES = "(min-width: 896px) 832px, 100vw"
+
+_ENCODERS = {
+    "avif": ("AVIF", "image/avif", {"quality": 60, "speed": 6}),
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", "image/jpeg", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+
+def _supported(fmt):
+    """설치된 Pillow가 인코딩할 수 있는 형식인지 (AVIF는 Pillow 11.3부터 내장)"""
+    try:
+        return fmt in _ENCODERS and bool(features.check(fmt))
+    except ValueError:
+        return False
+
+
+# 인코딩할 수 없는 형식은 빼고 나머지로 진행 (<picture>는 남은 형식과 JPEG 폴백으로 구성)
+_unsupported = [fmt for fmt in SUMMARY_IMAGE_FORMATS if not _supported(fmt)]
+if _unsupported:
+    logger.warning(f"Skipping summary image formats not supported by this Pillow build: {', '.join(_unsupported)}")
+    SUMMARY_IMAGE_FORMATS = tuple(fmt for fmt in SUMMARY_IMAGE_FORMATS if fmt not in _unsupported)
+
+
+@dataclass
+class Rendition:
+    name: str  # 파일명 접미사 (예: 960.webp, social.jpg)
+    data: bytes
+    content_type: str
+    width: int
+    height: int
+    format: str
+
+
+def crop_to_ratio(img: Image.Image, ratio: float = 16 / 9) -> Image.Image:
+    """가운데를 기준으로 가로:세로 비율에 맞춰 자름"""
+    width, height = img.size
+    if width / height > ratio:
+        new_width = round(height * ratio)
+        left = (width - new_width) // 2
+        return img.crop((left, 0, left + new_width, height))
+    new_height = round(width / ratio)
+    top = (height - new_height) // 2
+    return img.crop((0, top, width, top + new_height))
+
+
+def _encode(img: Image.Image, fmt: str) -> bytes:
+    pil_format, _, options = _ENCODERS[fmt]
+    out = io.BytesIO()
+    img.save(out, format=pil_format, **options)
+    return out.getvalue()
+
+
+def _resize(img: Image.Image, width: int, height: int = None) -> Image.Image:
+    height = height or round(img.height * width / img.width)
+    if (width, height) == img.size:
+        return img
+    return img.resize((width, height), Image.LANCZOS)
+
+
+def build_renditions(raw: bytes):
+    """원본 이미지 바이트로 반응형/폴백/LinkedIn 이미지 목록 생성 (CPU 작업이므로 CPU 풀에서 호출)"""
+    with Image.open(io.BytesIO(raw)) as src:
+        img = crop_to_ratio(src.convert("RGB"))
+
+    # 원본보다 큰 크기는 원본 크기로 (확대하지 않음)
+    widths = sorted({min(w, img.width) for w in SUMMARY_IMAGE_WIDTHS} or {img.width})
+    renditions = []
+    for width in widths:
+        scaled = _resize(img, width)
+        for fmt in SUMMARY_IMAGE_FORMATS:
+            if fmt not in _ENCODERS:
+                continue
+            renditions.append(Rendition(
+                f"{width}.{fmt}", _encode(scaled, fmt), _ENCODERS[fmt][1], scaled.width, scaled.height, fmt
+            ))
+
+    fallback = _resize(img, min(widths[-1], FALLBACK_MAX_WIDTH))
+    renditions.append(Rendition(
+        "fallback.jpg", _encode(fallback, "jpg"), "image/jpeg", fallback.width, fallback.height, "fallback"
+    ))
+    social = _resize(crop_to_ratio(img, SOCIAL_IMAGE_SIZE[0] / SOCIAL_IMAGE_SIZE[1]), *SOCIAL_IMAGE_SIZE)
+    renditions.append(Rendition(
+        "social.jpg", _encode(social, "jpg"), "image/jpeg", social.width, social.height, "social"
+    ))
+    return renditions
+
+
+def rendition_path(prefix: str, raw: bytes, rendition: Rendition) -> str:
+    """원본 해시가 들어간 GCS 경로 (예: wiki-images/id/id_summary.3f2a1b9c0d1e-960.webp)"""
+    return f"{prefix}.{hashlib.sha256(raw).hexdigest()[:12]}-{rendition.name}"
+
+
+def picture_html(renditions, urls) -> str:
+    """srcset이 들어간 <picture> 태그 (urls: 파일명 접미사 -> URL)"""
+    sources = []
+    for fmt in SUMMARY_IMAGE_FORMATS:
+        items = [r for r in renditions if r.format == fmt and r.name in urls]
+        if items:
+            srcset = ", ".join(f"{urls[r.name]} {r.width}w" for r in items)
+            sources.append(f'<source type="{items[0].content_type}" srcset="{srcset}" sizes="{PICTURE_SIZES}">')
+    fallback = next(r for r in renditions if r.format == "fallback")
+    return (
+        '<div class="my-6 rounded-lg overflow-hidden border border-[#a2a9b1] shadow-sm"><picture>'
+        + "".join(sources)
+        + f'<img src="{urls[fallback.name]}" width="{fallback.width}" height="{fallback.height}" alt="Summary Image"'
+          ' class="w-full h-auto object-cover" style="aspect-ratio: 16/9;" decoding="async">'
+        + "</picture></div>"
+    )
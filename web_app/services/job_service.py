@@ -0,0 +1,311 @@
+"""
+백그라운드 작업(Job) 관리 서비스
+영상 편집/업로드처럼 수 분이 걸리는 파이프라인을 HTTP 요청 밖의 제한된 워커 풀에서 실행하고,
+진행 상태를 DB(jobs 테이블)에 기록하여 어느 uvicorn 워커에서든 조회할 수 있게 함
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from core import database, models, metrics, executors, gemini_gateway
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 작업별 임시 작업 디렉토리 (원본/중간 산출물 저장)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SCRATCH_DIR = os.path.join(BASE_DIR, 'scratch', 'jobs')
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업 수가 한도를 넘은 경우"""
+
+
+class JobReporter:
+    """
+    파이프라인이 호출하는 진행 상황 콜백
+    reporter(stage, progress, **detail) 형태로 호출하면 jobs 테이블에 반영됨
+    ffmpeg 프레임/업로드 청크처럼 잦은 호출은 같은 단계 안에서 JOB_PROGRESS_INTERVAL초에 한 번만 기록
+    """
+
+    def __init__(self, manager, job_id, interval: float = None):
+        self.manager = manager
+        self.job_id = job_id
+        self.interval = interval if interval is not None else float(os.getenv("JOB_PROGRESS_INTERVAL", "0.5"))
+        self._stage = None
+        self._last = 0.0
+
+    def __call__(self, stage, progress=0.0, **detail):
+        now = time.monotonic()
+        if stage == self._stage and progress < 1.0 and now - self._last < self.interval:
+            return
+        self._stage = stage
+        self._last = now
+        self.manager._update(self.job_id, stage=stage, progress=progress, detail=detail)
+
+
+class JobManager:
+    """
+    제한된 크기의 스레드 풀에서 작업을 실행하고 상태를 DB에 기록
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None, scratch_dir: str = None):
+        self.max_workers = max_workers or int(os.getenv("JOB_WORKERS", "2"))
+        self.max_pending = max_pending or int(os.getenv("JOB_MAX_PENDING", "8"))
+        self.scratch_dir = scratch_dir or os.getenv("JOB_SCRATCH_DIR", DEFAULT_SCRATCH_DIR)
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def job_dir(self, job_id: str) -> str:
+        """작업 전용 임시 디렉토리 경로 (없으면 생성)"""
+        path = os.path.join(self.scratch_dir, job_id)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def new_job_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def reserve(self):
+        """
+        대기열 자리를 미리 확보 (되돌릴 수 없는 준비 작업 전에 호출)
+        이후 submit(..., reserved=True)로 등록하거나, 등록하지 못하면 release()로 반납
+
+        Raises:
+            JobQueueFull: 대기/실행 중인 작업이 한도를 넘은 경우
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_pending:
+                raise JobQueueFull("처리 대기 중인 작업이 너무 많습니다. 잠시 후 다시 시도해주세요.")
+            self._pending += 1
+
+    def release(self):
+        """reserve()로 확보했지만 등록하지 못한 자리 반납"""
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, kind: str, fn, *args, user_id: int = None, job_id: str = None, reserved: bool = False, **kwargs) -> str:
+        """
+        작업을 등록하고 즉시 job_id를 반환
+
+        fn은 progress=JobReporter 키워드 인자를 받아야 하며, 반환값(dict)이 작업 결과로 저장됨
+        reserved: reserve()로 자리를 이미 확보한 경우 (등록에 실패해도 자리는 호출자가 release()로 반납)
+
+        Raises:
+            JobQueueFull: 대기/실행 중인 작업이 한도를 넘은 경우
+        """
+        job_id = job_id or self.new_job_id()
+        if not reserved:
+            try:
+                self.reserve()
+            except JobQueueFull:
+                # 미리 만들어 둔 작업 디렉토리가 있으면 정리
+                shutil.rmtree(os.path.join(self.scratch_dir, job_id), ignore_errors=True)
+                raise
+
+        db = database.SessionLocal()
+        try:
+            db.add(models.Job(id=job_id, kind=kind, status="queued", owner=str(os.getpid()), user_id=user_id))
+            db.commit()
+        except Exception:
+            if not reserved:
+                self.release()
+            raise
+        finally:
+            db.close()
+
+        metrics.JOBS_QUEUED.labels(kind).inc()
+        self.executor.submit(self._run, job_id, kind, fn, args, kwargs)
+        logger.info(f"Job queued: {kind} ({job_id})")
+        return job_id
+
+    def get(self, job_id: str):
+        """작업 상태를 dict로 반환 (없으면 None)"""
+        db = database.SessionLocal()
+        try:
+            job = db.query(models.Job).filter(models.Job.id == job_id).first()
+            return self._as_dict(job) if job else None
+        finally:
+            db.close()
+
+    def get_many(self, job_ids):
+        """여러 작업 상태를 한 번의 쿼리로 조회하여 {job_id: dict} 반환 (없는 작업은 빠짐)"""
+        db = database.SessionLocal()
+        try:
+            rows = db.query(models.Job).filter(models.Job.id.in_(list(job_ids))).all()
+            return {job.id: self._as_dict(job) for job in rows}
+        finally:
+            db.close()
+
+    @staticmethod
+    def _as_dict(job):
+        return {
+            "job_id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "stage": job.stage,
+            "progress": job.progress,
+            "detail": json.loads(job.detail) if job.detail else {},
+            "result": json.loads(job.result) if job.result else None,
+            "error": job.error,
+            "user_id": job.user_id,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+        }
+
+    def recover_orphans(self):
+        """
+        종료된 워커 프로세스가 남긴 'queued'/'running' 작업을 오류 상태로 정리
+        (배포/재시작 시 영원히 진행 중으로 보이는 작업 방지)
+        """
+        db = database.SessionLocal()
+        try:
+            stale = db.query(models.Job).filter(models.Job.status.in_(["queued", "running"])).all()
+            for job in stale:
+                if job.owner and self._pid_alive(job.owner):
+                    continue
+                job.status = "error"
+                job.error = "서버 재시작으로 작업이 중단되었습니다. 다시 시도해주세요."
+            db.commit()
+        finally:
+            db.close()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _pid_alive(owner: str) -> bool:
+        try:
+            os.kill(int(owner), 0)
+            return True
+        except (ValueError, ProcessLookupError):
+            return False
+        except PermissionError:
+            return True
+
+    def _run(self, job_id, kind, fn, args, kwargs):
+        reporter = JobReporter(self, job_id)
+        metrics.JOBS_QUEUED.labels(kind).dec()
+        metrics.JOBS_IN_FLIGHT.labels(kind).inc()
+        try:
+            self._update(job_id, status="running")
+            # 백그라운드 작업의 Gemini 호출은 대화형 요청보다 낮은 우선순위
+            with gemini_gateway.priority(gemini_gateway.BATCH):
+                result = fn(*args, progress=reporter, **kwargs)
+            status = self._finish(job_id, status="success", progress=1.0, result=result)
+            metrics.JOBS_FINISHED.labels(kind, status).inc()
+            logger.info(f"Job finished: {job_id} ({status})")
+        except Exception as e:
+            logger.error(f"Job failed: {job_id}: {e}")
+            self._finish(job_id, status="error", error=str(e))
+            metrics.JOBS_FINISHED.labels(kind, "error").inc()
+        finally:
+            metrics.JOBS_IN_FLIGHT.labels(kind).dec()
+            with self._lock:
+                self._pending -= 1
+            shutil.rmtree(os.path.join(self.scratch_dir, job_id), ignore_errors=True)
+
+    def _finish(self, job_id, **fields) -> str:
+        """
+        종료 상태 기록 후 기록된 상태 반환
+        결과를 직렬화하거나 저장하지 못하면 작업이 'running'으로 남지 않도록 result/detail 없이 오류 상태로 다시 기록
+        """
+        try:
+            self._update(job_id, strict=True, **fields)
+            return fields["status"]
+        except Exception as e:
+            logger.error(f"Failed to record final state of job {job_id}: {e}")
+            self._update(job_id, status="error", error=f"작업 결과를 저장하지 못했습니다: {type(e).__name__}: {e}")
+            return "error"
+
+    def _update(self, job_id, status=None, stage=None, progress=None, detail=None, result=None, error=None,
+                strict=False):
+        """작업 행 갱신 (strict=False면 실패해도 경고만 남김, 진행률 보고용)"""
+        db = database.SessionLocal()
+        try:
+            job = db.query(models.Job).filter(models.Job.id == job_id).first()
+            if not job:
+                return
+            if status is not None:
+                job.status = status
+            if stage is not None:
+                job.stage = stage
+            if progress is not None:
+                job.progress = progress
+            if detail is not None:
+                job.detail = json.dumps(detail, ensure_ascii=False)
+            if result is not None:
+                job.result = json.dumps(result, ensure_ascii=False)
+            if error is not None:
+                job.error = error
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            if strict:
+                raise
+            logger.warning(f"Failed to update job {job_id}: {e}")
+        finally:
+            db.close()
+
+
+class JobWatcher:
+    """
+    진행 이벤트 스트림(SSE)용 프로세스당 하나의 작업 상태 폴러
+    연결마다 DB를 조회하는 대신 구독 중인 작업들을 SSE_POLL_SECONDS마다 한 번의 쿼리로 읽어 모든 구독자에게 나눠 줌
+    (조회는 업로드 I/O와 겹치지 않도록 전용 EVENTS 풀에서 실행)
+    """
+
+    def __init__(self, manager, interval: float = None):
+        self.manager = manager
+        self.interval = interval if interval is not None else float(os.getenv("SSE_POLL_SECONDS", "0.5"))
+        self._latest = {}  # job_id -> 최근 상태 (없어진 작업은 None)
+        self._subscribers = {}  # job_id -> 구독자 수
+        self._tick = None
+        self._task = None
+
+    async def updates(self, job_id: str, initial: dict):
+        """
+        initial부터 시작해 폴링 주기마다 최신 상태를 내보내는 async 반복자 (작업이 없어지면 None)
+        도중에 그만둘 때는 contextlib.aclosing으로 감싸 구독을 바로 해제
+        """
+        if self._task is None or self._task.done():
+            # 폴러는 구독자가 없으면 끝나므로 새로 시작할 때는 현재 이벤트 루프에 맞춰 다시 만듦
+            self._tick = asyncio.Condition()
+            self._task = asyncio.create_task(self._poll())
+        self._subscribers[job_id] = self._subscribers.get(job_id, 0) + 1
+        self._latest.setdefault(job_id, initial)
+        try:
+            yield initial
+            while True:
+                async with self._tick:
+                    await self._tick.wait()
+                yield self._latest.get(job_id)
+        finally:
+            self._subscribers[job_id] -= 1
+            if not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+                self._latest.pop(job_id, None)
+
+    async def _poll(self):
+        while self._subscribers:
+            await asyncio.sleep(self.interval)
+            job_ids = list(self._subscribers)
+            if not job_ids:
+                break
+            try:
+                # 작업은 다른 워커 프로세스에서 실행될 수 있으므로 DB에서 다시 읽음
+                found = await executors.run_in(executors.EVENTS, self.manager.get_many, job_ids)
+            except Exception as e:
+                logger.warning(f"Job status poll failed: {e}")
+            else:
+                for job_id in job_ids:
+                    if job_id in self._subscribers:
+                        self._latest[job_id] = found.get(job_id)
+            async with self._tick:
+                self._tick.notify_all()
@@ -2,6 +2,7 @@ import os
 import sys
 import glob
 import logging
+import threading
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
 
@@ -14,25 +15,51 @@ sys.path.append(os.path.join(project_root, '2_blog_poster'))
 # 기존 core 모듈 재사용
 from core.linkedin_poster import LinkedInPoster
 from core.summarizer import GeminiSummarizer
-from scraper import parse_content
+try:
+    from scraper import parse_content
+except ImportError:
+    # 2_blog_poster는 이 저장소에 없을 수 있음 (벤치마크/테스트 환경): 블로그 스크래핑 없이 동작
+    parse_content = None
+from core import executors, tracing, standins
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+
+def _html_text(html):
+    """위키 HTML에서 텍스트만 추출"""
+    return BeautifulSoup(html, 'html.parser').get_text()
+
+
 class LinkedinService:
     def __init__(self):
-        self.poster = LinkedInPoster()
+        self.poster = standins.backend("linkedin", LinkedInPoster, standins.FakeLinkedIn)
         self.summarizer = GeminiSummarizer()
-        
-        # Person URN 확인 및 갱신
-        if not self.poster.person_urn:
-            logger.info("Person URN not found in .env, trying to fetch from API...")
-            me = self.poster.get_me()
-            if me:
-                self.poster.person_urn = f"urn:li:person:{me['id']}"
-            else:
-                logger.error("Failed to get Person URN.")
+        # Person URN 조회(네트워크)는 생성 시점이 아니라 처음 필요할 때 수행
+        self._urn_lock = threading.Lock()
+        self._urn_checked = False
+
+    def ensure_person_urn(self):
+        """Person URN 확인 및 갱신 (.env에 없으면 API로 조회, 프로세스당 1회)"""
+        if self._urn_checked:
+            return self.poster.person_urn
+        with self._urn_lock:
+            if not self._urn_checked:
+                if not self.poster.person_urn:
+                    logger.info("Person URN not found in .env, trying to fetch from API...")
+                    me = self.poster.get_me()
+                    if me:
+                        self.poster.person_urn = f"urn:li:person:{me['id']}"
+                    else:
+                        logger.error("Failed to get Person URN.")
+                self._urn_checked = True
+        return self.poster.person_urn
 
+    def warm_up(self):
+        if not self.ensure_person_urn():
+            raise RuntimeError("LinkedIn Person URN not available")
+
+    @tracing.traced()
     async def share_wiki(self, wiki_id: str, wiki_url: str, lang: str = "ko"):
         """
         위키 콘텐츠를 분석하여 LinkedIn에 공유합니다.
@@ -43,28 +70,28 @@ class LinkedinService:
         logger.info(f"Preparing to share on LinkedIn: {wiki_url} ({lang})")
         
         try:
+            await executors.run_in(executors.NETWORK, self.ensure_person_urn)
+
             # FirestoreService를 통해 콘텐츠 가져오기 (가장 정확)
             from .firebase_service import FirebaseService
-            fb_service = FirebaseService()
+            fb_service = standins.backend("firebase", FirebaseService, standins.FakeFirebase)
             
             # wiki_id가 정확해야 함
-            doc_ref = fb_service.db.collection('static-wiki').document(wiki_id)
-            doc = doc_ref.get()
+            data = await executors.run_in(executors.STORAGE, fb_service.get_wiki_content, wiki_id)
             
-            if not doc.exists:
+            if not data:
                 return {"status": "error", "message": "Document not found in Firestore"}
             
-            data = doc.to_dict()
             title = data['titles'].get(lang, data['titles'].get('en'))
             content_html = data['content'].get(lang, data['content'].get('en'))
-            image_url = data.get('thumbnailUrl')
+            # LinkedIn 크기(1200x627)로 미리 만든 이미지 우선, 없으면(이전 문서) 썸네일
+            image_url = data.get('socialImageUrl') or data.get('thumbnailUrl')
             
-            # HTML 태그 제거하고 텍스트만 추출 (간단한 요약용)
-            soup = BeautifulSoup(content_html, 'html.parser')
-            text_content = soup.get_text()
+            # HTML 태그 제거하고 텍스트만 추출 (간단한 요약용, 문서 전체 파싱이라 CPU 풀에서)
+            text_content = await executors.run_in(executors.CPU, _html_text, content_html)
             
             # 요약 생성
-            summary = self.summarizer.summarize(title, text_content[:5000], lang=lang)
+            summary = await executors.run_in(executors.LLM, self.summarizer.summarize, title, text_content[:5000], lang=lang)
             
             # 포스팅 텍스트 구성
             if lang == 'en':
@@ -75,24 +102,16 @@ class LinkedinService:
             # 이미지 처리
             uploaded_image_urn = None
             if image_url:
-                # GCS URL이므로 다운로드 후 업로드 필요
-                import requests
-                import tempfile
-                
+                # GCS URL을 넘기면 메모리로 받아 그대로 LinkedIn에 업로드 (임시 파일 없음)
                 try:
-                    img_data = requests.get(image_url).content
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=".png") as tf:
-                        tf.write(img_data)
-                        temp_img_path = tf.name
-                    
-                    logger.info(f"Downloaded image to {temp_img_path}, uploading to LinkedIn...")
-                    uploaded_image_urn = self.poster.upload_image(temp_img_path)
-                    os.remove(temp_img_path) # 정리
+                    logger.info(f"Uploading image to LinkedIn: {image_url}")
+                    uploaded_image_urn = await executors.run_in(executors.NETWORK, self.poster.upload_image, image_url)
                 except Exception as e:
                     logger.error(f"Failed to process image from URL: {e}")
 
             # 포스팅 실행
-            result = self.poster.post_text(
+            result = await executors.run_in(
+                executors.NETWORK, self.poster.post_text,
                 post_text, 
                 title=title, 
                 original_url=wiki_url, 
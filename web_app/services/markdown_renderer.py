@@ -0,0 +1,300 @@
+"""
+로컬 마크다운 -> HTML 렌더러 (LLM 변환 대신 쓰는 결정적 경로)
+위키 본문(<div class="wiki-html-content ...">) 안에 들어갈 HTML 조각을 Tailwind 클래스와 함께 생성
+
+지원: 제목, 문단, 강조/굵게/취소선, 인라인 코드, 링크/이미지, 코드 블록, 인용, (중첩) 목록, 표, 구분선, 백슬래시 이스케이프
+MathJax 수식($...$, $$...$$)과 코드 안의 내용은 강조 처리 없이 그대로 보존
+원문 HTML 태그는 이스케이프됨 (LLM 경로와 달리 임의 HTML을 통과시키지 않음)
+"""
+import re
+import html as html_lib
+
+CLASSES = {
+    "h1": "text-2xl sm:text-3xl font-bold text-[#000] mt-8 mb-4",
+    "h2": "text-xl sm:text-2xl font-bold text-[#000] border-b border-[#a2a9b1] pb-1 mt-8 mb-4",
+    "h3": "text-lg sm:text-xl font-bold text-[#000] mt-6 mb-3",
+    "h4": "text-base font-bold mt-4 mb-2",
+    "p": "my-4",
+    "ul": "list-disc pl-6 my-4 space-y-1",
+    "ol": "list-decimal pl-6 my-4 space-y-1",
+    "blockquote": "border-l-4 border-[#a2a9b1] pl-4 my-4 text-[#54595d]",
+    "pre": "bg-[#f8f9fa] border border-[#eaecf0] rounded p-4 my-4 overflow-x-auto text-sm",
+    "code": "bg-[#f8f9fa] border border-[#eaecf0] rounded px-1 text-sm",
+    "table_wrap": "overflow-x-auto my-6",
+    "table": "min-w-full border-collapse border border-[#a2a9b1] text-sm",
+    "th": "border border-[#a2a9b1] bg-[#eaecf0] px-3 py-2 font-bold",
+    "td": "border border-[#a2a9b1] px-3 py-2",
+    "hr": "my-8 border-[#a2a9b1]",
+    "a": "text-[#0645ad] hover:underline break-words",
+    "img": "max-w-full h-auto my-4 rounded",
+    "math": "overflow-x-auto my-4",
+}
+
+_FENCE_RE = re.compile(r'^(\s*)(```+|~~~+)\s*([\w+-]*)')
+_HEADING_RE = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+_HR_RE = re.compile(r'^\s{0,3}([-*_])(\s*\1){2,}\s*$')
+_LIST_RE = re.compile(r'^(\s*)([-*+]|\d+[.)])\s+(.*)$')
+_TABLE_SEP_RE = re.compile(r'^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$')
+_QUOTE_RE = re.compile(r'^\s{0,3}>\s?(.*)$')
+
+# 인라인 보호 대상: 코드 스팬, 블록/인라인 수식 (\$는 이스케이프된 달러)
+_CODE_SPAN_RE = re.compile(r'(`+)(.+?)\1')
+_MATH_RE = re.compile(r'\$\$.+?\$\$|(?<![\\$])\$(?!\s)[^$\n]+?(?<![\s\\])\$(?!\d)')
+# 링크 대상은 한 단계의 균형 잡힌 괄호를 허용 (예: https://en.wikipedia.org/wiki/Python_(language))
+_URL = r'((?:[^()\s]|\([^()\s]*\))+)'
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(\s*' + _URL + r'(?:\s+&quot;(.*?)&quot;)?\s*\)')
+_LINK_RE = re.compile(r'\[([^\]]+)\]\(\s*' + _URL + r'(?:\s+&quot;(.*?)&quot;)?\s*\)')
+_AUTOLINK_RE = re.compile(r'&lt;(https?://[^\s&]+)&gt;')
+_PLACEHOLDER_RE = re.compile(r'\x00(\d+)\x00')
+# 백슬래시 이스케이프 (\$는 MathJax가 처리하므로 그대로 둠)
+_ESCAPE_RE = re.compile(r'\\([!"#%&\'()*+,\-./:;<=>?@\[\\\]^_`{|}~])')
+
+
+def render_markdown(md_content: str) -> str:
+    """마크다운 전체를 HTML 조각으로 변환"""
+    lines = md_content.replace("\r\n", "\n").replace("\t", "    ").split("\n")
+    return "\n".join(_render_blocks(lines))
+
+
+def _cls(tag):
+    return f' class="{CLASSES[tag]}"'
+
+
+def _render_blocks(lines):
+    out = []
+    i, n = 0, len(lines)
+    while i < n:
+        line = lines[i]
+        stripped = line.strip()
+
+        if not stripped:
+            i += 1
+            continue
+
+        fence = _FENCE_RE.match(line)
+        if fence:
+            marker = fence.group(2)
+            lang = fence.group(3)
+            body = []
+            i += 1
+            while i < n and not lines[i].strip().startswith(marker):
+                body.append(lines[i])
+                i += 1
+            i += 1  # 닫는 펜스
+            lang_attr = f' class="language-{html_lib.escape(lang)}"' if lang else ""
+            out.append(f'<pre{_cls("pre")}><code{lang_attr}>{html_lib.escape(chr(10).join(body))}</code></pre>')
+            continue
+
+        if stripped.startswith("$$"):
+            body = [stripped]
+            i += 1
+            if not (len(stripped) > 2 and stripped.endswith("$$")):
+                while i < n:
+                    body.append(lines[i].strip())
+                    i += 1
+                    if body[-1].endswith("$$"):
+                        break
+            out.append(f'<div{_cls("math")}>{html_lib.escape(chr(10).join(body), quote=False)}</div>')
+            continue
+
+        heading = _HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            tag = f"h{level}"
+            out.append(f'<{tag}{_cls(tag if level <= 4 else "h4")}>{render_inline(heading.group(2))}</{tag}>')
+            i += 1
+            continue
+
+        if _HR_RE.match(line):
+            out.append(f'<hr{_cls("hr")}>')
+            i += 1
+            continue
+
+        if _QUOTE_RE.match(line):
+            body = []
+            while i < n and lines[i].strip():
+                quote = _QUOTE_RE.match(lines[i])
+                body.append(quote.group(1) if quote else lines[i])
+                i += 1
+            out.append(f'<blockquote{_cls("blockquote")}>{chr(10).join(_render_blocks(body))}</blockquote>')
+            continue
+
+        if _LIST_RE.match(line):
+            i, html = _render_list(lines, i)
+            out.append(html)
+            continue
+
+        if "|" in line and i + 1 < n and _TABLE_SEP_RE.match(lines[i + 1]) and "-" in lines[i + 1]:
+            i, html = _render_table(lines, i)
+            out.append(html)
+            continue
+
+        # 문단: 빈 줄이나 다른 블록 시작 전까지
+        para = []
+        while i < n and lines[i].strip() and not _starts_block(lines, i):
+            para.append(lines[i])
+            i += 1
+        if not para:  # 블록 판별에 걸렸지만 위에서 처리되지 않은 줄 (안전장치)
+            para.append(lines[i])
+            i += 1
+        out.append(f'<p{_cls("p")}>{_render_paragraph(para)}</p>')
+    return out
+
+
+def _starts_block(lines, i):
+    line = lines[i]
+    stripped = line.strip()
+    return bool(
+        _FENCE_RE.match(line) or stripped.startswith("$$") or _HEADING_RE.match(line)
+        or _HR_RE.match(line) or _QUOTE_RE.match(line) or _LIST_RE.match(line)
+        or ("|" in line and i + 1 < len(lines) and _TABLE_SEP_RE.match(lines[i + 1]) and "-" in lines[i + 1])
+    )
+
+
+def _render_paragraph(lines):
+    parts = []
+    for idx, line in enumerate(lines):
+        hard_break = idx < len(lines) - 1 and (line.endswith("  ") or line.endswith("\\"))
+        text = render_inline(line.rstrip().rstrip("\\") if hard_break else line.strip())
+        parts.append(text + ("<br>" if hard_break else ""))
+    return "\n".join(parts)
+
+
+def _render_list(lines, i):
+    """같은 들여쓰기의 항목들을 하나의 목록으로, 더 깊이 들여쓴 줄은 항목 안의 블록으로 재귀 처리"""
+    first = _LIST_RE.match(lines[i])
+    base_indent = len(first.group(1))
+    ordered = first.group(2)[0].isdigit()
+    tag = "ol" if ordered else "ul"
+    start = int(first.group(2)[:-1]) if ordered else 1
+
+    items = []
+    n = len(lines)
+    while i < n:
+        item = _LIST_RE.match(lines[i])
+        if not item or len(item.group(1)) != base_indent or item.group(2)[0].isdigit() != ordered:
+            break
+        content_indent = len(item.group(1)) + len(item.group(2)) + 1
+        body = [item.group(3)]
+        i += 1
+        while i < n:
+            line = lines[i]
+            if not line.strip():
+                # 빈 줄 뒤에 들여쓴 줄이 이어지면 같은 항목
+                if i + 1 < n and _indent(lines[i + 1]) > base_indent and lines[i + 1].strip():
+                    body.append("")
+                    i += 1
+                    continue
+                break
+            if _indent(line) <= base_indent and (_LIST_RE.match(line) or _starts_block(lines, i)):
+                break
+            body.append(line[min(content_indent, _indent(line)):])
+            i += 1
+        items.append(body)
+        # 항목 사이 빈 줄
+        if i < n and not lines[i].strip() and i + 1 < n:
+            nxt = _LIST_RE.match(lines[i + 1])
+            if nxt and len(nxt.group(1)) == base_indent:
+                i += 1
+
+    rendered = []
+    for body in items:
+        blocks = _render_blocks(body)
+        # 단순 항목은 <p> 없이 인라인으로
+        if blocks and blocks[0].startswith(f'<p{_cls("p")}>'):
+            blocks[0] = blocks[0][len(f'<p{_cls("p")}>'):-len("</p>")]
+        rendered.append(f"<li>{chr(10).join(blocks)}</li>")
+    start_attr = f' start="{start}"' if ordered and start != 1 else ""
+    return i, f'<{tag}{_cls(tag)}{start_attr}>\n' + "\n".join(rendered) + f"\n</{tag}>"
+
+
+def _indent(line):
+    return len(line) - len(line.lstrip(" "))
+
+
+def _split_row(line):
+    line = line.strip()
+    if line.startswith("|"):
+        line = line[1:]
+    if line.endswith("|") and not line.endswith("\\|"):
+        line = line[:-1]
+    return [cell.strip().replace("\\|", "|") for cell in re.split(r'(?<!\\)\|', line)]
+
+
+def _render_table(lines, i):
+    header = _split_row(lines[i])
+    aligns = []
+    for cell in _split_row(lines[i + 1]):
+        if cell.startswith(":") and cell.endswith(":"):
+            aligns.append("text-center")
+        elif cell.endswith(":"):
+            aligns.append("text-right")
+        else:
+            aligns.append("text-left")
+    i += 2
+    rows = []
+    while i < len(lines) and lines[i].strip() and "|" in lines[i]:
+        rows.append(_split_row(lines[i]))
+        i += 1
+
+    def cell(tag, text, col):
+        align = aligns[col] if col < len(aligns) else "text-left"
+        return f'<{tag} class="{CLASSES[tag]} {align}">{render_inline(text)}</{tag}>'
+
+    head = "".join(cell("th", text, col) for col, text in enumerate(header))
+    body = "\n".join(
+        "<tr>" + "".join(cell("td", row[col] if col < len(row) else "", col) for col in range(len(header))) + "</tr>"
+        for row in rows
+    )
+    return i, (
+        f'<div{_cls("table_wrap")}><table{_cls("table")}>\n'
+        f"<thead><tr>{head}</tr></thead>\n<tbody>\n{body}\n</tbody>\n</table></div>"
+    )
+
+
+def render_inline(text: str) -> str:
+    """한 줄 인라인 마크다운 변환 (코드/수식은 자리표시자로 보호한 뒤 마지막에 복원)"""
+    protected = []
+
+    def protect(html):
+        protected.append(html)
+        return f"\x00{len(protected) - 1}\x00"
+
+    text = _CODE_SPAN_RE.sub(
+        lambda m: protect(f'<code{_cls("code")}>{html_lib.escape(m.group(2).strip())}</code>'), text
+    )
+    text = _MATH_RE.sub(lambda m: protect(html_lib.escape(m.group(0), quote=False)), text)
+    # 이스케이프된 문자는 강조/링크 문법으로 해석되지 않도록 보호
+    text = _ESCAPE_RE.sub(lambda m: protect(html_lib.escape(m.group(1))), text)
+    text = html_lib.escape(text)
+
+    text = _IMAGE_RE.sub(lambda m: protect(
+        f'<img src="{_safe_url(m.group(2))}" alt="{m.group(1)}"{_title(m.group(3))}{_cls("img")}>'
+    ), text)
+    text = _LINK_RE.sub(lambda m: protect(
+        f'<a href="{_safe_url(m.group(2))}"{_title(m.group(3))}{_cls("a")}>'
+    ) + m.group(1) + protect("</a>"), text)
+    text = _AUTOLINK_RE.sub(lambda m: f'<a href="{m.group(1)}"{_cls("a")}>{m.group(1)}</a>', text)
+
+    text = re.sub(r'\*\*(?=\S)(.+?)(?<=\S)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<!\w)__(?=\S)(.+?)(?<=\S)__(?!\w)', r'<strong>\1</strong>', text)
+    text = re.sub(r'(?<![*\w])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![*\w])', r'<em>\1</em>', text)
+    text = re.sub(r'(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)', r'<em>\1</em>', text)
+    text = re.sub(r'~~(?=\S)(.+?)(?<=\S)~~', r'<del>\1</del>', text)
+
+    # 복원 (링크 안에 코드/수식이 있을 수 있으므로 남은 자리표시자가 없을 때까지)
+    while _PLACEHOLDER_RE.search(text):
+        text = _PLACEHOLDER_RE.sub(lambda m: protected[int(m.group(1))], text)
+    return text
+
+
+def _safe_url(url):
+    # javascript:, data: 등 스크립트 실행이 가능한 스킴은 링크하지 않음
+    scheme = re.match(r'^\s*([a-zA-Z][\w+.-]*):', url)
+    if scheme and scheme.group(1).lower() not in ("http", "https", "mailto"):
+        return "#"
+    return url
+
+
+def _title(title):
+    return f' title="{title}"' if title else ""
@@ -0,0 +1,37 @@
+"""
+마크다운을 제목(#, ##) 경계로 섹션 분할
+코드 블록(``` / ~~~) 안의 '#' 줄은 제목으로 보지 않으며, 첫 제목 앞의 머리말은 별도 섹션이 됨
+섹션 경계는 각 제목 줄에만 의존하므로 한 섹션을 고쳐도 다른 섹션의 내용(해시)은 바뀌지 않음
+"""
+import re
+import hashlib
+
+_HEADING_RE = re.compile(r'^(#{1,2})\s+\S')
+_FENCE_RE = re.compile(r'^\s*(```|~~~)')
+
+
+def split_sections(md_content: str, max_level: int = 2):
+    """제목 레벨 max_level 이하에서 나눈 섹션 문자열 목록 (빈 섹션 제외)"""
+    sections = []
+    current = []
+    fence = None
+    for line in md_content.splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif fence == marker:
+                fence = None
+        heading = _HEADING_RE.match(line) if fence is None else None
+        if heading and len(heading.group(1)) <= max_level and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+    return [section for section in sections if section.strip()]
+
+
+def section_hash(section: str) -> str:
+    return hashlib.sha256(section.strip().encode("utf-8")).hexdigest()
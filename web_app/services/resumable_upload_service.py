@@ -0,0 +1,276 @@
+"""
+재개 가능한 청크 업로드 서비스 (tus 방식)
+1. 세션 생성 -> 2. 바이트 범위별 PUT (병렬 가능) -> 3. 현재 오프셋 조회 -> 4. 완료 후 파이프라인으로 전달
+세션과 수신 범위는 SQLite에 저장되므로 어느 uvicorn 워커로 요청이 가도 이어서 업로드 가능
+"""
+import os
+import re
+import uuid
+import shutil
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from core import database, models, executors
+from core.uploads import UploadTooLarge, safe_filename, CHUNK_SIZE, MAX_VIDEO_BYTES, BASE_DIR
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+SESSION_DIR = os.getenv("UPLOAD_SESSION_DIR", os.path.join(BASE_DIR, 'scratch', 'resumable'))
+MAX_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_MB", "8")) * 1024 * 1024
+SESSION_TTL = timedelta(hours=int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24")))
+
+_CONTENT_RANGE_RE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class UploadSessionError(Exception):
+    """잘못된 세션/범위 요청 (status_code로 HTTP 상태 전달)"""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_content_range(header: str):
+    """'bytes start-end/total' 헤더를 (start, end_exclusive, total)로 변환"""
+    match = _CONTENT_RANGE_RE.match((header or "").strip())
+    if not match:
+        raise UploadSessionError("Content-Range 헤더 형식이 올바르지 않습니다. (예: bytes 0-1048575/5242880)")
+    start, last, total = (int(g) for g in match.groups())
+    if last < start:
+        raise UploadSessionError("Content-Range 범위가 올바르지 않습니다.")
+    return start, last + 1, total
+
+
+def merge_ranges(ranges):
+    """겹치거나 이어지는 [start, end) 범위를 병합"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+class ResumableUploadService:
+    def __init__(self, session_dir: str = None):
+        self.session_dir = session_dir or SESSION_DIR
+
+    def data_path(self, upload_id: str) -> str:
+        return os.path.join(self.session_dir, f"{upload_id}.part")
+
+    def create(self, user_id: int, filename: str, total_size: int, max_bytes: int = MAX_VIDEO_BYTES):
+        """업로드 세션을 만들고 전체 크기만큼 파일을 미리 할당"""
+        if total_size <= 0:
+            raise UploadSessionError("파일 크기가 올바르지 않습니다.")
+        if total_size > max_bytes:
+            raise UploadTooLarge(filename, max_bytes)
+
+        self.cleanup_expired()
+        os.makedirs(self.session_dir, exist_ok=True)
+        upload_id = uuid.uuid4().hex
+        with open(self.data_path(upload_id), "wb") as f:
+            f.truncate(total_size)
+
+        db = database.SessionLocal()
+        try:
+            db.add(models.UploadSession(
+                id=upload_id, user_id=user_id, filename=safe_filename(filename, "video.mp4"), total_size=total_size
+            ))
+            db.commit()
+        finally:
+            db.close()
+        return self.status(upload_id, user_id)
+
+    def status(self, upload_id: str, user_id: int):
+        """세션 상태: 연속 수신된 오프셋과 수신 범위 목록"""
+        db = database.SessionLocal()
+        try:
+            session = self._get_session(db, upload_id, user_id)
+            chunks = db.query(models.UploadChunk).filter(models.UploadChunk.upload_id == upload_id).all()
+            ranges = merge_ranges([(c.start, c.end) for c in chunks])
+            offset = ranges[0][1] if ranges and ranges[0][0] == 0 else 0
+            return {
+                "upload_id": session.id,
+                "filename": session.filename,
+                "size": session.total_size,
+                "offset": offset,
+                "received": sum(end - start for start, end in ranges),
+                "ranges": ranges,
+                "chunk_size": MAX_CHUNK_BYTES,
+                "status": session.status,
+            }
+        finally:
+            db.close()
+
+    async def write_range(self, upload_id: str, user_id: int, content_range: str, body_stream):
+        """
+        요청 본문(async 바이트 스트림)을 Content-Range 위치에 기록
+        본문은 최대 1MB씩 모아 DISK 풀에서 pwrite 하므로 청크 크기와 무관하게 메모리 사용량이 일정함
+        (세션 확인/청크 기록 등 DB 작업도 DISK 풀에서 실행)
+        """
+        start, end, total = parse_content_range(content_range)
+        await executors.run_in(executors.DISK, self._check_range, upload_id, user_id, start, end, total)
+
+        fd = await executors.run_in(executors.DISK, os.open, self.data_path(upload_id), os.O_WRONLY)
+        try:
+            position = start
+            buffer = bytearray()
+            async for piece in body_stream:
+                if position + len(buffer) + len(piece) > end:
+                    raise UploadSessionError("본문 길이가 Content-Range보다 깁니다.")
+                buffer.extend(piece)
+                if len(buffer) >= CHUNK_SIZE:
+                    await executors.run_in(executors.DISK, os.pwrite, fd, bytes(buffer), position)
+                    position += len(buffer)
+                    buffer.clear()
+            if buffer:
+                await executors.run_in(executors.DISK, os.pwrite, fd, bytes(buffer), position)
+                position += len(buffer)
+            if position != end:
+                raise UploadSessionError("본문 길이가 Content-Range와 다릅니다. 해당 범위를 다시 전송해주세요.")
+        finally:
+            os.close(fd)
+
+        return await executors.run_in(executors.DISK, self._record_range, upload_id, user_id, start, end)
+
+    def _check_range(self, upload_id, user_id, start, end, total):
+        db = database.SessionLocal()
+        try:
+            session = self._get_session(db, upload_id, user_id)
+            if session.status != "open":
+                raise UploadSessionError("이미 완료된 업로드 세션입니다.", status_code=409)
+            if total != session.total_size or end > session.total_size:
+                raise UploadSessionError("Content-Range가 세션 파일 크기와 맞지 않습니다.", status_code=416)
+        finally:
+            db.close()
+        if end - start > MAX_CHUNK_BYTES:
+            raise UploadSessionError(f"청크는 최대 {MAX_CHUNK_BYTES} bytes까지 허용됩니다.", status_code=413)
+
+    def _record_range(self, upload_id, user_id, start, end):
+        """수신한 범위를 기록하고 세션 상태 반환"""
+        db = database.SessionLocal()
+        try:
+            db.add(models.UploadChunk(upload_id=upload_id, start=start, end=end))
+            # 진행 중인 세션이 TTL 정리 대상이 되지 않도록 갱신 시각 기록
+            self._get_session(db, upload_id, user_id).updated_at = datetime.utcnow()
+            db.commit()
+        finally:
+            db.close()
+        return self.status(upload_id, user_id)
+
+    def finalize(self, upload_id: str, user_id: int, dest_path: str):
+        """
+        모든 범위가 수신되었는지 확인한 뒤 sha256을 계산하고 파일을 dest_path로 이동
+        (블로킹 작업이므로 DISK 풀에서 호출)
+
+        먼저 조건부 UPDATE로 세션을 open -> finalizing으로 바꿔 한 요청만 진행하고,
+        동시에 들어온 완료/취소 요청은 409로 응답
+        """
+        self._transition(upload_id, user_id, "open", "finalizing")
+        try:
+            info = self.status(upload_id, user_id)
+            if info["offset"] != info["size"]:
+                raise UploadSessionError(
+                    f"업로드가 완료되지 않았습니다. ({info['received']}/{info['size']} bytes)", status_code=409
+                )
+            digest = hashlib.sha256()
+            with open(self.data_path(upload_id), "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            shutil.move(self.data_path(upload_id), dest_path)
+        except FileNotFoundError:
+            self._transition(upload_id, user_id, "finalizing", "open", strict=False)
+            raise UploadSessionError("업로드 파일을 찾을 수 없습니다. 세션을 다시 만들어주세요.", status_code=409)
+        except Exception:
+            self._transition(upload_id, user_id, "finalizing", "open", strict=False)
+            raise
+
+        db = database.SessionLocal()
+        try:
+            session = self._get_session(db, upload_id, user_id)
+            session.status = "complete"
+            session.sha256 = digest.hexdigest()
+            db.query(models.UploadChunk).filter(models.UploadChunk.upload_id == upload_id).delete()
+            db.commit()
+            return {"filename": session.filename, "size": session.total_size, "sha256": session.sha256}
+        finally:
+            db.close()
+
+    def _transition(self, upload_id, user_id, from_status, to_status, strict=True):
+        """세션 상태를 조건부 UPDATE로 변경 (다른 요청이 먼저 바꿨으면 409, 세션이 없으면 404)"""
+        db = database.SessionLocal()
+        try:
+            changed = db.query(models.UploadSession).filter(
+                models.UploadSession.id == upload_id,
+                models.UploadSession.user_id == user_id,
+                models.UploadSession.status == from_status,
+            ).update({"status": to_status, "updated_at": datetime.utcnow()}, synchronize_session=False)
+            db.commit()
+            if changed or not strict:
+                return
+            session = self._get_session(db, upload_id, user_id)
+            if session.status == "finalizing":
+                raise UploadSessionError("업로드 완료 처리가 이미 진행 중입니다.", status_code=409)
+            raise UploadSessionError("이미 완료된 업로드 세션입니다.", status_code=409)
+        finally:
+            db.close()
+
+    def reopen(self, upload_id: str, user_id: int, moved_path: str):
+        """
+        finalize 이후 작업 등록에 실패했을 때 파일을 세션 위치로 되돌리고 다시 open 상태로
+        (전체 범위를 수신한 상태이므로 클라이언트는 바로 완료 요청을 다시 보낼 수 있음)
+        """
+        shutil.move(moved_path, self.data_path(upload_id))
+        db = database.SessionLocal()
+        try:
+            session = self._get_session(db, upload_id, user_id)
+            session.status = "open"
+            session.sha256 = None
+            session.updated_at = datetime.utcnow()
+            db.add(models.UploadChunk(upload_id=upload_id, start=0, end=session.total_size))
+            db.commit()
+        finally:
+            db.close()
+
+    def cancel(self, upload_id: str, user_id: int):
+        db = database.SessionLocal()
+        try:
+            session = self._get_session(db, upload_id, user_id)
+            if session.status == "finalizing":
+                # 완료 처리 중인 파일을 지우면 finalize가 중간에 실패하므로 거부
+                raise UploadSessionError("업로드 완료 처리가 진행 중이라 취소할 수 없습니다.", status_code=409)
+            self._delete(db, session)
+            db.commit()
+        finally:
+            db.close()
+
+    def cleanup_expired(self):
+        """TTL이 지난 세션과 임시 파일 정리"""
+        db = database.SessionLocal()
+        try:
+            cutoff = datetime.utcnow() - SESSION_TTL
+            expired = db.query(models.UploadSession).filter(models.UploadSession.updated_at < cutoff).all()
+            for session in expired:
+                self._delete(db, session)
+            db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to clean up upload sessions: {e}")
+        finally:
+            db.close()
+
+    def _delete(self, db, session):
+        db.query(models.UploadChunk).filter(models.UploadChunk.upload_id == session.id).delete()
+        db.delete(session)
+        path = self.data_path(session.id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    @staticmethod
+    def _get_session(db, upload_id, user_id):
+        session = db.query(models.UploadSession).filter(models.UploadSession.id == upload_id).first()
+        if not session or session.user_id != user_id:
+            raise UploadSessionError("업로드 세션을 찾을 수 없습니다.", status_code=404)
+        return session
@@ -0,0 +1,164 @@
+"""
+위키 ID 매핑(제목 -> wiki_id) 로컬 인덱스
+업로드마다 Firestore의 wiki-id-map 문서 전체를 읽고 새 ID가 생기면 전체를 다시 쓰는 대신
+
+    - 프로세스 메모리에 제목 -> ID, ID -> 제목 인덱스를 두어 조회는 O(1)
+    - 처음에 wiki-id-map 집계 문서와 제목별 등록 문서를 읽고, 이후 등록은 실시간 구독(on_snapshot)으로
+      바뀐 항목만 합침. 구독할 수 없으면 WIKI_ID_INDEX_TTL_SECONDS(기본 300)마다 다시 읽음
+    - 새 ID 등록은 ID별/제목별 문서만 읽고 만드는 트랜잭션으로 하므로 매핑 전체를 읽지 않고,
+      동시에 게시해도 서로의 항목을 덮어쓰지 않음
+      (같은 제목을 먼저 등록한 쪽의 ID를 따르고, 다른 제목이 쓰는 ID와 겹치면 -2, -3... 접미사를 붙임)
+    - wiki-id-map 집계 문서는 등록 트랜잭션 밖에서 갱신 (publish=False로 등록한 뒤 publish()로 한 번에 기록 가능)
+    - 등록 전에 인덱스에 있는 제목/ID를 먼저 확인하므로 ID별 문서가 없는 예전 항목과도 겹치지 않음
+    - Firestore에 기록하지 못한 항목은 확정될 때까지 인덱스에 남겨 다른 제목에 다시 배정하지 않음
+
+인덱스가 잠시 오래되었더라도 등록은 트랜잭션에서 다시 확인하므로 매핑이 꼬이지 않음 (ID 생성 호출 한 번이 낭비될 뿐)
+"""
+import os
+import time
+import logging
+import threading
+from dotenv import load_dotenv
+from core import executors
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# 같은 ID를 다른 제목이 쓰고 있을 때 접미사를 붙여 다시 시도하는 최대 횟수
+MAX_CLAIM_ATTEMPTS = 10
+
+
+def unique_id(wiki_id: str, taken) -> str:
+    """taken에 없는 ID 반환 (wiki_id, wiki_id-2, wiki_id-3, ...)"""
+    if wiki_id not in taken:
+        return wiki_id
+    n = 2
+    while f"{wiki_id}-{n}" in taken:
+        n += 1
+    return f"{wiki_id}-{n}"
+
+
+class WikiIdIndex:
+    def __init__(self, firebase, ttl: float = None):
+        self.firebase = firebase
+        self.ttl = ttl if ttl is not None else float(os.getenv("WIKI_ID_INDEX_TTL_SECONDS", "300"))
+        self._ids = {}  # 제목 -> ID
+        self._titles = {}  # ID -> 제목
+        self._unsaved = {}  # Firestore에 아직 기록하지 못한 제목 -> ID
+        self._loaded_at = None
+        self._watch = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    def lookup(self, title: str):
+        """제목의 ID 반환 (없으면 None)"""
+        self._ensure_fresh()
+        return self._ids.get(title)
+
+    def snapshot(self) -> dict:
+        """현재 매핑 사본"""
+        self._ensure_fresh()
+        with self._lock:
+            return dict(self._ids)
+
+    def claim(self, title: str, wiki_id: str) -> str:
+        """제목에 ID를 등록하고 확정된 ID 반환 (이미 등록된 제목이면 기존 ID)"""
+        claimed = self.claim_many({title: wiki_id})
+        return claimed[title] if claimed else wiki_id
+
+    def claim_many(self, mapping: dict, publish: bool = True):
+        """
+        여러 제목의 ID를 한 트랜잭션으로 등록하고 {제목: 확정 ID} 반환
+        Firestore에 기록하지 못하면 이 프로세스의 인덱스에만 반영하고 None 반환
+        publish: 확정된 항목을 wiki-id-map 집계 문서에 바로 기록 (STORAGE 풀에서 따로 실행, False면 호출자가 publish())
+        """
+        self._ensure_fresh()
+        with self._lock:
+            # 로컬에서 이미 알고 있는 충돌은 미리 피함
+            taken = set(self._titles) - {self._ids.get(title) for title in mapping}
+            pending = {}
+            for title, wiki_id in mapping.items():
+                candidate = self._ids.get(title) or unique_id(wiki_id, taken)
+                taken.add(candidate)
+                pending[title] = candidate
+
+        confirmed, rejected = {}, set()
+        for _ in range(MAX_CLAIM_ATTEMPTS):
+            resolved = self.firebase.claim_ids(pending)
+            if resolved is None:
+                logger.warning("Wiki ID map not persisted; keeping IDs in the local index only")
+                self._add(pending, saved=False)
+                return None
+            self._add({title: wiki_id for title, wiki_id in resolved.items() if wiki_id is not None})
+            retry = {}
+            for title, wiki_id in resolved.items():
+                if wiki_id is None:
+                    # 다른 제목이 먼저 등록한 ID: 접미사를 붙여 다시 시도
+                    rejected.add(pending[title])
+                    with self._lock:
+                        taken = set(self._titles) | rejected | set(retry.values())
+                    retry[title] = unique_id(pending[title], taken)
+                else:
+                    confirmed[title] = wiki_id
+            if not retry:
+                if publish and confirmed:
+                    executors.get_pool(executors.STORAGE).submit(self.publish, dict(confirmed))
+                return confirmed
+            pending = retry
+        raise RuntimeError(f"Could not claim a unique wiki ID for: {', '.join(pending)}")
+
+    def publish(self, mapping: dict) -> bool:
+        """확정된 항목을 wiki-id-map 집계 문서에 한 번에 기록 (성공 여부 반환)"""
+        return bool(mapping) and self.firebase.save_id_map(mapping)
+
+    def close(self):
+        if self._watch is not None:
+            try:
+                self._watch.unsubscribe()
+            except Exception:
+                pass
+            self._watch = None
+
+    def _ensure_fresh(self):
+        if self._loaded_at is not None and (self._watch is not None or time.monotonic() - self._loaded_at < self.ttl):
+            return
+        with self._load_lock:
+            if self._loaded_at is not None and (self._watch is not None or time.monotonic() - self._loaded_at < self.ttl):
+                return
+            self._reload(self.firebase.get_id_map())
+            if self._watch is None:
+                # 이후 등록은 실시간 구독으로 바뀐 항목만 합침
+                self._watch = self.firebase.watch_id_map(self._merge)
+
+    def _reload(self, mapping: dict):
+        """전체 다시 읽기: Firestore 내용으로 바꾸되 아직 기록하지 못한 로컬 항목은 유지"""
+        with self._lock:
+            ids = dict(mapping)
+            for title, wiki_id in self._unsaved.items():
+                ids.setdefault(title, wiki_id)
+            self._ids = ids
+            self._titles = {wiki_id: title for title, wiki_id in ids.items()}
+            self._unsaved = {title: wiki_id for title, wiki_id in self._unsaved.items() if title not in mapping}
+            self._loaded_at = time.monotonic()
+
+    def _merge(self, mapping: dict):
+        """구독 콜백: 바뀐 항목만 합침 (Firestore에 나타난 항목은 확정된 것으로 처리)"""
+        with self._lock:
+            for title, wiki_id in mapping.items():
+                previous = self._ids.get(title)
+                if previous and previous != wiki_id and self._titles.get(previous) == title:
+                    del self._titles[previous]
+                self._ids[title] = wiki_id
+                self._titles[wiki_id] = title
+                self._unsaved.pop(title, None)
+            self._loaded_at = time.monotonic()
+
+    def _add(self, mapping: dict, saved: bool = True):
+        with self._lock:
+            for title, wiki_id in mapping.items():
+                self._ids[title] = wiki_id
+                self._titles[wiki_id] = title
+                if saved:
+                    self._unsaved.pop(title, None)
+                else:
+                    self._unsaved[title] = wiki_id
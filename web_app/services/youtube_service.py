@@ -2,6 +2,7 @@ import os
 import sys
 import json
 import shutil
+import threading
 import importlib.util
 from fastapi.responses import FileResponse
 
@@ -10,6 +11,12 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(os.path.dirname(current_dir))
 sys.path.append(project_root)
 
+from core import executors, tracing, standins
+from services.category_assets import CategoryAssets
+
+# 코너 워터마크 없이 끝 3초 아웃트로만 붙이는 카테고리 (본문은 재인코딩하지 않고 스트림 복사)
+OUTRO_ONLY_CATEGORIES = {c.strip() for c in os.getenv("OUTRO_ONLY_CATEGORIES", "").split(",") if c.strip()}
+
 # 숫자로 시작하는 디렉토리는 직접 import가 불가능하므로 importlib 사용
 def load_youtube_poster():
     module_path = os.path.join(project_root, 'youtube_poster', 'youtube_poster.py')
@@ -18,27 +25,41 @@ def load_youtube_poster():
     spec.loader.exec_module(module)
     return module.YouTubeAutoPoster
 
-YouTubeAutoPoster = load_youtube_poster()
-
 class YouTubeService:
     def __init__(self):
-        self.poster = YouTubeAutoPoster()
         self.base_v_dir = os.path.join(project_root, 'youtube_poster', 'v_source')
+        # 카테고리별 로고/설명 템플릿 캐시 (mtime 변경 또는 save_logo 시 갱신)
+        self.assets = CategoryAssets(self.base_v_dir)
+        # YouTubeAutoPoster는 OAuth 인증(네트워크, 경우에 따라 로컬 서버)을 수행하므로 처음 필요할 때 생성
+        self._poster = None
+        self._poster_lock = threading.Lock()
+        # 링크드인 공유 요약용 (클라이언트는 게이트웨이 풀에서 가져오므로 하나를 재사용)
+        self._summarizer = None
+
+    @property
+    def poster(self):
+        if self._poster is None:
+            with self._poster_lock:
+                if self._poster is None:
+                    YouTubeAutoPoster = load_youtube_poster()
+                    try:
+                        self._poster = YouTubeAutoPoster()
+                    except SystemExit:
+                        # 인증 정보가 없으면 sys.exit()를 호출하므로 워커 프로세스가 종료되지 않도록 변환
+                        raise RuntimeError("YouTube client_secrets.json not found in DB or locally")
+        return self._poster
+
+    def warm_up(self):
+        if self.poster.youtube is None:
+            raise RuntimeError("YouTube client not authenticated")
 
     def get_logo_path(self, category):
-        v_dir = os.path.join(self.base_v_dir, category)
-        if not os.path.exists(v_dir):
-            return None
-        
-        logo_files = [f for f in os.listdir(v_dir) if f.lower().endswith('.png') and 'logo' in f.lower()]
-        if not logo_files:
-            logo_files = [f for f in os.listdir(v_dir) if f.lower().endswith('.png')]
-            
-        if logo_files:
-            return os.path.join(v_dir, logo_files[0])
-        return None
+        logo = self.assets.logo(category)
+        return logo.path if logo else None
 
-    def save_logo(self, category, file_content, filename):
+    @tracing.traced()
+    def save_logo(self, category, source_path, filename):
+        """업로드된 로고 임시 파일(source_path)을 카테고리 디렉토리로 이동합니다."""
         v_dir = os.path.join(self.base_v_dir, category)
         if not os.path.exists(v_dir):
             os.makedirs(v_dir, exist_ok=True)
@@ -51,90 +72,75 @@ class YouTubeService:
         # 새 로고 저장 (이름을 logo.png 등으로 고정하거나 원본 이름 유지)
         # youtube_poster.py가 'logo' 단어를 찾으므로 이름에 포함시킴
         save_path = os.path.join(v_dir, f"logo_{filename}")
-        with open(save_path, "wb") as f:
-            f.write(file_content)
+        shutil.move(source_path, save_path)
+        self.assets.invalidate(category)
         
         return save_path
 
-    async def generate_metadata(self, pdf_content, category, lang='ko'):
-        # 임시 파일로 PDF 저장
-        temp_pdf = os.path.join(self.base_v_dir, category, "temp_metadata_source.pdf")
-        with open(temp_pdf, "wb") as f:
-            f.write(pdf_content)
-
-        # 템플릿 읽기
-        desc_path = os.path.join(self.base_v_dir, category, f'desc_{lang}.md')
-        if not os.path.exists(desc_path):
-            desc_path = os.path.join(self.base_v_dir, category, 'desc.md')
-        
-        desc_template = ""
-        if os.path.exists(desc_path):
-            with open(desc_path, 'r', encoding='utf-8') as f:
-                desc_template = f.read()
-
-        metadata = self.poster.generate_youtube_metadata(temp_pdf, lang=lang, desc_template=desc_template)
-        
-        # 임시 파일 삭제
-        if os.path.exists(temp_pdf):
-            os.remove(temp_pdf)
-            
-        return metadata
-
-    async def process_and_upload(self, video_content, filename, pdf_content, category, lang='ko', gen_sub=False):
-        """영상을 처리하고 유튜브에 업로드합니다."""
-        v_dir = os.path.join(self.base_v_dir, category)
-        if not os.path.exists(v_dir):
-            os.makedirs(v_dir, exist_ok=True)
-
-        # 1. 파일 저장
-        video_path = os.path.join(v_dir, f"raw_{filename}")
-        with open(video_path, "wb") as f:
-            f.write(video_content)
-        
-        pdf_path = os.path.join(v_dir, "temp_metadata_source.pdf")
-        with open(pdf_path, "wb") as f:
-            f.write(pdf_content)
-
+    @tracing.traced()
+    async def generate_metadata(self, pdf_path, category, lang='ko'):
+        # Gemini 호출은 블로킹이므로 LLM 풀에서 실행
+        return await executors.run_in(executors.LLM, self._generate_metadata, pdf_path, category, lang)
+
+    @tracing.traced()
+    def _generate_metadata(self, pdf_path, category, lang='ko'):
+        desc_template = self.assets.desc_template(category, lang)
+        return self.poster.generate_youtube_metadata(pdf_path, lang=lang, desc_template=desc_template)
+
+    @tracing.traced()
+    def process_and_upload(self, video_path, pdf_path, category, lang='ko', gen_sub=False,
+                           work_dir=None, progress=None):
+        """
+        영상을 처리하고 유튜브에 업로드합니다.
+        수 분이 걸리는 동기 작업이므로 JobManager 워커 스레드에서 실행합니다.
+
+        video_path, pdf_path: 디스크에 저장된 업로드 파일 경로 (작업 종료 시 삭제됨)
+        work_dir: 작업 전용 디렉토리 (동시 작업 간 중간 파일 충돌 방지, 없으면 영상 파일 디렉토리 사용)
+        progress: 진행 상황 콜백 progress(stage, progress, **detail)
+        """
+        work_dir = work_dir or os.path.dirname(os.path.abspath(video_path))
+        report = progress or (lambda stage, progress=0.0, **detail: None)
+        filename = os.path.basename(video_path)
+
+        srt_path = None
+        final_video_path = None
         try:
             # 2. 메타데이터 생성
-            desc_path = os.path.join(v_dir, f'desc_{lang}.md')
-            if not os.path.exists(desc_path):
-                desc_path = os.path.join(v_dir, 'desc.md')
-            
-            desc_template = ""
-            if os.path.exists(desc_path):
-                with open(desc_path, 'r', encoding='utf-8') as f:
-                    desc_template = f.read()
-
+            report("metadata")
+            desc_template = self.assets.desc_template(category, lang)
             metadata = self.poster.generate_youtube_metadata(pdf_path, lang=lang, desc_template=desc_template)
 
             # 3. 자막 생성 (옵션)
-            srt_path = None
             if gen_sub:
+                report("subtitles")
                 srt_path = self.poster.generate_subtitles(video_path, lang=lang)
 
             # 4. 로고 및 자막 합성
+            report("encode")
             logo_path = self.get_logo_path(category)
             if not logo_path:
                 raise Exception("Logo not found for category " + category)
 
-            final_video_path = os.path.join(v_dir, f"final_{filename}")
-            success = self.poster.add_logo_and_subs_to_video(video_path, logo_path, srt_path, final_video_path)
+            final_video_path = os.path.join(work_dir, f"final_{filename}")
+            success = self.poster.add_logo_and_subs_to_video(
+                video_path, logo_path, srt_path, final_video_path,
+                progress=lambda ratio, **stats: report("encode", ratio, **stats),
+                watermark=category not in OUTRO_ONLY_CATEGORIES
+            )
             
             if not success:
                 raise Exception("Video processing failed")
 
             # 5. 유튜브 업로드
-            video_id = self.poster.upload_video(final_video_path, metadata)
+            report("upload")
+            video_id = self.poster.upload_video(
+                final_video_path, metadata,
+                progress=lambda ratio, **stats: report("upload", ratio, **stats)
+            )
             
             if not video_id:
                 raise Exception("YouTube upload failed")
 
-            # 6. 정리
-            for f in [video_path, pdf_path, srt_path, final_video_path]:
-                if f and os.path.exists(f):
-                    os.remove(f)
-
             return {
                 "status": "success",
                 "video_id": video_id,
@@ -142,32 +148,32 @@ class YouTubeService:
                 "metadata": metadata
             }
 
-        except Exception as e:
-            # 오류 발생 시에도 임시 파일 정리
-            for f in [video_path, pdf_path]:
+        finally:
+            # 6. 정리 (오류 발생 시에도 임시 파일 정리)
+            for f in [video_path, pdf_path, srt_path, final_video_path]:
                 if f and os.path.exists(f):
                     os.remove(f)
-            raise e
 
+    @tracing.traced()
     async def share_to_linkedin(self, video_id, video_url, lang='ko'):
         """유튜브 영상을 링크드인에 공유합니다."""
-        import requests
-        from core.linkedin_poster import LinkedInPoster
         from core.summarizer import GeminiSummarizer
 
         # 유튜브 API 키
         youtube_api_key = os.getenv("YOUTUBE_API_KEY")
-        if not youtube_api_key:
+        if not youtube_api_key and not standins.OFFLINE:
             return {"status": "error", "message": "YOUTUBE_API_KEY not found"}
 
         # 1. 유튜브 메타데이터 가져오기
         from googleapiclient.discovery import build
-        youtube_client = build('youtube', 'v3', developerKey=youtube_api_key)
+        youtube_client = standins.backend(
+            "youtube", lambda: build('youtube', 'v3', developerKey=youtube_api_key), shared=False
+        )
         request = youtube_client.videos().list(
             part="snippet",
             id=video_id
         )
-        response = request.execute()
+        response = await executors.run_in(executors.NETWORK, request.execute)
         
         if not response['items']:
             return {"status": "error", "message": "Video not found"}
@@ -186,35 +192,37 @@ class YouTubeService:
         )
 
         # 2. 요약 생성
-        summarizer = GeminiSummarizer()
+        if self._summarizer is None or not self._summarizer.client:
+            # 키가 나중에 설정될 수 있으므로 키 없이 만든 경우는 다시 생성
+            self._summarizer = GeminiSummarizer()
+        summarizer = self._summarizer
         content_for_ai = f"Title: {title}\n\nDescription: {description}"
-        generated_summary = summarizer.summarize(title, content_for_ai, lang=lang)
+        generated_summary = await executors.run_in(executors.LLM, summarizer.summarize, title, content_for_ai, lang=lang)
         
         if lang == 'en':
             post_text = f"{generated_summary}\n\n\n📺 Watch the full video:\n{video_url}"
         else:
             post_text = f"{generated_summary}\n\n\n📺 전체 영상 보기:\n{video_url}"
 
-        # 3. 링크드인 포스팅
-        poster = LinkedInPoster()
-        
-        # 썸네일 처리
-        local_image_path = None
-        uploaded_image_urn = None
-        if thumbnail_url:
-            img_res = requests.get(thumbnail_url)
-            if img_res.status_code == 200:
-                local_image_path = f"temp_thumb_{video_id}.jpg"
-                with open(local_image_path, 'wb') as f:
-                    f.write(img_res.content)
-                uploaded_image_urn = poster.upload_image(local_image_path)
-                if os.path.exists(local_image_path):
-                    os.remove(local_image_path)
-
-        result = poster.post_text(post_text, title=title, original_url=video_url, uploaded_image_urn=uploaded_image_urn)
+        # 3. 링크드인 포스팅 (썸네일 다운로드/업로드 포함, 네트워크 풀에서 실행)
+        result = await executors.run_in(
+            executors.NETWORK, self._post_to_linkedin, video_id, video_url, title, post_text, thumbnail_url
+        )
         
         if result:
             return {"status": "success", "message": f"LinkedIn에 성공적으로 포스팅되었습니다 ({lang})."}
         else:
             return {"status": "error", "message": "LinkedIn 포스팅에 실패했습니다."}
 
+    @tracing.traced()
+    def _post_to_linkedin(self, video_id, video_url, title, post_text, thumbnail_url):
+        from core.linkedin_poster import LinkedInPoster
+
+        poster = standins.backend("linkedin", LinkedInPoster, standins.FakeLinkedIn)
+        
+        # 썸네일 URL을 넘기면 메모리로 받아 그대로 업로드 (임시 파일 없음)
+        uploaded_image_urn = None
+        if thumbnail_url:
+            uploaded_image_urn = poster.upload_image(thumbnail_url)
+
+        return poster.post_text(post_text, title=title, original_url=video_url, uploaded_image_urn=uploaded_image_urn)
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# main.py와 같이 web_app을 기준으로 core / services를 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """테스트마다 빈 임시 SQLite DB를 쓰도록 database.engine / SessionLocal 교체"""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from core import database, models
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False})
+    models.Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    yield engine
+    engine.dispose()
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from services.conversion_cache import ConversionCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ConversionCache(cache_dir=str(tmp_path / "cache"), max_bytes=300)
+
+
+def test_key_depends_on_every_part():
+    assert ConversionCache.key("md", "text", "ko") == ConversionCache.key("md", "text", "ko")
+    assert ConversionCache.key("md", "text", "ko") != ConversionCache.key("md", "text", "en")
+    assert ConversionCache.key("md", "text") != ConversionCache.key("html", "text")
+
+
+def test_roundtrip_and_disabled(tmp_path, cache):
+    cache.put_text("a" * 64, "안녕")
+    assert cache.get_text("a" * 64) == "안녕"
+    assert cache.get("b" * 64) is None
+
+    disabled = ConversionCache(cache_dir=str(tmp_path / "off"), max_bytes=0)
+    disabled.put("c" * 64, b"x")
+    assert disabled.get("c" * 64) is None
+    assert not os.path.exists(tmp_path / "off")
+
+
+def test_evicts_least_recently_used(cache):
+    keys = [ConversionCache.key("md", n) for n in range(4)]
+    for key in keys[:3]:
+        cache.put(key, b"x" * 100)
+    for age, key in enumerate(keys[:3]):
+        os.utime(cache._path(key), (1000 + age, 1000 + age))
+    # 가장 오래된 항목을 읽으면 가장 최근 사용으로 바뀜
+    assert cache.get(keys[0]) == b"x" * 100
+
+    cache.put(keys[3], b"y" * 100)
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[3]) == b"y" * 100
+    assert cache._scan_size() <= 270
+
+
+def test_oversized_entry_is_not_stored(cache):
+    cache.put("d" * 64, b"z" * 301)
+    assert cache.get("d" * 64) is None
+
+
+def test_failed_write_keeps_previous_entry(cache, monkeypatch):
+    key = ConversionCache.key("md", "page")
+    cache.put(key, b"old")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(os, "replace", fail)
+        cache.put(key, b"new")
+
+    assert cache.get(key) == b"old"
+    # 남은 임시 파일은 캐시 항목/크기 계산에 포함되지 않음
+    assert [path for _, _, path in cache._entries()] == [cache._path(key)]
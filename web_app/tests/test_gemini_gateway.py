@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from core.gemini_gateway import BATCH, INTERACTIVE, RateLimiter, _PrioritySlots
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    return RateLimiter(db_path=str(tmp_path / "rate.sqlite"), default_rpm=0, limits="limited=60, files = 120",
+                       reserve=0.25)
+
+
+def take_all(limiter, model, level):
+    taken = 0
+    while True:
+        try:
+            limiter.acquire(model, level, deadline=time.monotonic() + 0.05)
+        except TimeoutError:
+            return taken
+        taken += 1
+
+
+def test_limits_parsing(limiter):
+    assert limiter.limits("limited") == (60.0, 15.0)
+    assert limiter.limits("files") == (120.0, 30.0)
+    assert limiter.limits("other") == (0, 1.0)
+
+
+def test_unlimited_model_does_not_touch_the_bucket(limiter, tmp_path):
+    for _ in range(100):
+        limiter.acquire("other")
+    assert not (tmp_path / "rate.sqlite").exists()
+
+
+def test_interactive_can_use_the_whole_bucket(limiter):
+    assert take_all(limiter, "limited", INTERACTIVE) == 15
+
+
+def test_batch_leaves_reserve_for_interactive(limiter):
+    # 버킷 15개 중 25%(3.75개)는 대화형 요청 몫
+    assert take_all(limiter, "limited", BATCH) == 11
+    assert take_all(limiter, "limited", INTERACTIVE) == 4
+
+
+def test_bucket_is_shared_between_limiters_and_penalized(limiter, tmp_path):
+    other = RateLimiter(db_path=str(tmp_path / "rate.sqlite"), default_rpm=0, limits="limited=60", reserve=0.25)
+    assert take_all(limiter, "limited", INTERACTIVE) == 15
+    assert take_all(other, "limited", INTERACTIVE) == 0
+
+    fresh = RateLimiter(db_path=str(tmp_path / "rate.sqlite"), default_rpm=0, limits="files=120")
+    fresh.acquire("files")
+    fresh.penalize("files")
+    assert take_all(fresh, "files", INTERACTIVE) == 0
+
+
+def test_priority_slots_prefer_interactive_then_arrival_order():
+    slots = _PrioritySlots(1)
+    order = []
+
+    def worker(name, level):
+        with slots.acquire(level):
+            order.append(name)
+
+    threads = []
+    with slots.acquire(INTERACTIVE):
+        for name, level in [("batch-1", BATCH), ("interactive-1", INTERACTIVE), ("batch-2", BATCH),
+                            ("interactive-2", INTERACTIVE)]:
+            thread = threading.Thread(target=worker, args=(name, level))
+            thread.start()
+            threads.append(thread)
+            # 도착 순서를 고정하기 위해 대기열에 들어갈 때까지 기다림
+            while len(slots._waiters) < len(threads):
+                time.sleep(0.001)
+    for thread in threads:
+        thread.join(5)
+    assert order == ["interactive-1", "interactive-2", "batch-1", "batch-2"]
+
+
+def test_priority_slots_limit_concurrency():
+    slots = _PrioritySlots(2)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def worker():
+        with slots.acquire(BATCH):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert peak[0] == 2
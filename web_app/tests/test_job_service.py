@@ -0,0 +1,102 @@
+import os
+import time
+import threading
+
+import pytest
+
+from core import database, models
+from services.job_service import JobManager, JobQueueFull
+
+DEAD_PID = "999999999"
+
+
+@pytest.fixture
+def jobs(db, tmp_path):
+    manager = JobManager(max_workers=1, max_pending=1, scratch_dir=str(tmp_path / "jobs"))
+    yield manager
+    manager.shutdown()
+
+
+def wait_for(jobs, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = jobs.get(job_id)
+        if job["status"] in ("success", "error"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_reserve_is_limited_to_workers_plus_pending(jobs):
+    jobs.reserve()
+    jobs.reserve()
+    with pytest.raises(JobQueueFull):
+        jobs.reserve()
+    jobs.release()
+    jobs.reserve()
+
+
+def test_submit_rejects_over_limit_and_cleans_job_dir(jobs):
+    started, release = threading.Event(), threading.Event()
+
+    def blocking(progress):
+        started.set()
+        release.wait(5)
+        return {"ok": True}
+
+    running = jobs.submit("test", blocking, user_id=1)
+    assert started.wait(5)
+    queued = jobs.submit("test", lambda progress: {"n": 2}, user_id=1)
+
+    job_id = jobs.new_job_id()
+    job_dir = jobs.job_dir(job_id)
+    with pytest.raises(JobQueueFull):
+        jobs.submit("test", lambda progress: None, job_id=job_id)
+    assert not os.path.exists(job_dir)
+    assert jobs.get(job_id) is None
+
+    release.set()
+    assert wait_for(jobs, running)["result"] == {"ok": True}
+    assert wait_for(jobs, queued)["result"] == {"n": 2}
+    # 끝난 작업의 자리는 다시 쓸 수 있음
+    assert wait_for(jobs, jobs.submit("test", lambda progress: {}))["status"] == "success"
+
+
+def test_reserved_submit_uses_the_reserved_slot(jobs):
+    jobs.reserve()
+    jobs.reserve()
+    job_id = jobs.submit("test", lambda progress: {}, reserved=True)
+    assert wait_for(jobs, job_id)["status"] == "success"
+    jobs.reserve()
+
+
+def test_failed_job_records_error_and_frees_slot(jobs):
+    def failing(progress):
+        progress("encode", 0.5)
+        raise RuntimeError("boom")
+
+    job = wait_for(jobs, jobs.submit("test", failing))
+    assert job["status"] == "error"
+    assert job["error"] == "boom"
+    jobs.reserve()
+    jobs.reserve()
+
+
+def test_recover_orphans_only_marks_jobs_of_dead_workers(jobs):
+    session = database.SessionLocal()
+    session.add_all([
+        models.Job(id="dead-running", kind="test", status="running", owner=DEAD_PID),
+        models.Job(id="dead-queued", kind="test", status="queued", owner=DEAD_PID),
+        models.Job(id="alive", kind="test", status="running", owner=str(os.getpid())),
+        models.Job(id="done", kind="test", status="success", owner=DEAD_PID),
+    ])
+    session.commit()
+    session.close()
+
+    jobs.recover_orphans()
+
+    found = jobs.get_many(["dead-running", "dead-queued", "alive", "done"])
+    assert found["dead-running"]["status"] == "error"
+    assert found["dead-queued"]["status"] == "error"
+    assert found["alive"]["status"] == "running"
+    assert found["done"]["status"] == "success"
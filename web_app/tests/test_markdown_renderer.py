@@ -0,0 +1,39 @@
+from services.markdown_renderer import render_inline, render_markdown
+
+
+def test_link_target_with_balanced_parentheses():
+    html = render_inline("[a](http://x.com/f(1))")
+    assert 'href="http://x.com/f(1)"' in html
+    assert html.endswith(">a</a>")
+
+
+def test_image_target_with_balanced_parentheses():
+    html = render_inline('![logo](img/logo_(v2).png "title")')
+    assert 'src="img/logo_(v2).png"' in html
+    assert 'title="title"' in html
+
+
+def test_link_followed_by_parenthesized_text():
+    html = render_inline("[a](b) (c)")
+    assert 'href="b"' in html
+    assert html.endswith("</a> (c)")
+
+
+def test_escaped_asterisks_are_not_emphasis():
+    assert render_inline(r"\*not em\*") == "*not em*"
+
+
+def test_escaped_underscores_and_brackets():
+    assert render_inline(r"\_x\_ \[y\](z)") == "_x_ [y](z)"
+
+
+def test_escaped_dollar_is_left_for_mathjax():
+    assert render_inline(r"\$5 and \$6") == r"\$5 and \$6"
+
+
+def test_backslash_before_letter_is_kept():
+    assert render_inline(r"C:\path") == r"C:\path"
+
+
+def test_emphasis_still_renders_next_to_escapes():
+    assert render_markdown(r"*em* \*") == '<p class="my-4"><em>em</em> *</p>'
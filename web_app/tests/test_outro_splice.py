@@ -0,0 +1,114 @@
+import json
+import subprocess
+
+import pytest
+
+from services.youtube_service import load_youtube_poster
+
+H264_VIDEO = {
+    "codec_type": "video", "codec_name": "h264", "profile": "High", "level": 40,
+    "width": 1920, "height": 1080, "pix_fmt": "yuv420p", "sample_aspect_ratio": "1:1",
+    "color_range": "tv", "color_space": "bt709", "color_primaries": "bt709", "color_transfer": "unknown",
+    "time_base": "1/15360",
+}
+AAC_AUDIO = {"codec_type": "audio", "codec_name": "aac", "sample_rate": "48000", "channels": 2}
+
+
+@pytest.fixture(scope="module")
+def poster_cls():
+    return load_youtube_poster()
+
+
+@pytest.fixture
+def poster(poster_cls):
+    # __init__은 OAuth 인증과 Gemini 클라이언트를 만들므로 건너뜀
+    return poster_cls.__new__(poster_cls)
+
+
+def stub_check_output(monkeypatch, output):
+    calls = []
+
+    def check_output(cmd, text=False):
+        calls.append(cmd)
+        return output
+
+    monkeypatch.setattr(subprocess, "check_output", check_output)
+    return calls
+
+
+def test_find_keyframe_before_picks_last_keyframe_up_to_position(poster, monkeypatch):
+    calls = stub_check_output(monkeypatch, "10.0,K__\n11.5,___\n12.0,K__\nN/A,K__\n14.0005,K__\n15.0,K__\n")
+    assert poster.find_keyframe_before("in.mp4", 14.0) == 14.0005
+    assert "-read_intervals" in calls[0] and calls[0][calls[0].index("-read_intervals") + 1] == "0%14.001"
+
+
+def test_find_keyframe_before_without_keyframe(poster, monkeypatch):
+    stub_check_output(monkeypatch, "11.5,___\n")
+    assert poster.find_keyframe_before("in.mp4", 14.0) is None
+
+
+def test_probe_streams_returns_first_video_and_audio(poster, monkeypatch):
+    stub_check_output(monkeypatch, json.dumps({"streams": [AAC_AUDIO, H264_VIDEO, dict(AAC_AUDIO, channels=6)]}))
+    streams = poster.probe_streams("in.mp4")
+    assert streams == {"video": H264_VIDEO, "audio": AAC_AUDIO}
+
+
+@pytest.mark.parametrize("key, value", [
+    ("profile", "Main"), ("level", 41), ("sample_aspect_ratio", "4:3"),
+    ("color_range", "pc"), ("color_space", "bt470bg"), ("color_primaries", "bt2020"),
+    ("color_transfer", "bt709"), ("time_base", "1/90000"),
+])
+def test_splice_signature_differs_on_stream_parameters(poster_cls, key, value):
+    head = {"video": H264_VIDEO, "audio": AAC_AUDIO}
+    tail = {"video": dict(H264_VIDEO, **{key: value}), "audio": AAC_AUDIO}
+    assert poster_cls._splice_signature(head) == poster_cls._splice_signature(dict(head))
+    assert poster_cls._splice_signature(head) != poster_cls._splice_signature(tail)
+
+
+def test_tail_encoder_args_match_h264_source(poster_cls):
+    args = poster_cls._tail_encoder_args(H264_VIDEO, "libx264")
+    assert args == ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-profile:v", "high", "-level", "4.0",
+                    "-color_range", "tv", "-colorspace", "bt709", "-color_primaries", "bt709"]
+
+
+def test_tail_encoder_args_hevc_level_and_unsupported_profile(poster_cls):
+    video = dict(H264_VIDEO, codec_name="hevc", profile="Main 10", level=93, pix_fmt="yuv420p10le")
+    args = poster_cls._tail_encoder_args(video, "libx265")
+    assert args[args.index("-profile:v") + 1] == "main10"
+    assert args[args.index("-x265-params") + 1] == "level-idc=3.1"
+    assert poster_cls._tail_encoder_args(dict(video, profile="Rext"), "libx265") is None
+
+
+@pytest.mark.parametrize("time_base, expected", [("1/15360", 15360), ("1/90000", 90000), ("1001/30000", None),
+                                                 (None, None), ("bogus", None)])
+def test_track_timescale(poster_cls, time_base, expected):
+    assert poster_cls._track_timescale(time_base) == expected
+
+
+def test_add_outro_fast_falls_back_when_tail_parameters_differ(poster, monkeypatch, tmp_path):
+    source = {"video": H264_VIDEO, "audio": AAC_AUDIO}
+    parts = {"part0": dict(source, video=dict(H264_VIDEO, time_base="1/90000")),
+             "tail": dict(source, video=dict(H264_VIDEO, time_base="1/90000", color_range="pc"))}
+    commands = []
+
+    def run_ffmpeg(cmd, duration=None, progress=None):
+        commands.append(cmd)
+        if "segment" in cmd:
+            for n in range(2):
+                (tmp_path / f".out.part{n}.ts").write_bytes(b"")
+        return 0, ""
+
+    monkeypatch.setattr(poster, "probe_streams",
+                        lambda path: next((s for key, s in parts.items() if f".{key}." in path), source))
+    monkeypatch.setattr(poster, "find_keyframe_before", lambda path, position: 50.0)
+    monkeypatch.setattr(poster, "get_outro_clip", lambda *args: "outro.mp4")
+    monkeypatch.setattr(poster, "get_video_info", lambda path: (10.0,))
+    monkeypatch.setattr(poster, "run_ffmpeg", run_ffmpeg)
+
+    info = {"duration": 60.0, "start_time": 0.0, "width": 1920, "height": 1080, "fps": 30, "pix_fmt": "yuv420p"}
+    assert poster.add_outro_fast("in.mp4", "logo.png", str(tmp_path / "out.mp4"), info) is False
+    # 꼬리는 원본 프로파일/레벨/색 정보로 인코딩하고, 그래도 다르면 이어 붙이지 않음
+    assert len(commands) == 2
+    assert commands[1][commands[1].index("-profile:v") + 1] == "high"
+    assert commands[1][commands[1].index("-level") + 1] == "4.0"
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,92 @@
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from services.resumable_upload_service import (
+    ResumableUploadService, UploadSessionError, merge_ranges, parse_content_range
+)
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def uploads(db, tmp_path):
+    return ResumableUploadService(session_dir=str(tmp_path / "sessions"))
+
+
+async def body(data, piece=1000):
+    for i in range(0, len(data), piece):
+        yield data[i:i + piece]
+
+
+def put(uploads, upload_id, start, end, data=DATA, user_id=1):
+    header = f"bytes {start}-{end - 1}/{len(data)}"
+    return asyncio.run(uploads.write_range(upload_id, user_id, header, body(data[start:end])))
+
+
+def test_parse_content_range():
+    assert parse_content_range("bytes 0-1023/4096") == (0, 1024, 4096)
+    for header in ("bytes 10-5/100", "0-10/100", None):
+        with pytest.raises(UploadSessionError):
+            parse_content_range(header)
+
+
+def test_merge_ranges():
+    assert merge_ranges([(5, 8), (0, 3), (3, 4), (7, 10)]) == [[0, 4], [5, 10]]
+
+
+def test_out_of_order_ranges_and_finalize(uploads, tmp_path):
+    upload_id = uploads.create(1, "../clip.mp4", len(DATA))["upload_id"]
+
+    status = put(uploads, upload_id, 4096, 8192)
+    assert (status["offset"], status["received"], status["ranges"]) == (0, 4096, [[4096, 8192]])
+    status = put(uploads, upload_id, 0, 4096)
+    assert (status["offset"], status["ranges"]) == (8192, [[0, 8192]])
+
+    with pytest.raises(UploadSessionError) as exc:
+        uploads.finalize(upload_id, 1, str(tmp_path / "out.mp4"))
+    assert exc.value.status_code == 409
+    assert uploads.status(upload_id, 1)["status"] == "open"
+
+    put(uploads, upload_id, 8192, len(DATA))
+    dest = tmp_path / "out.mp4"
+    result = uploads.finalize(upload_id, 1, str(dest))
+    assert result["sha256"] == hashlib.sha256(DATA).hexdigest()
+    assert result["filename"] != "../clip.mp4"
+    assert dest.read_bytes() == DATA
+    assert not os.path.exists(uploads.data_path(upload_id))
+
+    with pytest.raises(UploadSessionError) as exc:
+        uploads.finalize(upload_id, 1, str(dest))
+    assert exc.value.status_code == 409
+
+
+def test_range_checks(uploads):
+    upload_id = uploads.create(1, "clip.mp4", len(DATA))["upload_id"]
+    with pytest.raises(UploadSessionError) as exc:
+        asyncio.run(uploads.write_range(upload_id, 1, f"bytes 0-9/{len(DATA) + 1}", body(DATA[:10])))
+    assert exc.value.status_code == 416
+    with pytest.raises(UploadSessionError) as exc:
+        put(uploads, upload_id, 0, 10, user_id=2)
+    assert exc.value.status_code == 404
+    # 본문이 Content-Range보다 짧으면 범위를 기록하지 않음
+    with pytest.raises(UploadSessionError):
+        asyncio.run(uploads.write_range(upload_id, 1, f"bytes 0-99/{len(DATA)}", body(DATA[:50])))
+    assert uploads.status(upload_id, 1)["received"] == 0
+
+
+def test_reopen_after_failed_submit(uploads, tmp_path):
+    upload_id = uploads.create(1, "clip.mp4", len(DATA))["upload_id"]
+    put(uploads, upload_id, 0, len(DATA))
+    dest = tmp_path / "out.mp4"
+    uploads.finalize(upload_id, 1, str(dest))
+
+    uploads.reopen(upload_id, 1, str(dest))
+    status = uploads.status(upload_id, 1)
+    assert (status["status"], status["offset"]) == ("open", len(DATA))
+    assert not dest.exists()
+
+    assert uploads.finalize(upload_id, 1, str(dest))["sha256"] == hashlib.sha256(DATA).hexdigest()
+    assert dest.read_bytes() == DATA
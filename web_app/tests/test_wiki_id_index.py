@@ -0,0 +1,90 @@
+import pytest
+
+from core.standins import FakeFirebase
+from services.wiki_id_index import WikiIdIndex, unique_id
+
+
+@pytest.fixture
+def firebase():
+    return FakeFirebase()
+
+
+@pytest.fixture
+def index(firebase):
+    return WikiIdIndex(firebase, ttl=3600)
+
+
+def test_unique_id():
+    assert unique_id("a", set()) == "a"
+    assert unique_id("a", {"a", "a-2"}) == "a-3"
+
+
+def test_claim_is_idempotent_per_title(index, firebase):
+    assert index.claim("Title", "title") == "title"
+    assert index.claim("Title", "other") == "title"
+    assert firebase.claims == {"Title": "title"}
+
+
+def test_locally_known_collision_gets_suffix(index, firebase):
+    index.claim("First", "same")
+    assert index.claim("Second", "same") == "same-2"
+    assert index.claim_many({"Third": "same", "Fourth": "same"}, publish=False) == {"Third": "same-3", "Fourth": "same-4"}
+    assert index.lookup("Fourth") == "same-4"
+
+
+def test_remote_collision_is_retried_with_suffix(index, firebase):
+    index.snapshot()
+    # 인덱스를 읽은 뒤 다른 워커가 먼저 등록한 ID
+    firebase.claims["Elsewhere"] = "page"
+    assert index.claim("Here", "page") == "page-2"
+    assert firebase.claims["Here"] == "page-2"
+
+    firebase.claims.update({"Elsewhere 3": "next", "Elsewhere 4": "next-2"})
+    claimed = index.claim("There", "next")
+    assert claimed not in ("next", "next-2")
+    assert firebase.claims["There"] == claimed
+
+
+def test_title_claimed_elsewhere_keeps_existing_id(index, firebase):
+    index.snapshot()
+    firebase.claims["Shared"] = "shared-remote"
+    assert index.claim("Shared", "shared") == "shared-remote"
+    assert index.lookup("Shared") == "shared-remote"
+
+
+def test_claims_do_not_write_the_aggregate_map(index, firebase):
+    claimed = index.claim_many({"A": "a", "B": "b"}, publish=False)
+    assert firebase.id_map == {}
+    assert index.publish(claimed)
+    assert firebase.id_map == {"A": "a", "B": "b"}
+    assert not index.publish({})
+
+
+def test_gives_up_after_max_attempts(index, firebase, monkeypatch):
+    monkeypatch.setattr(firebase, "claim_ids", lambda mapping: {title: None for title in mapping})
+    with pytest.raises(RuntimeError):
+        index.claim("Never", "never")
+    assert index.lookup("Never") is None
+
+
+def test_unsaved_claims_survive_reload(index, firebase, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setattr(firebase, "claim_ids", lambda mapping: None)
+        assert index.claim_many({"Offline": "offline"}) is None
+    assert index.lookup("Offline") == "offline"
+
+    index._reload(firebase.get_id_map())
+    assert index.lookup("Offline") == "offline"
+    # 같은 ID는 다른 제목에 다시 배정하지 않음
+    assert index.claim("Other", "offline") == "offline-2"
+
+    firebase.claims["Offline"] = "offline"
+    index._reload(firebase.get_id_map())
+    assert index._unsaved == {}
+
+
+def test_watch_merge_replaces_changed_entries(index):
+    index.claim("Moved", "old-id")
+    index._merge({"Moved": "new-id"})
+    assert index.lookup("Moved") == "new-id"
+    assert "old-id" not in index._titles
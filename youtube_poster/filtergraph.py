@@ -0,0 +1,159 @@
+"""
+Shared ffmpeg filtergraph for the logo watermark + outro used by youtube_poster and video_editor.
+
+Inputs are [0:v] (the video) and [1:v] (the logo image). The graph:
+  - overlays a static logo (logo_width px) at the bottom-right for the whole video
+  - for the last OUTRO_SECONDS: fades in a white frame, draws the URL text and
+    grows the logo from 0 to OUTRO_LOGO_WIDTH px in the center
+  - optionally burns in subtitles (libass) before the overlays
+
+The outro components can be switched off one by one so benchmarks/bench_ffmpeg.py
+can measure what each of them costs.
+
+The outro only depends on the logo and the video format, so youtube_poster renders it once
+with outro_command (a transparent OUTRO_SECONDS clip, cached on disk) and encodes videos with
+watermark_filtergraph, which lays that clip over the tail instead of evaluating the outro
+expressions on every frame. logo_filtergraph is the single-pass equivalent.
+"""
+
+OUTRO_SECONDS = 3
+OUTRO_LOGO_WIDTH = 800
+OUTRO_URL = "https\\://banya.ai"
+DEFAULT_FONT_PATH = "/System/Library/Fonts/Supplemental/Arial Italic.ttf"
+
+# Alpha-capable counterpart of the video's pixel format for the pre-rendered outro,
+# so overlaying it does not convert every frame
+ALPHA_FORMATS = {
+    "yuv420p": "yuva420p", "yuvj420p": "yuva420p",
+    "yuv422p": "yuva422p", "yuvj422p": "yuva422p",
+    "yuv444p": "yuva444p", "yuvj444p": "yuva444p",
+}
+
+
+def escape_filter_path(path):
+    """Escapes a file path for use inside an ffmpeg filter argument (colons, backslashes, quotes)."""
+    return path.replace('\\', '\\\\').replace(':', '\\\\:').replace("'", "'\\\\''")
+
+
+def subtitles_filter(srt_name, force_style):
+    """subtitles= filter for an SRT file name relative to ffmpeg's working directory."""
+    srt_name_esc = srt_name.replace("'", "'\\''")
+    return f"subtitles='{srt_name_esc}':force_style='{force_style}'"
+
+
+def logo_filtergraph(width, height, duration, margin=30, logo_width=180, font_path=DEFAULT_FONT_PATH,
+                     subtitles=None, white_fade=True, url_text=True, animated_logo=True, static_logo=True):
+    """
+    Returns the -filter_complex string.
+
+    subtitles: a subtitles filter (see subtitles_filter) applied to the video first, or None
+    white_fade / url_text / animated_logo: outro components; with all three off only the
+    static watermark is applied
+    static_logo: the bottom-right watermark; off for outro-only videos
+    """
+    outro_start = max(0, duration - OUTRO_SECONDS)
+    enable = f"enable='gte(t,{outro_start})'"
+
+    chains = []
+    video = "[0:v]"
+    if subtitles:
+        chains.append(f"[0:v]{subtitles}[v_sub]")
+        video = "[v_sub]"
+
+    animated_scale = (
+        f"scale='if(gte(t,{outro_start}), "
+        f"min({OUTRO_LOGO_WIDTH}, {OUTRO_LOGO_WIDTH}*(t-{outro_start})/2.0), 0)':-1:eval=frame[out_logo]"
+    )
+    if animated_logo and static_logo:
+        chains.append("[1:v]split[static][animated]")
+        chains.append(f"[static]scale={logo_width}:-1[st_logo]")
+        chains.append(f"[animated]{animated_scale}")
+    elif animated_logo:
+        chains.append(f"[1:v]{animated_scale}")
+    elif static_logo:
+        chains.append(f"[1:v]scale={logo_width}:-1[st_logo]")
+    if white_fade:
+        chains.append(f"color=c=white:s={width}x{height}:d={OUTRO_SECONDS}[white_src]")
+        chains.append("[white_src]fade=t=in:st=0:d=1.5:alpha=1[white_bg]")
+
+    last = video
+    if static_logo:
+        chains.append(f"{video}[st_logo]overlay=W-w-{margin}:H-h-{margin}[v1]")
+        last = "[v1]"
+    if white_fade:
+        chains.append(f"{last}[white_bg]overlay={enable}[v2]")
+        last = "[v2]"
+    if url_text:
+        font_path_esc = escape_filter_path(font_path)
+        chains.append(
+            f"{last}drawtext=text='{OUTRO_URL}':fontfile='{font_path_esc}':fontsize=45:fontcolor=black:"
+            f"x=(w-tw)/2:y=(h/2)+130:{enable}[v3]"
+        )
+        last = "[v3]"
+    if animated_logo:
+        chains.append(f"{last}[out_logo]overlay=(W-w)/2:(H-h)/2:{enable}")
+    elif chains:
+        # The last chain's output label is left unconnected so ffmpeg maps it as the output
+        chains[-1] = chains[-1][:chains[-1].rindex("[")]
+    else:
+        chains.append("[0:v]null")
+    return ";".join(chains)
+
+
+def outro_filtergraph(width, height, fps, font_path=DEFAULT_FONT_PATH, pix_fmt="yuv420p"):
+    """
+    Renders the outro on its own as a transparent clip (t starts at 0); input [0:v] is the logo
+    looped at the video's frame rate. Same look as the outro part of logo_filtergraph.
+    """
+    font_path_esc = escape_filter_path(font_path)
+    return ";".join([
+        f"color=c=white:s={width}x{height}:r={fps}:d={OUTRO_SECONDS},format=rgba,"
+        f"fade=t=in:st=0:d=1.5:alpha=1,"
+        f"drawtext=text='{OUTRO_URL}':fontfile='{font_path_esc}':fontsize=45:fontcolor=black:"
+        f"x=(w-tw)/2:y=(h/2)+130[bg]",
+        f"[0:v]scale='max(2, min({OUTRO_LOGO_WIDTH}, {OUTRO_LOGO_WIDTH}*t/2.0))':-1:eval=frame[logo]",
+        f"[bg][logo]overlay=(W-w)/2:(H-h)/2:format=rgb:shortest=1,format={ALPHA_FORMATS.get(pix_fmt, 'yuva444p')}",
+    ])
+
+
+def outro_command(logo_input, output, width, height, fps, pix_fmt="yuv420p", font_path=DEFAULT_FONT_PATH):
+    """ffmpeg command rendering the outro clip (lossless FFV1 with alpha, output should be .mkv)."""
+    return [
+        'ffmpeg', '-y',
+        '-loop', '1', '-framerate', str(fps), '-t', str(OUTRO_SECONDS), '-i', logo_input,
+        '-filter_complex', outro_filtergraph(width, height, fps, font_path, pix_fmt),
+        '-c:v', 'ffv1', '-an',
+        output
+    ]
+
+
+def outro_inputs(outro_clip, duration):
+    """ffmpeg input args for a pre-rendered outro clip, shifted to start at duration - OUTRO_SECONDS."""
+    return ['-itsoffset', str(max(0, duration - OUTRO_SECONDS)), '-i', outro_clip]
+
+
+def watermark_filtergraph(margin=30, logo_width=180, subtitles=None, outro_input=None, static_logo=True):
+    """
+    Returns the -filter_complex string for the static watermark ([1:v] on [0:v]).
+
+    subtitles: a subtitles filter applied to the video first, or None
+    outro_input: label of a pre-rendered outro clip added with outro_inputs (e.g. "[2:v]");
+    overlay passes frames through untouched until the clip starts
+    static_logo: the bottom-right watermark; off for outro-only videos
+    """
+    chains = []
+    video = "[0:v]"
+    if subtitles:
+        chains.append(f"[0:v]{subtitles}[v_sub]")
+        video = "[v_sub]"
+    if static_logo:
+        chains.append(f"[1:v]scale={logo_width}:-1[st_logo]")
+        chains.append(f"{video}[st_logo]overlay=W-w-{margin}:H-h-{margin}[v1]")
+        video = "[v1]"
+    if outro_input:
+        chains.append(f"{video}{outro_input}overlay=0:0[v2]")
+    if not chains:
+        return "[0:v]null"
+    # The last chain's output label is left unconnected so ffmpeg maps it as the output
+    chains[-1] = chains[-1][:chains[-1].rindex("[")]
+    return ";".join(chains)
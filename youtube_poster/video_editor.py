@@ -3,6 +3,8 @@ import os
 import sys
 import json
 
+from filtergraph import logo_filtergraph
+
 def get_video_duration(video_path):
     """Returns the duration of a video in seconds."""
     cmd = [
@@ -51,25 +53,12 @@ def add_logo_to_video(video_input, logo_input, video_output, margin=30, logo_wid
     print(f"Adding white fade and logo animation to {video_input}...")
     print(f"Video duration: {duration}s, Outro starts at: {outro_start}s")
     
-    # Filter Explanation:
+    # Filter Explanation (see filtergraph.py):
     # 1. Split logo for static and animated versions.
     # 2. Create a white background that fades in over 1.5 seconds.
     # 3. Scale animated logo from 0 to 800px over 2 seconds.
     # 4. Overlay static logo, white fade-in, draw italic URL, and then the animated center logo.
-    
-    font_path = "/System/Library/Fonts/Supplemental/Arial Italic.ttf"
-    
-    filter_complex = (
-        f"[1:v]split[static][animated];"
-        f"[static]scale={logo_width}:-1[st_logo];"
-        f"[animated]scale='if(gte(t,{outro_start}), min(800, 800*(t-{outro_start})/2.0), 0)':-1:eval=frame[out_logo];"
-        f"color=c=white:s={width}x{height}:d=3[white_src];"
-        f"[white_src]fade=t=in:st=0:d=1.5:alpha=1[white_bg];"
-        f"[0:v][st_logo]overlay=W-w-{margin}:H-h-{margin}[v1];"
-        f"[v1][white_bg]overlay=enable='gte(t,{outro_start})'[v2];"
-        f"[v2]drawtext=text='https\\://banya.ai':fontfile='{font_path}':fontsize=45:fontcolor=black:x=(w-tw)/2:y=(h/2)+130:enable='gte(t,{outro_start})'[v3];"
-        f"[v3][out_logo]overlay=(W-w)/2:(H-h)/2:enable='gte(t,{outro_start})'"
-    )
+    filter_complex = logo_filtergraph(width, height, duration, margin=margin, logo_width=logo_width)
     
     cmd = [
         'ffmpeg', '-y',
@@ -7,7 +7,9 @@ import re
 import shutil
 import time
 import stat
+import hashlib
 import tempfile
+import threading
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
@@ -17,12 +19,53 @@ from dotenv import load_dotenv
 
 # Add project root to path to import from core
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.summarizer import GeminiSummarizer
+from filtergraph import (
+    escape_filter_path, subtitles_filter, logo_filtergraph, watermark_filtergraph, outro_filtergraph, outro_command,
+    outro_inputs, OUTRO_SECONDS
+)
+
+try:
+    # web_app에서 실행될 때만 메트릭 기록 (web_app/core/metrics.py)
+    from core.metrics import track_call, observe_ffmpeg
+except ImportError:
+    from contextlib import nullcontext
+    track_call = lambda *args: nullcontext()
+    observe_ffmpeg = lambda *args, **kwargs: None
+
+try:
+    # web_app에서 실행될 때는 AUTOPOSTER_BACKEND에 따라 기록/재생/가짜 클라이언트 사용 (web_app/core/standins.py)
+    from core import standins
+except ImportError:
+    standins = None
 
 load_dotenv()
 
+# Pre-rendered outro clips, one per (logo, width, height, fps, pixel format)
+OUTRO_CACHE_DIR = os.getenv("OUTRO_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), 'outro_cache'))
+
+# Outro-only fast path: source video codec -> encoder for the re-encoded tail, and audio codecs
+# that can be stream-copied through the MPEG-TS parts it joins
+SPLICE_VIDEO_ENCODERS = {'h264': 'libx264', 'hevc': 'libx265'}
+SPLICE_AUDIO_CODECS = {'aac', 'mp3', 'ac3', 'eac3', 'opus'}
+# ffprobe profile name -> encoder -profile:v value, so the tail matches the stream-copied head
+SPLICE_PROFILES = {
+    'h264': {'Constrained Baseline': 'baseline', 'Baseline': 'baseline', 'Main': 'main', 'High': 'high',
+             'High 10': 'high10', 'High 4:2:2': 'high422', 'High 4:4:4 Predictive': 'high444'},
+    'hevc': {'Main': 'main', 'Main 10': 'main10', 'Main Still Picture': 'mainstillpicture', 'Rext': None},
+}
+# Colour properties ffprobe reports -> ffmpeg output option that sets them
+SPLICE_COLOR_OPTIONS = {
+    'color_range': '-color_range', 'color_space': '-colorspace',
+    'color_primaries': '-color_primaries', 'color_transfer': '-color_trc',
+}
+
 class YouTubeAutoPoster:
+    _outro_locks = {}
+    _outro_locks_guard = threading.Lock()
+
     def __init__(self, client_secrets_file='client_secrets.json'):
         # 먼저 secrets/ 디렉토리 확인, 없으면 현재 디렉토리
         secrets_path = os.path.join(os.path.dirname(__file__), '..', 'secrets', client_secrets_file)
@@ -32,7 +75,10 @@ class YouTubeAutoPoster:
             self.client_secrets_file = os.path.join(os.path.dirname(__file__), client_secrets_file)
         self.token_file = os.path.join(os.path.dirname(__file__), 'token.pickle')
         self.scopes = ['https://www.googleapis.com/auth/youtube.upload']
-        self.youtube = self._get_authenticated_service()
+        if standins:
+            self.youtube = standins.backend("youtube", self._get_authenticated_service, shared=False)
+        else:
+            self.youtube = self._get_authenticated_service()
         self.summarizer = GeminiSummarizer()
 
     def _get_client_secrets_path(self):
@@ -121,9 +167,8 @@ class YouTubeAutoPoster:
               "tags": ["tag1", "tag2", ...]
             }}
             """
-            response = self.summarizer.client.models.generate_content(
-                model=self.summarizer.model_id,
-                contents=[prompt, types.Part.from_bytes(data=pdf_data, mime_type='application/pdf')]
+            response = self.summarizer.generate(
+                [prompt, types.Part.from_bytes(data=pdf_data, mime_type='application/pdf')], "youtube_metadata"
             )
             # Remove any markdown code block wrappers if present
             clean_text = re.sub(r'```json\s*|\s*```', '', response.text.strip())
@@ -141,7 +186,19 @@ class YouTubeAutoPoster:
             print(f"❌ Error generating metadata: {e}")
             return {"title": "Default Title", "description": desc_template, "tags": []}
 
-    def upload_video(self, video_path, metadata):
+    @staticmethod
+    def _upload_chunks(request, progress=None):
+        response = None
+        while response is None:
+            status, response = request.next_chunk()
+            if status:
+                print(f"   - Uploaded {int(status.progress() * 100)}%")
+                if progress:
+                    progress(status.progress(), bytes=status.resumable_progress, total=status.total_size)
+        return response
+
+    def upload_video(self, video_path, metadata, progress=None):
+        """Uploads the video; progress(ratio, bytes=, total=) is called for each uploaded chunk."""
         print(f"🚀 Uploading video to YouTube: {video_path}")
         body = {
             'snippet': {
@@ -155,15 +212,14 @@ class YouTubeAutoPoster:
                 'selfDeclaredMadeForKids': False
             }
         }
-        media = MediaFileUpload(video_path, chunksize=-1, resumable=True)
+        # A single-request upload (chunksize=-1) reports no progress, so use chunks when someone is listening
+        chunksize = int(os.getenv("YOUTUBE_UPLOAD_CHUNK_MB", "8")) * 1024 * 1024 if progress else -1
+        media = MediaFileUpload(video_path, chunksize=chunksize, resumable=True)
         request = self.youtube.videos().insert(part=','.join(body.keys()), body=body, media_body=media)
         
         try:
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    print(f"   - Uploaded {int(status.progress() * 100)}%")
+            with track_call("youtube", "insert"):
+                response = self._upload_chunks(request, progress)
             print(f"✅ Video uploaded successfully! ID: {response['id']}")
             return response['id']
         except Exception as e:
@@ -175,20 +231,39 @@ class YouTubeAutoPoster:
                 print(f"\n❌ YouTube Upload Error: {e}")
             return None
 
-    def get_video_info(self, video_path):
-        cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries', 'format=duration:stream=width,height', '-of', 'json', video_path]
+    def probe_video(self, video_path):
+        """Returns duration, width, height, fps (ffprobe rate string), pix_fmt and start_time of the first video stream, or None."""
+        cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0', '-show_entries',
+               'format=duration,start_time:stream=width,height,r_frame_rate,avg_frame_rate,pix_fmt', '-of', 'json', video_path]
         try:
             output = subprocess.check_output(cmd, text=True).strip()
             data = json.loads(output)
-            return float(data['format']['duration']), int(data['streams'][0]['width']), int(data['streams'][0]['height'])
+            stream = data['streams'][0]
+            fps = stream.get('r_frame_rate')
+            if not fps or fps.startswith('0/'):
+                fps = stream.get('avg_frame_rate')
+            return {
+                'duration': float(data['format']['duration']),
+                'width': int(stream['width']),
+                'height': int(stream['height']),
+                'fps': fps if fps and not fps.startswith('0/') else None,
+                'pix_fmt': stream.get('pix_fmt'),
+                'start_time': float(data['format'].get('start_time') or 0),
+            }
         except Exception:
+            return None
+
+    def get_video_info(self, video_path):
+        info = self.probe_video(video_path)
+        if not info:
             return 0, 1280, 720
+        return info['duration'], info['width'], info['height']
 
     def generate_subtitles(self, video_path, lang='ko'):
         print(f"🎙️ Generating keyword-focused subtitles using Gemini (Language: {lang})...")
         try:
-            with open(video_path, 'rb') as f:
-                video_data = f.read()
+            # Stream the video to the Gemini Files API instead of reading it into memory
+            video_file = self._upload_to_gemini(video_path, mime_type='video/mp4')
             lang_str = "Korean" if lang == 'ko' else "English"
             examples = (
                 '"AGI 시대의 새로운 패러다임 분석", "혁신적인 AI 아키텍처의 도약", "한국형 소브린 AI의 전략적 가치"'
@@ -213,10 +288,15 @@ class YouTubeAutoPoster:
             
             Return ONLY the raw SRT content.
             """
-            response = self.summarizer.client.models.generate_content(
-                model=self.summarizer.model_id,
-                contents=[prompt, types.Part.from_bytes(data=video_data, mime_type='video/mp4')]
-            )
+            try:
+                # 영상 분석은 오래 걸리므로 시간 제한을 넉넉히
+                response = self.summarizer.generate([prompt, video_file], "subtitles", timeout=600)
+            finally:
+                # 분석이 실패해도 올린 영상은 지움
+                try:
+                    self.summarizer.delete_file(video_file.name)
+                except Exception:
+                    pass
             srt_content = response.text.strip()
             
             # Remove markdown code blocks and any leading/trailing text
@@ -291,22 +371,304 @@ class YouTubeAutoPoster:
             print(f"❌ Error generating subtitles: {e}")
             return None
 
+    def _upload_to_gemini(self, path, mime_type, timeout=600):
+        """Uploads a file to the Gemini Files API and waits until it is ready for use."""
+        uploaded = self.summarizer.upload_file(path, mime_type)
+        deadline = time.time() + timeout
+        while uploaded.state and uploaded.state.name == 'PROCESSING':
+            if time.time() > deadline:
+                raise TimeoutError(f"Gemini file processing timed out: {uploaded.name}")
+            time.sleep(2)
+            uploaded = self.summarizer.get_file(uploaded.name)
+        if uploaded.state and uploaded.state.name == 'FAILED':
+            raise RuntimeError(f"Gemini file processing failed: {uploaded.name}")
+        return uploaded
+
     def ffmpeg_filter_escape(self, path):
         """Robustly escapes a file path for use in FFmpeg filters on macOS."""
         # On macOS, colons in absolute paths (/Volumes/...) must be escaped as \\:
         # Also need to escape backslashes and single quotes.
-        return path.replace('\\', '\\\\').replace(':', '\\\\:').replace("'", "'\\\\''")
+        return escape_filter_path(path)
+
+    def run_ffmpeg(self, cmd, duration=0, cwd=None, progress=None):
+        """
+        Runs an ffmpeg command and returns (returncode, stderr).
+        progress(ratio, frame=, time=, fps=, speed=) is called for each block of -progress output.
+        """
+        cmd = [cmd[0], '-progress', 'pipe:1', '-nostats'] + cmd[1:]
+        with tempfile.TemporaryFile(mode='w+') as err:
+            # stderr goes to a temp file so a full pipe can never stall ffmpeg
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, text=True, cwd=cwd)
+            stats = {}
+            for line in proc.stdout:
+                key, _, value = line.strip().partition('=')
+                stats[key] = value
+                if key != 'progress' or not progress:
+                    continue
+                out_us = stats.get('out_time_us') or stats.get('out_time_ms') or ''
+                seconds = int(out_us) / 1_000_000 if out_us.isdigit() else 0.0
+                ratio = min(1.0, seconds / duration) if duration else 0.0
+                try:
+                    fps = float(stats.get('fps', 0))
+                except ValueError:
+                    fps = 0.0
+                frame = stats.get('frame', '0')
+                progress(ratio, frame=int(frame) if frame.isdigit() else 0, time=round(seconds, 2),
+                         fps=fps, speed=stats.get('speed'))
+            proc.wait()
+            err.seek(0)
+            return proc.returncode, err.read()
+
+    @classmethod
+    def _outro_lock(cls, key):
+        with cls._outro_locks_guard:
+            return cls._outro_locks.setdefault(key, threading.Lock())
+
+    def get_outro_clip(self, logo_input, width, height, fps, pix_fmt):
+        """
+        Returns the cached outro clip for this logo and video format, rendering it on first use.
+        The key covers the logo bytes and the outro filtergraph, so a new logo or outro design
+        renders a new clip. Returns None if it cannot be rendered (callers fall back to logo_filtergraph).
+        """
+        if not fps or not pix_fmt:
+            return None
+        try:
+            with open(logo_input, 'rb') as f:
+                logo_bytes = f.read()
+        except OSError:
+            return None
+        digest = hashlib.sha256(logo_bytes + outro_filtergraph(width, height, fps, pix_fmt=pix_fmt).encode()).hexdigest()
+        name = f"outro-{width}x{height}-{fps.replace('/', '_')}-{pix_fmt}-{digest[:16]}.mkv"
+        path = os.path.join(OUTRO_CACHE_DIR, name)
+
+        # One render per key in this process; across processes the atomic rename keeps readers safe
+        with self._outro_lock(name):
+            if os.path.exists(path):
+                return path
+            os.makedirs(OUTRO_CACHE_DIR, exist_ok=True)
+            temp_path = os.path.join(OUTRO_CACHE_DIR, f".{os.getpid()}-{name}")
+            print(f"🎞️ Rendering outro clip: {name}")
+            started = time.monotonic()
+            returncode, stderr = self.run_ffmpeg(
+                outro_command(os.path.abspath(logo_input), temp_path, width, height, fps, pix_fmt)
+            )
+            if returncode != 0:
+                print(f"⚠️ Outro render failed (code {returncode}), using the single-pass filtergraph:")
+                print(stderr)
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                return None
+            observe_ffmpeg("outro_render", time.monotonic() - started, temp_path, OUTRO_SECONDS)
+            os.replace(temp_path, path)
+            return path
+
+    def probe_streams(self, path):
+        """Returns {'video': stream, 'audio': stream or None} for the first video/audio streams, or None."""
+        cmd = ['ffprobe', '-v', 'error', '-show_entries',
+               'stream=codec_type,codec_name,profile,level,width,height,pix_fmt,sample_aspect_ratio,'
+               'color_range,color_space,color_primaries,color_transfer,time_base,sample_rate,channels'
+               ':stream_tags=rotate:stream_side_data=rotation',
+               '-of', 'json', path]
+        try:
+            streams = json.loads(subprocess.check_output(cmd, text=True))['streams']
+        except Exception:
+            return None
+        found = {}
+        for stream in streams:
+            found.setdefault(stream.get('codec_type'), stream)
+        if 'video' not in found:
+            return None
+        return {'video': found['video'], 'audio': found.get('audio')}
+
+    @staticmethod
+    def _is_rotated(stream):
+        rotations = [stream.get('tags', {}).get('rotate')]
+        rotations += [side_data.get('rotation') for side_data in stream.get('side_data_list', [])]
+        return any(rotation not in (None, 0, '0') for rotation in rotations)
+
+    @staticmethod
+    def _splice_signature(streams):
+        """
+        Parameters both parts must share to be joined with stream copy: the output header only
+        describes the head, so a tail with another profile, level, aspect ratio, colour description
+        or timebase would change the stream mid-file.
+        """
+        video, audio = streams['video'], streams['audio']
+        return (
+            video.get('codec_name'), video.get('profile'), video.get('level'),
+            video.get('width'), video.get('height'), video.get('pix_fmt'), video.get('sample_aspect_ratio'),
+            *(video.get(key) for key in SPLICE_COLOR_OPTIONS), video.get('time_base'),
+            audio and (audio.get('codec_name'), audio.get('sample_rate'), audio.get('channels'))
+        )
 
-    def add_logo_and_subs_to_video(self, video_input, logo_input, srt_input, video_output, margin=30, logo_width=180):
-        duration, width, height = self.get_video_info(video_input)
-        if duration == 0:
+    @staticmethod
+    def _tail_encoder_args(video, encoder):
+        """
+        Encoder options that make the re-encoded tail match the head's profile, level and colour
+        description, or None if the profile has no encoder equivalent.
+        """
+        args = ['-c:v', encoder, '-pix_fmt', video['pix_fmt']]
+        codec = video.get('codec_name')
+        if video.get('profile'):
+            profile = SPLICE_PROFILES.get(codec, {}).get(video['profile'])
+            if not profile:
+                return None
+            args += ['-profile:v', profile]
+        level = video.get('level')
+        if isinstance(level, int) and level > 0:
+            if codec == 'h264':
+                args += ['-level', f"{level / 10:.1f}"]
+            else:
+                # HEVC level_idc is 30x the level number; libx265 only takes it through its own params
+                args += ['-x265-params', f"level-idc={level / 30:g}"]
+        for key, option in SPLICE_COLOR_OPTIONS.items():
+            if video.get(key) and video[key] != 'unknown':
+                args += [option, video[key]]
+        return args
+
+    @staticmethod
+    def _track_timescale(time_base):
+        """MP4 track timescale from an ffprobe time_base such as '1/15360', or None."""
+        try:
+            numerator, _, denominator = (time_base or '').partition('/')
+            return int(denominator) if int(numerator) == 1 and int(denominator) > 0 else None
+        except ValueError:
+            return None
+
+    def find_keyframe_before(self, video_path, position, window=60):
+        """Timestamp of the last video keyframe at or before position (file timeline, seconds), or None."""
+        cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+               '-read_intervals', f"{max(0, position - window)}%{position + 0.001}",
+               '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', video_path]
+        try:
+            output = subprocess.check_output(cmd, text=True)
+        except Exception:
+            return None
+        keyframe = None
+        for line in output.splitlines():
+            pts_time, _, flags = line.strip().partition(',')
+            try:
+                t = float(pts_time)
+            except ValueError:
+                continue
+            if 'K' in flags and t <= position + 0.001 and (keyframe is None or t > keyframe):
+                keyframe = t
+        return keyframe
+
+    def add_outro_fast(self, video_input, logo_input, video_output, info, progress=None):
+        """
+        Outro-only mode without re-encoding the body: splits the video at the last keyframe before
+        the outro, stream-copies everything before it, re-encodes only the tail with the cached outro
+        and joins both with the concat demuxer. The parts go through MPEG-TS so the tail keeps its own
+        in-band parameter sets. Returns False when the video can't be spliced this way (the caller
+        then re-encodes the whole video).
+        """
+        streams = self.probe_streams(video_input)
+        if not streams:
             return False
+        video, audio = streams['video'], streams['audio']
+        encoder = SPLICE_VIDEO_ENCODERS.get(video.get('codec_name'))
+        encoder_args = encoder and video.get('pix_fmt') and self._tail_encoder_args(video, encoder)
+        if not encoder_args or self._is_rotated(video) or \
+                (audio and audio.get('codec_name') not in SPLICE_AUDIO_CODECS):
+            print(f"ℹ️ Outro-only fast path not supported for {video.get('codec_name')} {video.get('profile')}"
+                  f"/{audio and audio.get('codec_name')} (or rotated video)")
+            return False
+
+        duration = info['duration']
+        outro_start = max(0, duration - OUTRO_SECONDS)
+        keyframe = self.find_keyframe_before(video_input, info['start_time'] + outro_start)
+        cut = keyframe - info['start_time'] if keyframe is not None else 0
+        if cut <= 0:
+            return False
+        outro_clip = self.get_outro_clip(logo_input, info['width'], info['height'], info['fps'], info['pix_fmt'])
+        if not outro_clip:
+            return False
+
+        base = os.path.join(os.path.dirname(os.path.abspath(video_output)),
+                            f".{os.path.splitext(os.path.basename(video_output))[0]}")
+        head, tail_source = f"{base}.part0.ts", f"{base}.part1.ts"
+        tail, concat_list = f"{base}.tail.ts", f"{base}.concat.txt"
+        started = time.monotonic()
+        try:
+            # 1. Split at the keyframe without re-encoding (the segment muxer cuts on a keyframe)
+            returncode, stderr = self.run_ffmpeg([
+                'ffmpeg', '-y', '-i', os.path.abspath(video_input),
+                '-map', '0:v:0', '-map', '0:a:0?', '-c', 'copy',
+                '-f', 'segment', '-segment_format', 'mpegts', '-segment_times', f"{max(0, cut - 0.001):.6f}",
+                '-reset_timestamps', '1', f"{base.replace('%', '%%')}.part%d.ts"
+            ])
+            if returncode != 0 or not os.path.exists(tail_source):
+                print(f"⚠️ Keyframe split failed (code {returncode}):")
+                print(stderr)
+                return False
+            # A split after the outro start would cut the outro short
+            tail_duration = self.get_video_info(tail_source)[0]
+            if tail_duration + 0.05 < duration - outro_start:
+                print(f"⚠️ Split landed {tail_duration:.2f}s before the end, shorter than the outro")
+                return False
+
+            # 2. Re-encode only the tail with the outro, matching the source's profile, level and colour description
+            print(f"   Stream-copied {cut:.2f}s, re-encoding the last {tail_duration:.2f}s")
+            returncode, stderr = self.run_ffmpeg([
+                'ffmpeg', '-y',
+                '-i', tail_source,
+                '-i', os.path.abspath(logo_input),
+                *outro_inputs(outro_clip, tail_duration),
+                '-filter_complex', watermark_filtergraph(static_logo=False, outro_input="[2:v]"),
+                *encoder_args,
+                '-c:a', 'copy',
+                '-f', 'mpegts', tail
+            ], duration=tail_duration, progress=progress)
+            if returncode != 0:
+                print(f"⚠️ Tail encode failed (code {returncode}):")
+                print(stderr)
+                return False
+
+            # 3. Concat with stream copy only works if both parts agree on the codec parameters
+            head_streams, tail_streams = self.probe_streams(head), self.probe_streams(tail)
+            if not head_streams or not tail_streams or \
+                    self._splice_signature(head_streams) != self._splice_signature(tail_streams):
+                print("⚠️ Head and tail codec parameters differ")
+                return False
+
+            # 4. Join
+            with open(concat_list, 'w', encoding='utf-8') as f:
+                for part in (head, tail):
+                    name = os.path.basename(part).replace("'", "'\\''")
+                    f.write(f"file '{name}'\n")
+            # Keep the source's track timescale (the MPEG-TS parts are always 1/90000)
+            timescale = self._track_timescale(video.get('time_base'))
+            returncode, stderr = self.run_ffmpeg([
+                'ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', concat_list,
+                '-map', '0', '-c', 'copy',
+                *(['-video_track_timescale', str(timescale)] if timescale else []),
+                os.path.abspath(video_output)
+            ])
+            if returncode != 0:
+                print(f"⚠️ Concat failed (code {returncode}):")
+                print(stderr)
+                return False
+            observe_ffmpeg("outro_splice", time.monotonic() - started, video_output, duration)
+            return True
+        finally:
+            for path in (head, tail_source, tail, concat_list):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def add_logo_and_subs_to_video(self, video_input, logo_input, srt_input, video_output, margin=30, logo_width=180,
+                                   progress=None, watermark=True):
+        """
+        Burns in the corner watermark, the outro and (optionally) subtitles.
+        watermark=False is the outro-only mode: without subtitles only the last seconds are re-encoded
+        (see add_outro_fast), otherwise or if that is not possible the whole video is re-encoded.
+        """
+        info = self.probe_video(video_input)
+        if not info or info['duration'] == 0:
+            return False
+        duration, width, height = info['duration'], info['width'], info['height']
         
-        outro_start = max(0, duration - 3)
-        font_path = "/System/Library/Fonts/Supplemental/Arial Italic.ttf"
-        
-        sub_filter = ""
-        overlay_input = "[0:v]"
+        sub_filter = None
         temp_srt_name = "sub.srt"
         video_dir = os.path.dirname(os.path.abspath(video_input))
         temp_srt_path = os.path.join(video_dir, temp_srt_name)
@@ -341,55 +703,60 @@ class YouTubeAutoPoster:
                 
                 # Use ONLY the filename 'sub.srt' here, as we will chdir to video_dir
                 # We still need to escape any special chars in the filename itself (unlikely for 'sub.srt')
-                srt_name_esc = temp_srt_name.replace("'", "'\\''")
-                sub_filter = f"[0:v]subtitles='{srt_name_esc}':force_style='{sub_style}'[v_sub];"
-                overlay_input = "[v_sub]"
+                sub_filter = subtitles_filter(temp_srt_name, sub_style)
                 
                 print(f"✅ Prepared subtitles: {temp_srt_path}")
             except Exception as e:
                 print(f"⚠️ Subtitle preparation error: {e}")
 
-        font_path_esc = self.ffmpeg_filter_escape(font_path)
-        filter_complex = (
-            f"[1:v]split[static][animated];"
-            f"[static]scale={logo_width}:-1[st_logo];"
-            f"[animated]scale='if(gte(t,{outro_start}), min(800, 800*(t-{outro_start})/2.0), 0)':-1:eval=frame[out_logo];"
-            f"color=c=white:s={width}x{height}:d=3[white_src];"
-            f"[white_src]fade=t=in:st=0:d=1.5:alpha=1[white_bg];"
-            f"{sub_filter}"
-            f"{overlay_input}[st_logo]overlay=W-w-{margin}:H-h-{margin}[v1];"
-            f"[v1][white_bg]overlay=enable='gte(t,{outro_start})'[v2];"
-            f"[v2]drawtext=text='https\\://banya.ai':fontfile='{font_path_esc}':fontsize=45:fontcolor=black:x=(w-tw)/2:y=(h/2)+130:enable='gte(t,{outro_start})'[v3];"
-            f"[v3][out_logo]overlay=(W-w)/2:(H-h)/2:enable='gte(t,{outro_start})'"
-        )
+        if not watermark and not sub_filter:
+            print("⚡ Outro only: stream-copying the body and re-encoding the tail")
+            started = time.monotonic()
+            if self.add_outro_fast(video_input, logo_input, video_output, info, progress=progress):
+                print(f"✅ Done! ({time.monotonic() - started:.1f}s)")
+                return True
+            print("   Falling back to a full re-encode")
+
+        # The outro is the same for every video with this logo and format: reuse a pre-rendered clip
+        # so only the static watermark is filtered per frame
+        outro_clip = self.get_outro_clip(logo_input, width, height, info['fps'], info['pix_fmt'])
+        if outro_clip:
+            filter_complex = watermark_filtergraph(margin=margin, logo_width=logo_width, subtitles=sub_filter,
+                                                   outro_input="[2:v]", static_logo=watermark)
+            extra_inputs = outro_inputs(outro_clip, duration)
+        else:
+            filter_complex = logo_filtergraph(width, height, duration, margin=margin, logo_width=logo_width,
+                                              subtitles=sub_filter, static_logo=watermark)
+            extra_inputs = []
         
         cmd = [
             'ffmpeg', '-y',
             '-i', os.path.basename(video_input), # Use basename
             '-i', os.path.abspath(logo_input),    # Logo can be absolute
+            *extra_inputs,
             '-filter_complex', filter_complex,
             '-c:a', 'copy',
             os.path.abspath(video_output)
         ]
         
         print(f"🎬 Processing video...")
-        original_cwd = os.getcwd()
         try:
-            os.chdir(video_dir) # Change CWD to video directory
-            print(f"   Working directory: {os.getcwd()}")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0:
+            # Run ffmpeg inside the video directory without os.chdir(),
+            # which is process-wide and unsafe when several jobs run in threads.
+            print(f"   Working directory: {video_dir}")
+            started = time.monotonic()
+            returncode, stderr = self.run_ffmpeg(cmd, duration=duration, cwd=video_dir, progress=progress)
+            if returncode == 0:
+                observe_ffmpeg("logo_overlay", time.monotonic() - started, video_output, duration)
                 print("✅ Done!")
                 return True
             else:
-                print(f"❌ FFmpeg Error (code {result.returncode}):")
-                print(result.stderr)
+                print(f"❌ FFmpeg Error (code {returncode}):")
+                print(stderr)
                 return False
         except Exception as e:
             print(f"❌ Exception: {e}")
             return False
-        finally:
-            os.chdir(original_cwd) # Restore CWD
 
 def main():
     poster = YouTubeAutoPoster()